@@ -0,0 +1,117 @@
+import hashlib
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import sessionmaker
+
+from models import Blob, BlobLink
+
+class BlobStore:
+    """内容寻址的文件存储
+
+    文件内容按 SHA-256 保存在 root/objects/ab/abcdef... 中，同样的字节只存一份；
+    按标题命名的可读路径是指向内容的硬链接（不支持时用符号链接，再不行才复制），
+    路径、来源URL与哈希的对应关系记录在 blobs / blob_links 表中。
+    """
+
+    def __init__(self, root, engine):
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        self.incoming = self.root / "incoming"
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self.incoming.mkdir(parents=True, exist_ok=True)
+        # 下载线程使用独立的会话，不与界面线程共用
+        self.session = sessionmaker(bind=engine)()
+
+    def object_path(self, sha256: str) -> Path:
+        return self.objects / sha256[:2] / sha256
+
+    def incoming_path(self, url: str, suffix: str = ".pdf") -> Path:
+        """下载临时文件路径（按URL命名，断点续传文件不随标题变化）"""
+        return self.incoming / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}{suffix}"
+
+    def path_for_url(self, url: str) -> Optional[str]:
+        """该URL已下载过时返回其可读路径（不发网络请求）"""
+        link = self.session.query(BlobLink).filter_by(url=url).first()
+        if link is None:
+            return None
+        if not os.path.exists(link.path):
+            # 可读路径被用户删除，内容还在时重新链接
+            if not self.object_path(link.sha256).exists():
+                return None
+            self._link(self.object_path(link.sha256), Path(link.path))
+        return link.path
+
+    @staticmethod
+    def file_hash(path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def put(self, source: Path, path: Path, url: Optional[str] = None) -> str:
+        """把 source 移入存储并在 path 建立可读链接，返回实际的可读路径
+
+        内容已存在时只删除 source；path 被其他内容占用时在文件名后追加哈希的前 8 位。
+        """
+        source, path = Path(source), Path(path)
+        sha256 = self.file_hash(source)
+        target = self.object_path(sha256)
+        if target.exists():
+            source.unlink()
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            source.replace(target)
+
+        try:
+            blob = self.session.get(Blob, sha256)
+            if blob is None:
+                blob = Blob(sha256=sha256, size=target.stat().st_size)
+                self.session.add(blob)
+
+            link = self.session.query(BlobLink).filter_by(path=str(path)).first()
+            occupied = link is not None and link.sha256 != sha256
+            if link is None and path.exists():
+                # 建立映射之前保存的文件：内容相同则换成链接，否则视为重名
+                if self.file_hash(path) == sha256:
+                    path.unlink()
+                else:
+                    occupied = True
+            if occupied:
+                # 标题截断后重名的不同论文
+                path = path.with_name(f"{path.stem}_{sha256[:8]}{path.suffix}")
+                link = self.session.query(BlobLink).filter_by(path=str(path)).first()
+            if link is None:
+                link = BlobLink(path=str(path), sha256=sha256, url=url)
+                self.session.add(link)
+            elif url and not link.url:
+                link.url = url
+
+            if not path.exists():
+                self._link(target, path)
+            self.session.commit()
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            logging.error(f"记录文件映射失败: {str(e)}")
+            raise e
+        return str(path)
+
+    @staticmethod
+    def _link(target: Path, path: Path):
+        """建立可读路径：硬链接 > 符号链接 > 复制"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(target, path)
+        except OSError:
+            try:
+                os.symlink(target.resolve(), path)
+            except OSError:
+                shutil.copyfile(target, path)
+
+    def close(self):
+        self.session.close()
@@ -1,9 +1,10 @@
+from sqlalchemy import bindparam, inspect, text
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
 from models import init_db, Paper, Category, Tag, Note
 import logging
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Tuple
 
 class DatabaseManager:
     """数据库管理器"""
@@ -125,6 +126,43 @@ class DatabaseManager:
             (Paper.authors.ilike(f"%{keyword}%"))
         ).all()
     
+    def iter_paper_texts(self, after_id: int = 0, batch_size: int = 1000, session=None):
+        """按ID顺序产出 (论文ID, 标题+摘要)，用于构建相似论文索引
+
+        在工作线程中调用时传入该线程自己的 session（默认会话只能在界面线程使用）。
+        """
+        query = (session or self.session).query(Paper.id, Paper.title, Paper.abstract).filter(
+            Paper.id > after_id
+        ).order_by(Paper.id).yield_per(batch_size)
+        for paper_id, title, abstract in query:
+            yield paper_id, f"{title} {abstract or ''}"
+    
+    def paper_summaries(self, paper_ids: Iterable[int], session=None) -> Dict[int, Tuple[str, str, str]]:
+        """按ID批量读取 {论文ID: (标题, 作者, 链接)}，用于相似论文列表
+
+        与 iter_paper_texts 一样只查询两种表结构共有的列：本模块的表结构中作者是 papers.authors 列，
+        src/models/database.py 的表结构（papers.db、采集服务写入的库）中作者由 paper_authors 关联表汇总。
+        """
+        session = session or self.session
+        paper_ids = list(paper_ids)
+        if not paper_ids:
+            return {}
+        rows = session.query(Paper.id, Paper.title, Paper.url).filter(Paper.id.in_(paper_ids)).all()
+        schema = inspect(session.get_bind())
+        authors: Dict[int, str] = {}
+        if 'authors' in {column['name'] for column in schema.get_columns('papers')}:
+            authors = dict(session.query(Paper.id, Paper.authors).filter(Paper.id.in_(paper_ids)))
+        elif schema.has_table('paper_authors'):
+            names: Dict[int, List[str]] = {}
+            query = text(
+                "SELECT pa.paper_id, a.name FROM paper_authors pa JOIN authors a ON a.id = pa.author_id "
+                "WHERE pa.paper_id IN :ids"
+            ).bindparams(bindparam('ids', expanding=True))
+            for paper_id, name in session.execute(query, {'ids': paper_ids}):
+                names.setdefault(paper_id, []).append(name)
+            authors = {paper_id: ", ".join(author_names) for paper_id, author_names in names.items()}
+        return {paper_id: (title, authors.get(paper_id) or "", url) for paper_id, title, url in rows}
+    
     def get_all_categories(self) -> List[Category]:
         """获取所有分类"""
         return self.session.query(Category).all()
@@ -12,6 +12,8 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import QThread, pyqtSignal, QTimer
 import xml.etree.ElementTree as ET
+from src.crawlers.telemetry import CrawlTelemetry
+from src.crawlers.cancellation import CancellationToken, OperationCancelled, fetch, download_resumable
 
 class PDFDownloader:
     """PDF下载器"""
@@ -19,34 +21,19 @@ class PDFDownloader:
         self.download_path = Path(download_path)
         self.download_path.mkdir(exist_ok=True)
         
-    def download_pdf(self, url, title, progress_callback=None):
-        """下载PDF文件"""
+    def download_pdf(self, url, title, progress_callback=None, token=None):
+        """下载PDF文件（断点续传，取消时保留 .part 并抛出 OperationCancelled）"""
         try:
             # 清理文件名
             safe_title = self.sanitize_filename(title)
             filename = f"{safe_title}.pdf"
             filepath = self.download_path / filename
             
-            # 发送请求
-            response = requests.get(url, stream=True, timeout=30)
-            response.raise_for_status()
-            
-            # 获取文件大小
-            total_size = int(response.headers.get('content-length', 0))
-            downloaded = 0
-            
-            # 写入文件
-            with open(filepath, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        
-                        # 报告进度
-                        if progress_callback and total_size > 0:
-                            progress = int((downloaded / total_size) * 100)
-                            progress_callback(progress)
+            # 上次已下载完成
+            if filepath.exists():
+                return str(filepath)
             
+            download_resumable(requests, url, filepath, token, progress_callback, timeout=30)
             return str(filepath)
             
         except Exception as e:
@@ -71,8 +58,8 @@ class ArxivCrawler:
     def __init__(self):
         self.base_url = "http://export.arxiv.org/api/query"
         
-    def search(self, keywords, max_results=10):
-        """搜索论文"""
+    def search(self, keywords, max_results=10, telemetry=None, token=None):
+        """搜索论文（telemetry 接收抓取和解析统计，token 用于中止请求）"""
         try:
             # 构建查询
             query = f"all:{keywords}"
@@ -84,9 +71,14 @@ class ArxivCrawler:
                 'sortOrder': 'descending'
             }
             
-            response = requests.get(self.base_url, params=params, timeout=30)
+            telemetry = telemetry or CrawlTelemetry()
+            response = fetch(requests, self.base_url, token, params=params, timeout=30)
+            telemetry.page(len(response.content), response.elapsed.total_seconds())
             if response.status_code == 200:
-                return self.parse_results(response.text)
+                with telemetry.parsing():
+                    papers = self.parse_results(response.text)
+                telemetry.emitted(len(papers))
+                return papers
             else:
                 return []
         except Exception as e:
@@ -148,6 +140,11 @@ class DownloadWorker(QThread):
         super().__init__()
         self.papers = papers
         self.download_path = download_path
+        self.token = CancellationToken()
+    
+    def stop(self):
+        """请求停止（当前下载保留为 .part，下次下载时续传）"""
+        self.token.cancel()
         
     def run(self):
         """运行下载"""
@@ -166,7 +163,8 @@ class DownloadWorker(QThread):
                     filepath = downloader.download_pdf(
                         paper['pdf_url'], 
                         paper['title'], 
-                        progress_callback
+                        progress_callback,
+                        self.token
                     )
                     
                     if filepath:
@@ -182,6 +180,8 @@ class DownloadWorker(QThread):
                 
             self.status.emit(f"下载完成！成功下载 {downloaded_count}/{total_papers} 篇论文")
             
+        except OperationCancelled:
+            self.status.emit("下载已停止，再次下载时跳过已完成的文件并续传未完成的PDF")
         except Exception as e:
             self.status.emit(f"下载出错: {str(e)}")
         finally:
@@ -199,6 +199,11 @@ class CrawlerWorker(QThread):
         self.domain = domain
         self.source = source
         self.max_results = max_results
+        self.token = CancellationToken()
+    
+    def stop(self):
+        """请求停止（中止进行中的请求，线程自行退出）"""
+        self.token.cancel()
         
     def run(self):
         """运行爬虫"""
@@ -217,25 +222,31 @@ class CrawlerWorker(QThread):
             
             if self.source == "arXiv":
                 crawler = ArxivCrawler()
-                papers = crawler.search(keywords, self.max_results)
+                telemetry = CrawlTelemetry(expected_items=self.max_results, listener=self.report_telemetry)
+                papers = crawler.search(keywords, self.max_results, telemetry, self.token)
+                self.token.raise_if_cancelled()
                 
-                self.status.emit(f"找到 {len(papers)} 篇相关论文")
+                stats = telemetry.finish()
+                self.status.emit(f"找到 {len(papers)} 篇相关论文 | {stats.describe()}")
                 self.result.emit(papers)
-                
-                # 模拟处理进度
-                for i in range(101):
-                    self.progress.emit(i)
-                    self.msleep(20)  # 暂停20毫秒
                     
             else:
                 self.status.emit(f"{self.source} 数据源暂未实现")
                 self.result.emit([])
                 
+        except OperationCancelled:
+            self.status.emit("搜索已停止")
         except Exception as e:
             self.status.emit(f"搜索出错: {str(e)}")
             self.result.emit([])
         finally:
             self.finished.emit()
+    
+    def report_telemetry(self, snapshot):
+        """把爬取统计转换为进度和状态"""
+        self.progress.emit(snapshot.progress)
+        if not snapshot.finished:
+            self.status.emit(f"正在从 {self.source} 搜索... {snapshot.describe()}")
 
 class MachineVisionLiteratureApp(QMainWindow):
     """机器视觉文献获取系统主窗口"""
@@ -418,6 +429,7 @@ class MachineVisionLiteratureApp(QMainWindow):
         # 重置进度
         self.progress_bar.setValue(0)
         self.download_button.setEnabled(False)
+        self.stop_button.setEnabled(True)
         
         # 创建并启动下载线程
         self.download_worker = DownloadWorker(self.current_papers, download_path)
@@ -427,11 +439,11 @@ class MachineVisionLiteratureApp(QMainWindow):
         self.download_worker.start()
     
     def stop_search(self):
-        """停止搜索"""
-        if self.crawler_worker and self.crawler_worker.isRunning():
-            self.crawler_worker.terminate()
-            self.crawler_worker.wait()
-        self.search_finished()
+        """停止搜索或下载（协作式取消，线程退出后发出 finished）"""
+        self.stop_button.setEnabled(False)
+        for worker in (self.crawler_worker, self.download_worker):
+            if worker and worker.isRunning():
+                worker.stop()
     
     def update_status(self, message):
         """更新状态信息"""
@@ -470,14 +482,17 @@ class MachineVisionLiteratureApp(QMainWindow):
         if self.current_papers:
             self.download_button.setEnabled(True)
             
-            # 如果启用了自动下载
-            if self.auto_download_check.isChecked():
+            # 如果启用了自动下载（搜索被停止时不自动开始）
+            if self.auto_download_check.isChecked() and not self.crawler_worker.token.cancelled:
                 self.update_status("开始自动下载PDF...")
                 QTimer.singleShot(1000, self.start_download)  # 1秒后开始下载
     
     def download_finished(self):
         """下载完成"""
         self.download_button.setEnabled(True)
+        self.stop_button.setEnabled(False)
+        if self.download_worker.token.cancelled:
+            return
         self.progress_bar.setValue(100)
         self.update_status("PDF下载完成")
         
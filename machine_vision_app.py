@@ -9,14 +9,16 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import QThread, pyqtSignal, QTimer
 import xml.etree.ElementTree as ET
+from src.crawlers.telemetry import CrawlTelemetry
+from src.crawlers.cancellation import CancellationToken, OperationCancelled, fetch
 
 class ArxivCrawler:
     """简化的ArXiv爬虫"""
     def __init__(self):
         self.base_url = "http://export.arxiv.org/api/query"
         
-    def search(self, keywords, max_results=10):
-        """搜索论文"""
+    def search(self, keywords, max_results=10, telemetry=None, token=None):
+        """搜索论文（telemetry 接收抓取和解析统计，token 用于中止请求）"""
         try:
             # 构建查询
             query = f"all:{keywords}"
@@ -28,9 +30,14 @@ class ArxivCrawler:
                 'sortOrder': 'descending'
             }
             
-            response = requests.get(self.base_url, params=params, timeout=30)
+            telemetry = telemetry or CrawlTelemetry()
+            response = fetch(requests, self.base_url, token, params=params, timeout=30)
+            telemetry.page(len(response.content), response.elapsed.total_seconds())
             if response.status_code == 200:
-                return self.parse_results(response.text)
+                with telemetry.parsing():
+                    papers = self.parse_results(response.text)
+                telemetry.emitted(len(papers))
+                return papers
             else:
                 return []
         except Exception as e:
@@ -94,6 +101,11 @@ class CrawlerWorker(QThread):
         self.domain = domain
         self.source = source
         self.max_results = max_results
+        self.token = CancellationToken()
+    
+    def stop(self):
+        """请求停止（中止进行中的请求，线程自行退出）"""
+        self.token.cancel()
         
     def run(self):
         """运行爬虫"""
@@ -112,25 +124,31 @@ class CrawlerWorker(QThread):
             
             if self.source == "arXiv":
                 crawler = ArxivCrawler()
-                papers = crawler.search(keywords, self.max_results)
+                telemetry = CrawlTelemetry(expected_items=self.max_results, listener=self.report_telemetry)
+                papers = crawler.search(keywords, self.max_results, telemetry, self.token)
+                self.token.raise_if_cancelled()
                 
-                self.status.emit(f"找到 {len(papers)} 篇相关论文")
+                stats = telemetry.finish()
+                self.status.emit(f"找到 {len(papers)} 篇相关论文 | {stats.describe()}")
                 self.result.emit(papers)
-                
-                # 模拟处理进度
-                for i in range(101):
-                    self.progress.emit(i)
-                    self.msleep(20)  # 暂停20毫秒
                     
             else:
                 self.status.emit(f"{self.source} 数据源暂未实现")
                 self.result.emit([])
                 
+        except OperationCancelled:
+            self.status.emit("搜索已停止")
         except Exception as e:
             self.status.emit(f"搜索出错: {str(e)}")
             self.result.emit([])
         finally:
             self.finished.emit()
+    
+    def report_telemetry(self, snapshot):
+        """把爬取统计转换为进度和状态"""
+        self.progress.emit(snapshot.progress)
+        if not snapshot.finished:
+            self.status.emit(f"正在从 {self.source} 搜索... {snapshot.describe()}")
 
 class MachineVisionLiteratureApp(QMainWindow):
     """机器视觉文献获取系统主窗口"""
@@ -259,11 +277,10 @@ class MachineVisionLiteratureApp(QMainWindow):
         self.crawler_worker.start()
     
     def stop_search(self):
-        """停止搜索"""
+        """停止搜索（协作式取消，线程退出后发出 finished）"""
+        self.stop_button.setEnabled(False)
         if self.crawler_worker and self.crawler_worker.isRunning():
-            self.crawler_worker.terminate()
-            self.crawler_worker.wait()
-        self.search_finished()
+            self.crawler_worker.stop()
     
     def update_status(self, message):
         """更新状态信息"""
@@ -16,24 +16,23 @@
 import sys
 import requests
 import json
+import logging
 import os
 import webbrowser
 from datetime import datetime, timedelta
 from pathlib import Path
 import urllib.parse
-import time
 import re
-import pyttsx3  # 添加TTS引擎
-import threading  # 用于异步TTS处理
 
 try:
     from PyQt6.QtWidgets import (
         QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QWidget,
         QLabel, QPushButton, QComboBox, QTextEdit, QProgressBar, QMessageBox,
         QCheckBox, QFileDialog, QLineEdit, QTabWidget, QSplitter, QGroupBox,
-        QListWidget, QListWidgetItem, QScrollArea, QDialog, QDialogButtonBox
+        QListWidget, QListWidgetItem, QScrollArea, QDialog, QDialogButtonBox, QMenu,
+        QTreeWidget, QTreeWidgetItem, QListView, QStyledItemDelegate, QStyle
     )
-    from PyQt6.QtCore import QThread, pyqtSignal, QTimer, Qt, QUrl
+    from PyQt6.QtCore import QThread, pyqtSignal, QTimer, Qt, QUrl, QAbstractListModel, QModelIndex, QSize
     from PyQt6.QtGui import QFont, QColor, QDesktopServices
     PYQT_VERSION = 6
 except ImportError:
@@ -42,9 +41,10 @@ except ImportError:
             QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QWidget,
             QLabel, QPushButton, QComboBox, QTextEdit, QProgressBar, QMessageBox,
             QCheckBox, QFileDialog, QLineEdit, QTabWidget, QSplitter, QGroupBox,
-            QListWidget, QListWidgetItem, QScrollArea
+            QListWidget, QListWidgetItem, QScrollArea, QMenu, QTreeWidget, QTreeWidgetItem,
+            QListView, QStyledItemDelegate, QStyle
         )
-        from PyQt5.QtCore import QThread, pyqtSignal, QTimer, Qt, QUrl
+        from PyQt5.QtCore import QThread, pyqtSignal, QTimer, Qt, QUrl, QAbstractListModel, QModelIndex, QSize
         from PyQt5.QtGui import QFont, QColor, QDesktopServices
         PYQT_VERSION = 5
     except ImportError:
@@ -54,6 +54,15 @@ except ImportError:
 
 import xml.etree.ElementTree as ET
 from database_manager import DatabaseManager
+from src.processors.embeddings import EmbeddingIndex
+from src.processors.clustering import cluster_texts
+from src.crawlers.telemetry import CrawlTelemetry
+from tts_service import TTSService
+from summary_pages import SummaryPageWriter
+from blob_store import BlobStore
+from models import init_db
+from sqlalchemy.orm import sessionmaker
+from src.crawlers.cancellation import CancellationToken, OperationCancelled, download_resumable, fetch
 
 # 颜色常量定义
 COLOR_PDF_AVAILABLE = QColor(144, 238, 144)    # 浅绿色 - PDF可用
@@ -61,96 +70,42 @@ COLOR_LINK_AVAILABLE = QColor(173, 216, 230)   # 浅蓝色 - 仅链接可用
 COLOR_NO_LINK = QColor(211, 211, 211)          # 浅灰色 - 无链接
 COLOR_WHITE = QColor(255, 255, 255)            # 白色
 
-class TTSManager:
-    """文本转语音管理器"""
-    
-    def __init__(self):
-        self.engine = None
-        self.init_engine()
-    
-    def init_engine(self):
-        """初始化TTS引擎"""
-        try:
-            self.engine = pyttsx3.init()
-            # 设置中文语音
-            self.engine.setProperty('rate', 150)  # 语速
-            self.engine.setProperty('volume', 0.9)  # 音量
-            voices = self.engine.getProperty('voices')
-            
-            print("可用的语音列表:")
-            for voice in voices:
-                print(f"- {voice.name} ({voice.id})")
-            
-            # 尝试设置中文声音
-            chinese_voice = None
-            for voice in voices:
-                if "chinese" in voice.name.lower():
-                    chinese_voice = voice
-                    break
-            
-            if chinese_voice:
-                print(f"已选择中文语音: {chinese_voice.name}")
-                self.engine.setProperty('voice', chinese_voice.id)
-            else:
-                print("未找到中文语音，使用默认语音")
-            
-            return True
-            
-        except Exception as e:
-            print(f"TTS引擎初始化错误: {e}")
-            self.engine = None
-            return False
-    
-    def text_to_speech(self, text, output_path):
-        """将文本转换为语音文件"""
-        try:
-            if not self.engine:
-                print("正在重新初始化TTS引擎...")
-                if not self.init_engine():
-                    print("TTS引擎初始化失败，无法生成语音")
-                    return False
-            
-            print(f"开始生成语音文件: {output_path}")
-            print(f"文本长度: {len(text)} 字符")
-            
-            # 确保输出目录存在
-            output_dir = os.path.dirname(output_path)
-            if not os.path.exists(output_dir):
-                os.makedirs(output_dir)
-            
-            # 使用wav格式替代mp3（更好的兼容性）
-            output_path = output_path.replace('.mp3', '.wav')
-            
-            self.engine.save_to_file(text, output_path)
-            self.engine.runAndWait()
-            
-            if os.path.exists(output_path):
-                file_size = os.path.getsize(output_path)
-                print(f"语音文件生成成功: {output_path}")
-                print(f"文件大小: {file_size/1024:.2f} KB")
-                return True
-            else:
-                print("语音文件生成失败：文件未创建")
-                return False
-                
-        except Exception as e:
-            print(f"TTS转换错误: {e}")
-            return False
+# 结果较多时先聚类，在聚类视图中按需展开
+CLUSTER_MIN_RESULTS = 20
+# 检索结果分批送到界面，每批插入一次
+RESULT_BATCH_SIZE = 200
 
 class EnhancedDownloader:
     """增强型下载器 - 支持PDF和网页链接"""
     
-    def __init__(self, download_path="./downloads"):
+    def __init__(self, download_path="./downloads", tts_service=None, db_engine=None):
         self.download_path = Path(download_path)
         self.download_path.mkdir(exist_ok=True)
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
-        self.tts_manager = TTSManager()  # 添加TTS管理器
+        # 语音在后台进程池中合成；未传入服务时自建一个，finish() 时关闭其进程池
+        self.owns_tts_service = tts_service is None
+        self.tts_service = tts_service or TTSService()
+        self.pages = SummaryPageWriter(self.download_path)
+        # PDF按内容哈希存储，按标题命名的文件是指向内容的链接
+        self.blobs = BlobStore(self.download_path / ".blobs", db_engine or init_db())
     
-    def process_paper(self, paper, progress_callback=None):
-        """处理论文 - 优先下载PDF，否则保存网页链接"""
+    def finish(self):
+        """写出尚未写出的摘要页并生成索引页，返回索引页路径"""
+        try:
+            self.blobs.close()
+            return self.pages.finish()
+        finally:
+            if self.owns_tts_service:
+                self.tts_service.shutdown(wait=True)  # 等排队中的语音合成完
+    
+    def process_paper(self, paper, progress_callback=None, token=None):
+        """处理论文 - 优先下载PDF，否则保存网页链接
+
+        token 取消时抛出 OperationCancelled，未完成的PDF保留为 .part，下次处理时续传。
+        """
         result = {
             'paper': paper,
             'success': False,
@@ -167,10 +122,17 @@ class EnhancedDownloader:
             # 清理文件名
             safe_title = self.sanitize_filename(paper['title'])
             
-            # 尝试下载PDF
+            # 已下载过的PDF按URL查映射表，不再发请求
             pdf_url = paper.get('pdf_url')
+            existing = self.blobs.path_for_url(pdf_url) if pdf_url else None
+            if existing:
+                result['success'] = True
+                result['file_path'] = existing
+                return result
+            
+            # 尝试下载PDF
             if pdf_url and self.is_valid_pdf_url(pdf_url):
-                pdf_path = self.download_pdf(pdf_url, safe_title, source_folder, progress_callback)
+                pdf_path = self.download_pdf(pdf_url, safe_title, source_folder, progress_callback, token)
                 if pdf_path:
                     result['success'] = True
                     result['file_path'] = pdf_path
@@ -178,6 +140,8 @@ class EnhancedDownloader:
             
             # 如果PDF下载失败，保存网页链接
             web_url = paper.get('web_url') or paper.get('url') or pdf_url
+            if token is not None:
+                token.raise_if_cancelled()
             if web_url:
                 link_file = self.save_web_link(paper, safe_title, source_folder)
                 if link_file:
@@ -216,44 +180,22 @@ class EnhancedDownloader:
         
         return any(re.search(pattern, url, re.IGNORECASE) for pattern in pdf_patterns)
     
-    def download_pdf(self, url, title, folder, progress_callback=None):
-        """下载PDF文件"""
+    def download_pdf(self, url, title, folder, progress_callback=None, token=None):
+        """下载PDF文件（断点续传，取消时保留 .part），存入内容寻址存储并返回可读路径"""
         try:
-            filename = f"{title}.pdf"
-            filepath = folder / filename
-            
-            # 如果文件已存在，跳过
-            if filepath.exists():
-                return str(filepath)
-            
-            response = self.session.get(url, stream=True, timeout=60)
-            response.raise_for_status()
-            
-            # 检查响应内容
-            content_type = response.headers.get('content-type', '').lower()
-            if 'html' in content_type:
-                # 可能是需要解析的页面
-                return None
-                
-            total_size = int(response.headers.get('content-length', 0))
-            downloaded = 0
-            
-            with open(filepath, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        
-                        if progress_callback and total_size > 0:
-                            progress = int((downloaded / total_size) * 100)
-                            progress_callback(progress)
-            
-            # 验证文件
-            if filepath.stat().st_size < 1024:
+            # 先下载到按URL命名的临时文件
+            filepath = self.blobs.incoming_path(url)
+            download_resumable(self.session, url, filepath, token, progress_callback, timeout=60)
+            
+            # 验证文件（过小或不是PDF，如需要登录的网页）
+            with open(filepath, 'rb') as f:
+                is_pdf = f.read(5) == b'%PDF-'
+            if not is_pdf or filepath.stat().st_size < 1024:
                 filepath.unlink()
                 return None
-                
-            return str(filepath)
+            
+            # 相同内容只保存一份，标题重名的不同论文自动改名
+            return self.blobs.put(filepath, folder / f"{title}.pdf", url)
             
         except Exception as e:
             print(f"PDF下载错误: {e}")
@@ -265,9 +207,9 @@ class EnhancedDownloader:
             filename = f"{title}_摘要与链接.html"
             filepath = folder / filename
             
-            # 生成音频文件
-            audio_filename = f"{title}_摘要朗读.wav"  # 改为wav格式
-            audio_filepath = folder / audio_filename
+            # 生成音频文件（格式由语音合成服务决定，有 ffmpeg 时为压缩格式）
+            audio_filepath = Path(self.tts_service.audio_path(str(folder / f"{title}_摘要朗读")))
+            audio_filename = audio_filepath.name
             
             # 准备要转换为语音的文本
             tts_text = f"""论文标题：{paper['title']}。
@@ -276,128 +218,14 @@ class EnhancedDownloader:
 发表来源：{paper.get('source', '未知来源')}。
 内容概要：{paper.get('abstract', '暂无摘要信息。')}"""
 
-            print(f"\n开始处理论文音频: {title}")
+            # 提交到语音合成服务，不等待合成完成
+            narration = self.tts_service.submit(tts_text, str(audio_filepath))
+            narration.add_done_callback(
+                lambda f: f.result() or logging.warning(f"音频生成失败: {audio_filename}")
+            )
             
-            # 异步生成音频文件
-            def generate_audio():
-                success = self.tts_manager.text_to_speech(tts_text, str(audio_filepath))
-                if success:
-                    print(f"✓ 音频生成成功: {audio_filename}")
-                else:
-                    print(f"✗ 音频生成失败: {audio_filename}")
-            
-            audio_thread = threading.Thread(target=generate_audio)
-            audio_thread.start()
-            
-            # 生成中文摘要
-            chinese_summary = f"""
-<div class="chinese-summary">
-    <h2>📑 论文中文摘要</h2>
-    <div class="summary-content">
-        <p><strong>📌 论文标题：</strong>{paper['title']}</p>
-        <p><strong>👥 作者信息：</strong>{paper.get('authors', '未知作者')}</p>
-        <p><strong>📅 发表时间：</strong>{paper.get('published', '未知日期')}</p>
-        <p><strong>📚 发表来源：</strong>{paper.get('source', '未知来源')}{f", {paper.get('venue', '')}" if paper.get('venue') else ''}</p>
-        {f'<p><strong>📊 引用次数：</strong>{paper.get("citations", 0)}次</p>' if paper.get('citations') is not None else ''}
-        <p><strong>📝 内容概要：</strong></p>
-        <div class="abstract-text">
-            {paper.get('abstract', '暂无摘要信息。')}
-        </div>
-        <div class="audio-player">
-            <h3>🎧 语音朗读</h3>
-            <audio controls>
-                <source src="{audio_filename}" type="audio/wav">
-                您的浏览器不支持音频播放。
-            </audio>
-            <p class="audio-note">注：如果音频无法播放，请直接打开同目录下的 {audio_filename} 文件收听。</p>
-        </div>
-    </div>
-</div>"""
-            
-            # 创建HTML内容
-            html_content = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <title>{paper['title']}</title>
-    <style>
-        body {{ font-family: "Microsoft YaHei", Arial, sans-serif; margin: 40px; background-color: #f5f5f5; }}
-        .container {{ background-color: white; padding: 30px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }}
-        .paper-info {{ background: #f8f9fa; padding: 20px; border-radius: 5px; margin-bottom: 20px; }}
-        .chinese-summary {{ 
-            background-color: #fff8e1; 
-            padding: 20px; 
-            border-radius: 8px; 
-            margin: 20px 0;
-            border-left: 4px solid #ffc107;
-        }}
-        .summary-content {{ line-height: 1.8; }}
-        .abstract-text {{ 
-            background: #fff;
-            padding: 15px;
-            border-radius: 5px;
-            margin-top: 10px;
-            border: 1px solid #e0e0e0;
-        }}
-        .audio-player {{
-            margin-top: 20px;
-            padding: 15px;
-            background: #e3f2fd;
-            border-radius: 8px;
-            text-align: center;
-        }}
-        audio {{
-            width: 100%;
-            margin-top: 10px;
-        }}
-        .link {{ margin: 20px 0; text-align: center; }}
-        a {{ 
-            color: #0066cc; 
-            text-decoration: none; 
-            background-color: #e3f2fd;
-            padding: 10px 20px;
-            border-radius: 5px;
-            display: inline-block;
-            transition: all 0.3s;
-        }}
-        a:hover {{ 
-            background-color: #bbdefb;
-            transform: translateY(-2px);
-        }}
-        h1 {{ color: #333; border-bottom: 2px solid #0066cc; padding-bottom: 10px; }}
-        h2 {{ color: #5d4037; margin-top: 0; }}
-        h3 {{ color: #1976d2; margin-top: 0; }}
-        .meta {{ color: #666; margin: 5px 0; }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>📄 论文信息</h1>
-        
-        {chinese_summary}
-        
-        <div class="link">
-            <h3>🔗 访问原文:</h3>
-            <a href="{paper.get('web_url') or paper.get('url') or paper.get('pdf_url')}" target="_blank">
-                点击访问原文 →
-            </a>
-        </div>
-        
-        <div style="text-align: center; color: #888; font-size: 12px; margin-top: 30px;">
-            <p>📄 由机器视觉文献获取系统生成</p>
-            <p>🕒 生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-        </div>
-    </div>
-</body>
-</html>"""
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            
-            # 等待音频生成完成
-            audio_thread.join()
-                
-            return str(filepath)
+            # 摘要页由模板生成，按批写出
+            return self.pages.add(filepath, paper, audio_filename, self.tts_service.mime_type)
             
         except Exception as e:
             print(f"链接保存错误: {e}")
@@ -419,8 +247,8 @@ class ArxivCrawler:
         self.base_url = "http://export.arxiv.org/api/query"
         self.name = "arXiv"
     
-    def search(self, keywords, max_results=10):
-        """搜索论文"""
+    def search(self, keywords, max_results=10, telemetry=None, token=None):
+        """搜索论文（telemetry 接收抓取和解析统计，token 用于中止请求）"""
         try:
             # 构建查询
             query_parts = []
@@ -436,10 +264,15 @@ class ArxivCrawler:
                 'sortOrder': 'descending'
             }
             
-            response = requests.get(self.base_url, params=params, timeout=30)
+            telemetry = telemetry or CrawlTelemetry()
+            response = fetch(requests, self.base_url, token, params=params, timeout=30)
             response.raise_for_status()
+            telemetry.page(len(response.content), response.elapsed.total_seconds())
             
-            return self.parse_results(response.text)
+            with telemetry.parsing():
+                papers = self.parse_results(response.text)
+            telemetry.emitted(len(papers))
+            return papers
             
         except Exception as e:
             print(f"arXiv搜索错误: {e}")
@@ -521,8 +354,8 @@ class SemanticScholarCrawler:
         self.base_url = "https://api.semanticscholar.org/graph/v1/paper/search"
         self.name = "Semantic Scholar"
     
-    def search(self, keywords, max_results=10):
-        """搜索论文"""
+    def search(self, keywords, max_results=10, telemetry=None, token=None):
+        """搜索论文（telemetry 接收抓取和解析统计，token 用于中止请求）"""
         try:
             params = {
                 'query': keywords,
@@ -534,45 +367,51 @@ class SemanticScholarCrawler:
                 'User-Agent': 'Scientific Paper Crawler 1.0'
             }
             
-            response = requests.get(self.base_url, params=params, headers=headers, timeout=30)
+            telemetry = telemetry or CrawlTelemetry()
+            response = fetch(requests, self.base_url, token, params=params, headers=headers, timeout=30)
             response.raise_for_status()
+            telemetry.page(len(response.content), response.elapsed.total_seconds())
             
-            data = response.json()
-            papers = []
-            
-            for item in data.get('data', []):
-                authors = [author.get('name', '') for author in item.get('authors', [])]
-                
-                # 获取PDF链接
-                pdf_url = None
-                if item.get('openAccessPdf'):
-                    pdf_url = item['openAccessPdf'].get('url')
-                
-                # 获取网页链接
-                web_url = item.get('url')
-                if not web_url and item.get('externalIds'):
-                    doi = item['externalIds'].get('DOI')
-                    if doi:
-                        web_url = f"https://doi.org/{doi}"
-                
-                paper = {
-                    'title': item.get('title', '未知标题'),
-                    'authors': ', '.join(authors) if authors else '未知作者',
-                    'abstract': item.get('abstract', '无摘要') or '无摘要',
-                    'published': str(item.get('year', '未知年份')),
-                    'pdf_url': pdf_url,
-                    'web_url': web_url,
-                    'source': 'Semantic Scholar',
-                    'venue': item.get('venue', '未知期刊'),
-                    'citations': item.get('citationCount', 0)
-                }
-                papers.append(paper)
-            
+            with telemetry.parsing():
+                papers = self.parse_results(response.json())
+            telemetry.emitted(len(papers))
             return papers
             
         except Exception as e:
             print(f"Semantic Scholar搜索错误: {e}")
             return []
+    
+    def parse_results(self, data):
+        """解析搜索结果JSON"""
+        papers = []
+        for item in data.get('data', []):
+            authors = [author.get('name', '') for author in item.get('authors', [])]
+            
+            # 获取PDF链接
+            pdf_url = None
+            if item.get('openAccessPdf'):
+                pdf_url = item['openAccessPdf'].get('url')
+            
+            # 获取网页链接
+            web_url = item.get('url')
+            if not web_url and item.get('externalIds'):
+                doi = item['externalIds'].get('DOI')
+                if doi:
+                    web_url = f"https://doi.org/{doi}"
+            
+            paper = {
+                'title': item.get('title', '未知标题'),
+                'authors': ', '.join(authors) if authors else '未知作者',
+                'abstract': item.get('abstract', '无摘要') or '无摘要',
+                'published': str(item.get('year', '未知年份')),
+                'pdf_url': pdf_url,
+                'web_url': web_url,
+                'source': 'Semantic Scholar',
+                'venue': item.get('venue', '未知期刊'),
+                'citations': item.get('citationCount', 0)
+            }
+            papers.append(paper)
+        return papers
 
 class PubmedCrawler:
     """PubMed医学文献爬虫"""
@@ -581,8 +420,8 @@ class PubmedCrawler:
         self.base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
         self.name = "PubMed"
     
-    def search(self, keywords, max_results=10):
-        """搜索论文"""
+    def search(self, keywords, max_results=10, telemetry=None, token=None):
+        """搜索论文（telemetry 接收抓取和解析统计，token 用于中止请求）"""
         try:
             # 第一步：搜索获取ID
             search_url = f"{self.base_url}/esearch.fcgi"
@@ -596,8 +435,10 @@ class PubmedCrawler:
                 'email': 'example@example.com'
             }
             
-            search_response = requests.get(search_url, params=search_params, timeout=30)
+            telemetry = telemetry or CrawlTelemetry()
+            search_response = fetch(requests, search_url, token, params=search_params, timeout=30)
             search_response.raise_for_status()
+            telemetry.page(len(search_response.content), search_response.elapsed.total_seconds())
             search_data = search_response.json()
             
             ids = search_data.get('esearchresult', {}).get('idlist', [])
@@ -605,7 +446,7 @@ class PubmedCrawler:
                 return []
             
             # 添加延迟避免被限制
-            time.sleep(0.5)
+            (token or CancellationToken()).sleep(0.5)
             
             # 第二步：获取详细信息
             fetch_url = f"{self.base_url}/efetch.fcgi"
@@ -617,10 +458,14 @@ class PubmedCrawler:
                 'email': 'example@example.com'
             }
             
-            fetch_response = requests.get(fetch_url, params=fetch_params, timeout=60)
+            fetch_response = fetch(requests, fetch_url, token, params=fetch_params, timeout=60)
             fetch_response.raise_for_status()
+            telemetry.page(len(fetch_response.content), fetch_response.elapsed.total_seconds())
             
-            return self.parse_pubmed_xml(fetch_response.text)
+            with telemetry.parsing():
+                papers = self.parse_pubmed_xml(fetch_response.text)
+            telemetry.emitted(len(papers))
+            return papers
             
         except Exception as e:
             print(f"PubMed搜索错误: {e}")
@@ -702,8 +547,8 @@ class IEEE_Crawler:
         self.name = "IEEE Xplore"
         # 注意：实际使用需要IEEE API密钥
     
-    def search(self, keywords, max_results=10):
-        """搜索论文"""
+    def search(self, keywords, max_results=10, telemetry=None, token=None):
+        """搜索论文（telemetry 接收抓取和解析统计，token 用于中止请求）"""
         try:
             # 这里提供示例结果，实际需要IEEE API
             sample_papers = [
@@ -719,7 +564,9 @@ class IEEE_Crawler:
                 }
             ]
             
-            return sample_papers[:max_results]
+            papers = sample_papers[:max_results]
+            (telemetry or CrawlTelemetry()).emitted(len(papers))
+            return papers
             
         except Exception as e:
             print(f"IEEE搜索错误: {e}")
@@ -730,6 +577,7 @@ class CrawlerWorker(QThread):
     progress = pyqtSignal(int)
     status = pyqtSignal(str)
     result = pyqtSignal(list)
+    batch = pyqtSignal(list)  # 分批送出的结果，界面逐批插入
     finished = pyqtSignal()
     
     def __init__(self, domain, source, max_results, custom_keywords=""):
@@ -738,6 +586,11 @@ class CrawlerWorker(QThread):
         self.source = source
         self.max_results = max_results
         self.custom_keywords = custom_keywords
+        self.token = CancellationToken()
+    
+    def stop(self):
+        """请求停止（中止进行中的请求，线程自行退出）"""
+        self.token.cancel()
     
     def run(self):
         """运行爬虫"""
@@ -776,26 +629,34 @@ class CrawlerWorker(QThread):
                 "IEEE Xplore": IEEE_Crawler()
             }
             
+            telemetry = CrawlTelemetry(expected_items=self.max_results, listener=self.report_telemetry)
             if self.source in crawlers:
                 crawler = crawlers[self.source]
-                papers = crawler.search(keywords, self.max_results)
+                papers = crawler.search(keywords, self.max_results, telemetry, self.token)
             else:
                 self.status.emit(f"{self.source} 数据源暂未实现")
                 papers = []
             
-            self.status.emit(f"从 {self.source} 找到 {len(papers)} 篇相关论文")
+            self.token.raise_if_cancelled()
+            for start in range(0, len(papers), RESULT_BATCH_SIZE):
+                self.batch.emit(papers[start:start + RESULT_BATCH_SIZE])
             self.result.emit(papers)
-            
-            # 模拟处理进度
-            for i in range(101):
-                self.progress.emit(i)
-                self.msleep(20)
+            stats = telemetry.finish()
+            self.status.emit(f"从 {self.source} 找到 {len(papers)} 篇相关论文 | {stats.describe()}")
                 
+        except OperationCancelled:
+            self.status.emit("⏹️ 搜索已停止")
         except Exception as e:
             self.status.emit(f"搜索出错: {str(e)}")
             self.result.emit([])
         finally:
             self.finished.emit()
+    
+    def report_telemetry(self, snapshot):
+        """把爬取统计转换为进度和状态"""
+        self.progress.emit(snapshot.progress)
+        if not snapshot.finished:
+            self.status.emit(f"正在从 {self.source} 搜索... {snapshot.describe()}")
 
 class DownloadWorker(QThread):
     """下载工作线程"""
@@ -803,15 +664,24 @@ class DownloadWorker(QThread):
     status = pyqtSignal(str)
     finished = pyqtSignal()
     
-    def __init__(self, papers, download_path):
+    def __init__(self, papers, download_path, tts_service=None, db_engine=None):
         super().__init__()
         self.papers = papers
         self.download_path = download_path
+        self.tts_service = tts_service
+        self.db_engine = db_engine
+        self.token = CancellationToken()
+    
+    def stop(self):
+        """请求停止（当前下载保留为 .part，下次处理时续传）"""
+        self.token.cancel()
     
     def run(self):
         """运行下载"""
+        i = 0
+        downloader = None
         try:
-            downloader = EnhancedDownloader(self.download_path)
+            downloader = EnhancedDownloader(self.download_path, self.tts_service, self.db_engine)
             total_papers = len(self.papers)
             success_count = 0
             link_count = 0
@@ -823,7 +693,7 @@ class DownloadWorker(QThread):
                     overall_progress = int((i / total_papers) * 100 + (progress / total_papers))
                     self.progress.emit(min(overall_progress, 100))
                 
-                result = downloader.process_paper(paper, progress_callback)
+                result = downloader.process_paper(paper, progress_callback, self.token)
                 
                 if result['success']:
                     if result.get('link_saved'):
@@ -837,16 +707,192 @@ class DownloadWorker(QThread):
                 
                 # 更新总进度
                 self.progress.emit(int(((i + 1) / total_papers) * 100))
-                time.sleep(0.5)
+                self.token.sleep(0.5)
             
             summary = f"🎉 处理完成！PDF下载: {success_count}篇，链接保存: {link_count}篇，总计: {total_papers}篇"
             self.status.emit(summary)
             
+        except OperationCancelled:
+            self.status.emit(f"⏹️ 处理已停止（已完成 {i}/{len(self.papers)} 篇），再次处理时跳过已下载的文件并续传未完成的PDF")
         except Exception as e:
             self.status.emit(f"处理出错: {str(e)}")
         finally:
+            if downloader is not None:
+                try:
+                    index_path = downloader.finish()
+                    self.status.emit(f"📑 摘要索引: {index_path}")
+                except OSError as e:
+                    self.status.emit(f"摘要页写出失败: {str(e)}")
             self.finished.emit()
 
+def paper_to_item(paper):
+    """把数据库论文对象转换为与检索结果相同的字典格式"""
+    if isinstance(paper, dict):
+        return paper
+    return {
+        'id': paper.id,
+        'title': paper.title,
+        'authors': paper.authors or '',
+        'abstract': paper.abstract or '',
+        'source': paper.source or '',
+        'published': paper.published_date.strftime('%Y-%m-%d') if paper.published_date else '未知日期',
+        'pdf_url': None,
+        'web_url': paper.url,
+        'pdf_path': paper.pdf_path,
+    }
+
+class PaperListModel(QAbstractListModel):
+    """检索结果列表模型：只保存论文数据，条目文本和颜色在视图需要绘制时才生成"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.papers = []
+        self.pdf_count = 0
+        self.link_count = 0
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.papers)
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.papers):
+            return None
+        paper = self.papers[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.item_text(index.row() + 1, paper)
+        if role == Qt.ItemDataRole.BackgroundRole:
+            if paper.get('pdf_url') or paper.get('pdf_path'):
+                return COLOR_PDF_AVAILABLE  # 浅绿色 - PDF可用
+            if paper.get('web_url'):
+                return COLOR_LINK_AVAILABLE  # 浅蓝色 - 仅链接可用
+            return COLOR_NO_LINK  # 浅灰色 - 无链接
+        if role == Qt.ItemDataRole.UserRole:
+            return paper.get('id')
+        return None
+    
+    @staticmethod
+    def item_text(number, paper):
+        """论文条目的显示文本"""
+        authors = paper.get('authors') or '未知作者'
+        status_icons = []
+        if paper.get('pdf_url'):
+            status_icons.append("📄PDF")
+        if paper.get('web_url'):
+            status_icons.append("🔗链接")
+        if not status_icons:
+            status_icons.append("❌无链接")
+        return (
+            f"📑 论文 {number} ({paper.get('source', '未知来源')})\n"
+            f"📌 {paper['title']}\n"
+            f"👥 {authors[:100]}{'...' if len(authors) > 100 else ''}\n"
+            f"📅 {paper.get('published', '未知日期')} | {' | '.join(status_icons)}"
+        )
+    
+    def paper_at(self, row):
+        return self.papers[row] if 0 <= row < len(self.papers) else None
+    
+    def clear(self):
+        self.beginResetModel()
+        self.papers = []
+        self.pdf_count = 0
+        self.link_count = 0
+        self.endResetModel()
+    
+    def append_papers(self, papers):
+        """追加一批论文（一次插入通知，统计随之累加）"""
+        if not papers:
+            return
+        first = len(self.papers)
+        self.beginInsertRows(QModelIndex(), first, first + len(papers) - 1)
+        for paper in papers:
+            paper = paper_to_item(paper)
+            self.papers.append(paper)
+            if paper.get('pdf_url'):
+                self.pdf_count += 1
+            if paper.get('web_url'):
+                self.link_count += 1
+        self.endInsertRows()
+    
+    def set_papers(self, papers):
+        self.clear()
+        self.append_papers(papers)
+
+class PaperItemDelegate(QStyledItemDelegate):
+    """论文条目绘制：固定行高，视图只绘制可见的条目"""
+    LINES = 4
+    
+    def paint(self, painter, option, index):
+        painter.save()
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+            painter.setPen(option.palette.highlightedText().color())
+        else:
+            background = index.data(Qt.ItemDataRole.BackgroundRole)
+            if background is not None:
+                painter.fillRect(option.rect.adjusted(0, 1, 0, -1), background)
+        painter.drawText(
+            option.rect.adjusted(8, 4, -8, -4),
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            index.data(Qt.ItemDataRole.DisplayRole) or ""
+        )
+        painter.restore()
+    
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), option.fontMetrics.lineSpacing() * self.LINES + 12)
+
+class ClusterWorker(QThread):
+    """结果聚类工作线程"""
+    clusters_ready = pyqtSignal(list)
+    status = pyqtSignal(str)
+    
+    def __init__(self, papers):
+        super().__init__()
+        self.papers = papers
+    
+    def run(self):
+        """对检索结果的标题和摘要聚类"""
+        try:
+            texts = [f"{p.get('title', '')} {p.get('abstract', '')}" for p in self.papers]
+            self.clusters_ready.emit(cluster_texts(texts))
+        except Exception as e:
+            self.status.emit(f"结果聚类出错: {str(e)}")
+
+class RelatedPapersWorker(QThread):
+    """相似论文检索工作线程（同步向量索引可能需要对整个文献库拟合模型）"""
+    related_ready = pyqtSignal(list)
+    status = pyqtSignal(str)
+    
+    def __init__(self, embedding_index, db_manager, paper_id=None, text="", k=10):
+        super().__init__()
+        self.embedding_index = embedding_index
+        self.db_manager = db_manager
+        self.paper_id = paper_id
+        self.text = text
+        self.k = k
+    
+    def run(self):
+        """同步索引后检索，结果为 (标题, 作者, 链接, 相似度) 列表"""
+        session = sessionmaker(bind=self.db_manager.engine)()
+        try:
+            added = self.embedding_index.sync(
+                lambda after_id: self.db_manager.iter_paper_texts(after_id, session=session)
+            )
+            if added:
+                self.status.emit(f"🧭 相似论文索引已更新 {added} 篇")
+            if self.paper_id is not None:
+                related = self.embedding_index.related(self.paper_id, self.k)
+            else:
+                # 尚未入库的搜索结果按标题和摘要检索
+                related = self.embedding_index.search_text(self.text, self.k)
+            # 在工作线程中从建索引的同一个库读取列表内容，界面线程不再查询数据库
+            summaries = self.db_manager.paper_summaries([paper_id for paper_id, _ in related], session=session)
+            self.related_ready.emit([
+                (*summaries[paper_id], score) for paper_id, score in related if paper_id in summaries
+            ])
+        except Exception as e:
+            self.status.emit(f"相似论文检索出错: {str(e)}")
+        finally:
+            session.close()
+
 class PaperDialog(QDialog):
     """论文详情对话框"""
     
@@ -945,8 +991,13 @@ class VisionLiteratureSystem(QMainWindow):
         self.current_papers = []
         self.crawler_worker = None
         self.download_worker = None
+        self.tts_service = None
+        self.cluster_worker = None
+        self.pending_cluster_papers = None  # 上一次聚类结束后再聚类的结果
         self.dark_mode = False
         self.db_manager = DatabaseManager()
+        self.embedding_index = None  # 相似论文索引，首次使用时加载
+        self.related_worker = None
         self.init_ui()
     
     def init_ui(self):
@@ -1409,10 +1460,32 @@ class VisionLiteratureSystem(QMainWindow):
         toolbar_layout.addStretch()
         result_layout.addLayout(toolbar_layout)
         
-        # 结果列表
-        self.result_list = QListWidget()
-        self.result_list.itemDoubleClicked.connect(self.open_paper_link)
-        result_layout.addWidget(self.result_list)
+        # 结果统计
+        self.result_stats = QLabel("等待搜索...")
+        result_layout.addWidget(self.result_stats)
+        
+        # 结果列表（模型 + 委托，只绘制可见条目）
+        self.result_model = PaperListModel(self)
+        self.result_list = QListView()
+        self.result_list.setModel(self.result_model)
+        self.result_list.setItemDelegate(PaperItemDelegate(self.result_list))
+        self.result_list.setUniformItemSizes(True)
+        self.result_list.setLayoutMode(QListView.LayoutMode.Batched)
+        self.result_list.setBatchSize(100)
+        self.result_list.doubleClicked.connect(self.open_paper_link)
+        self.result_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.result_list.customContextMenuRequested.connect(self.show_result_context_menu)
+        
+        # 聚类视图（簇展开时才创建论文条目）
+        self.cluster_tree = QTreeWidget()
+        self.cluster_tree.setHeaderHidden(True)
+        self.cluster_tree.itemExpanded.connect(self.populate_cluster)
+        self.cluster_tree.itemDoubleClicked.connect(self.open_cluster_paper)
+        
+        self.result_tabs = QTabWidget()
+        self.result_tabs.addTab(self.result_list, "📋 列表")
+        self.result_tabs.addTab(self.cluster_tree, "🧩 聚类")
+        result_layout.addWidget(self.result_tabs)
         
         return result_group
     
@@ -1430,7 +1503,9 @@ class VisionLiteratureSystem(QMainWindow):
         custom_keywords = self.custom_keywords.text().strip()
         
         # 重置界面
-        self.result_list.clear()
+        self.result_model.clear()
+        self.cluster_tree.clear()
+        self.current_papers = self.result_model.papers
         self.progress_bar.setValue(0)
         self.start_button.setEnabled(False)
         self.stop_button.setEnabled(True)
@@ -1446,6 +1521,7 @@ class VisionLiteratureSystem(QMainWindow):
         self.crawler_worker = CrawlerWorker(domain, source, max_results, custom_keywords)
         self.crawler_worker.progress.connect(self.progress_bar.setValue)
         self.crawler_worker.status.connect(self.update_status)
+        self.crawler_worker.batch.connect(self.append_results)
         self.crawler_worker.result.connect(self.display_results)
         self.crawler_worker.finished.connect(self.search_finished)
         self.crawler_worker.start()
@@ -1463,28 +1539,34 @@ class VisionLiteratureSystem(QMainWindow):
         self.progress_bar.setValue(0)
         self.download_button.setEnabled(False)
         self.start_button.setEnabled(False)
+        self.stop_button.setEnabled(True)
         
         self.update_status(f"📥 开始处理 {len(self.current_papers)} 篇论文，保存到: {download_path}")
         
         # 创建并启动下载线程
-        self.download_worker = DownloadWorker(self.current_papers, download_path)
+        if self.tts_service is None:
+            self.tts_service = TTSService()
+        self.download_worker = DownloadWorker(
+            self.current_papers, download_path, self.tts_service, self.db_manager.engine
+        )
         self.download_worker.progress.connect(self.progress_bar.setValue)
         self.download_worker.status.connect(self.update_status)
         self.download_worker.finished.connect(self.download_finished)
         self.download_worker.start()
     
     def stop_search(self):
-        """停止搜索"""
-        if self.crawler_worker and self.crawler_worker.isRunning():
-            self.crawler_worker.terminate()
-            self.crawler_worker.wait()
-        self.update_status("⏹️ 搜索已停止")
-        self.search_finished()
+        """停止搜索或文件处理（协作式取消，线程在下一个检查点退出后发出 finished）"""
+        self.stop_button.setEnabled(False)
+        for worker in (self.crawler_worker, self.download_worker):
+            if worker and worker.isRunning():
+                worker.stop()
+                self.update_status("⏹️ 正在停止...")
     
     def clear_results(self):
         """清空结果"""
-        self.result_list.clear()
-        self.current_papers = []
+        self.result_model.clear()
+        self.cluster_tree.clear()
+        self.current_papers = self.result_model.papers
         self.progress_bar.setValue(0)
         self.download_button.setEnabled(False)
         self.result_stats.setText("等待搜索...")
@@ -1507,68 +1589,101 @@ class VisionLiteratureSystem(QMainWindow):
             self.status_text.verticalScrollBar().maximum()
         )
     
+    def append_results(self, papers):
+        """插入一批检索结果"""
+        self.result_model.append_papers(papers)
+        self.current_papers = self.result_model.papers
+        self.update_result_stats()
+    
+    def update_result_stats(self):
+        """更新结果统计（计数在插入时累加，不再遍历全部结果）"""
+        model = self.result_model
+        self.result_stats.setText(
+            f"📊 找到 {model.rowCount()} 篇论文 | 📄 {model.pdf_count} 篇可下载PDF | 🔗 {model.link_count} 篇有网页链接"
+        )
+    
     def display_results(self, papers):
-        """显示搜索结果"""
-        self.current_papers = papers
-        self.result_list.clear()
+        """显示搜索结果（已分批插入的结果不会重复插入）"""
+        if len(papers) != self.result_model.rowCount():
+            self.result_model.set_papers(papers)
+        self.current_papers = self.result_model.papers
+        self.cluster_tree.clear()
         
         if not papers:
-            item = QListWidgetItem("❌ 未找到相关论文，请尝试更换数据源或修改关键词")
-            self.result_list.addItem(item)
-            self.result_stats.setText("📊 搜索结果: 0 篇论文")
+            self.result_stats.setText("📊 搜索结果: 0 篇论文 | ❌ 未找到相关论文，请尝试更换数据源或修改关键词")
             return
         
-        # 统计信息
-        total_papers = len(papers)
-        pdf_available = len([p for p in papers if p.get('pdf_url')])
-        link_available = len([p for p in papers if p.get('web_url')])
-        
-        stats_text = f"📊 找到 {total_papers} 篇论文 | 📄 {pdf_available} 篇可下载PDF | 🔗 {link_available} 篇有网页链接"
-        self.result_stats.setText(stats_text)
-        
-        # 显示论文列表
-        for i, paper in enumerate(papers, 1):
-            # 创建论文条目
-            title = paper['title']
-            authors = paper.get('authors', '未知作者')
-            source = paper.get('source', '未知来源')
-            published = paper.get('published', '未知日期')
-            
-            # 确定可用性状态
-            status_icons = []
-            if paper.get('pdf_url'):
-                status_icons.append("📄PDF")
-            if paper.get('web_url'):
-                status_icons.append("🔗链接")
-            if not status_icons:
-                status_icons.append("❌无链接")
-            
-            status_str = " | ".join(status_icons)
-            
-            item_text = f"""📑 论文 {i} ({source})
-📌 {title}
-👥 {authors[:100]}{'...' if len(authors) > 100 else ''}
-📅 {published} | {status_str}"""
-            
-            item = QListWidgetItem(item_text)
-            
-            # 设置颜色
-            if paper.get('pdf_url'):
-                item.setBackground(COLOR_PDF_AVAILABLE)  # 浅绿色 - PDF可用
-            elif paper.get('web_url'):
-                item.setBackground(COLOR_LINK_AVAILABLE)  # 浅蓝色 - 仅链接可用
-            else:
-                item.setBackground(COLOR_NO_LINK)  # 浅灰色 - 无链接
-            
-            self.result_list.addItem(item)
+        self.update_result_stats()
+        if len(papers) >= CLUSTER_MIN_RESULTS:
+            self.start_clustering(self.current_papers)
+    
+    def start_clustering(self, papers):
+        """在后台线程中对结果聚类"""
+        placeholder = QTreeWidgetItem(["⏳ 正在对结果聚类..."])
+        self.cluster_tree.addTopLevelItem(placeholder)
+        if self.cluster_worker is not None and self.cluster_worker.isRunning():
+            # 不能替换仍在运行的线程（会被回收），等它结束后只对最新的结果聚类
+            self.pending_cluster_papers = papers
+            return
+        self.cluster_worker = ClusterWorker(papers)
+        self.cluster_worker.clusters_ready.connect(
+            lambda clusters, papers=papers: self.show_clusters(papers, clusters)
+        )
+        self.cluster_worker.status.connect(self.update_status)
+        self.cluster_worker.finished.connect(self.start_pending_clustering)
+        self.cluster_worker.start()
+    
+    def start_pending_clustering(self):
+        """上一次聚类结束后，对期间到达的最新结果聚类"""
+        papers, self.pending_cluster_papers = self.pending_cluster_papers, None
+        if papers is None or papers is not self.current_papers:
+            return
+        self.cluster_worker.wait()  # finished 信号发出时线程可能尚未完全退出
+        self.cluster_tree.clear()
+        self.start_clustering(papers)
+    
+    def show_clusters(self, papers, clusters):
+        """显示聚类结果（只创建簇条目，论文在展开时再加载）"""
+        if papers is not self.current_papers:
+            return  # 已经开始了新的搜索
+        self.cluster_tree.clear()
+        for cluster in clusters:
+            item = QTreeWidgetItem([f"🧩 {cluster.label} ({len(cluster.members)}篇)"])
+            item.setData(0, Qt.ItemDataRole.UserRole, cluster)
+            item.setToolTip(0, "代表论文：\n" + "\n".join(
+                papers[i]['title'] for i in cluster.representatives
+            ))
+            item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
+            self.cluster_tree.addTopLevelItem(item)
+        self.update_status(f"🧩 结果已聚为 {len(clusters)} 组")
+    
+    def populate_cluster(self, item):
+        """展开簇时创建其中的论文条目"""
+        cluster = item.data(0, Qt.ItemDataRole.UserRole)
+        if cluster is None or item.childCount():
+            return
+        representatives = set(cluster.representatives)
+        for index in cluster.members:
+            paper = self.current_papers[index]
+            marker = "⭐ " if index in representatives else ""
+            child = QTreeWidgetItem([f"{marker}{paper['title']}"])
+            child.setToolTip(0, f"{paper.get('authors', '')}\n{paper.get('published', '')}")
+            child.setData(0, Qt.ItemDataRole.UserRole, index)
+            item.addChild(child)
+    
+    def open_cluster_paper(self, item, column=0):
+        """双击聚类视图中的论文打开链接"""
+        index = item.data(0, Qt.ItemDataRole.UserRole)
+        if isinstance(index, int) and 0 <= index < len(self.current_papers):
+            paper = self.current_papers[index]
+            url = paper.get('pdf_url') or paper.get('web_url')
+            if url:
+                QDesktopServices.openUrl(QUrl(url))
     
-    def open_paper_link(self, item):
+    def open_paper_link(self, index):
         """双击打开论文链接"""
-        # 获取选中的论文索引
-        row = self.result_list.row(item)
-        if 0 <= row < len(self.current_papers):
-            paper = self.current_papers[row]
-            
+        paper = self.result_model.paper_at(index.row())
+        if paper is not None:
             # 优先打开PDF链接，否则打开网页链接
             url = paper.get('pdf_url') or paper.get('web_url')
             if url:
@@ -1577,6 +1692,63 @@ class VisionLiteratureSystem(QMainWindow):
             else:
                 QMessageBox.information(self, "提示", "该论文没有可用的链接")
     
+    def show_result_context_menu(self, pos):
+        """结果列表右键菜单"""
+        index = self.result_list.indexAt(pos)
+        if not index.isValid():
+            return
+        menu = QMenu(self)
+        related_action = menu.addAction("🔗 查找相似论文")
+        if menu.exec(self.result_list.mapToGlobal(pos)) == related_action:
+            self.show_related_papers(index)
+    
+    def show_related_papers(self, index, k=10):
+        """在后台线程中查找文献库中与选中论文相似的论文"""
+        if self.related_worker is not None and self.related_worker.isRunning():
+            self.update_status("⏳ 正在查找相似论文，请稍候...")
+            return
+        paper_id = index.data(Qt.ItemDataRole.UserRole)
+        paper = self.result_model.paper_at(index.row())
+        if paper_id is None and paper is None:
+            return
+        if self.embedding_index is None:
+            self.embedding_index = EmbeddingIndex("./data/embeddings/library")
+        
+        self.update_status("🧭 正在查找相似论文...")
+        text = f"{paper['title']} {paper.get('abstract', '')}" if paper is not None else ""
+        self.related_worker = RelatedPapersWorker(self.embedding_index, self.db_manager, paper_id, text, k)
+        self.related_worker.related_ready.connect(self.show_related_dialog)
+        self.related_worker.status.connect(self.update_status)
+        self.related_worker.start()
+    
+    def show_related_dialog(self, related):
+        """显示相似论文列表"""
+        if not related:
+            QMessageBox.information(self, "相似论文", "文献库中没有找到相似的论文")
+            return
+        
+        dialog = QDialog(self)
+        dialog.setWindowTitle("🔗 相似论文")
+        dialog.setMinimumSize(600, 400)
+        layout = QVBoxLayout(dialog)
+        related_list = QListWidget()
+        for title, authors, url, score in related:
+            related_item = QListWidgetItem(f"{score:.2f} | {title}\n作者: {authors}")
+            related_item.setData(Qt.ItemDataRole.UserRole, url)
+            related_list.addItem(related_item)
+        related_list.itemDoubleClicked.connect(self.open_related_paper)
+        layout.addWidget(related_list)
+        button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        button_box.rejected.connect(dialog.reject)
+        layout.addWidget(button_box)
+        dialog.exec()
+    
+    def open_related_paper(self, item):
+        """双击相似论文打开链接"""
+        url = item.data(Qt.ItemDataRole.UserRole)
+        if url:
+            QDesktopServices.openUrl(QUrl(url))
+    
     def search_finished(self):
         """搜索完成"""
         self.start_button.setEnabled(True)
@@ -1587,8 +1759,9 @@ class VisionLiteratureSystem(QMainWindow):
         if self.current_papers:
             self.download_button.setEnabled(True)
             
-            # 如果启用了自动下载
-            if self.auto_download_check.isChecked():
+            # 如果启用了自动下载（搜索被停止时不自动开始）
+            stopped = self.crawler_worker is not None and self.crawler_worker.token.cancelled
+            if self.auto_download_check.isChecked() and not stopped:
                 self.update_status("🔄 自动处理已启用，1秒后开始处理...")
                 QTimer.singleShot(1000, self.start_download)
     
@@ -1596,6 +1769,9 @@ class VisionLiteratureSystem(QMainWindow):
         """下载完成"""
         self.download_button.setEnabled(True)
         self.start_button.setEnabled(True)
+        self.stop_button.setEnabled(False)
+        if self.download_worker is not None and self.download_worker.token.cancelled:
+            return  # 已停止，状态栏已有说明
         self.progress_bar.setValue(100)
         
         # 显示完成消息
@@ -1625,12 +1801,12 @@ class VisionLiteratureSystem(QMainWindow):
     
     def edit_selected_paper(self):
         """编辑选中的论文"""
-        current_item = self.result_list.currentItem()
-        if not current_item:
+        current_index = self.result_list.currentIndex()
+        if not current_index.isValid():
             QMessageBox.warning(self, "警告", "请先选择一篇论文")
             return
         
-        paper_id = current_item.data(Qt.ItemDataRole.UserRole)
+        paper_id = current_index.data(Qt.ItemDataRole.UserRole)
         paper = self.db_manager.get_paper_by_id(paper_id)
         if not paper:
             QMessageBox.warning(self, "错误", "论文不存在")
@@ -1650,8 +1826,8 @@ class VisionLiteratureSystem(QMainWindow):
     
     def delete_selected_paper(self):
         """删除选中的论文"""
-        current_item = self.result_list.currentItem()
-        if not current_item:
+        current_index = self.result_list.currentIndex()
+        if not current_index.isValid():
             QMessageBox.warning(self, "警告", "请先选择一篇论文")
             return
         
@@ -1662,7 +1838,7 @@ class VisionLiteratureSystem(QMainWindow):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            paper_id = current_item.data(Qt.ItemDataRole.UserRole)
+            paper_id = current_index.data(Qt.ItemDataRole.UserRole)
             if self.db_manager.delete_paper(paper_id):
                 QMessageBox.information(self, "成功", "论文已删除")
                 self.refresh_results()
@@ -1671,12 +1847,12 @@ class VisionLiteratureSystem(QMainWindow):
     
     def add_note_to_paper(self):
         """为论文添加笔记"""
-        current_item = self.result_list.currentItem()
-        if not current_item:
+        current_index = self.result_list.currentIndex()
+        if not current_index.isValid():
             QMessageBox.warning(self, "警告", "请先选择一篇论文")
             return
         
-        paper_id = current_item.data(Qt.ItemDataRole.UserRole)
+        paper_id = current_index.data(Qt.ItemDataRole.UserRole)
         paper = self.db_manager.get_paper_by_id(paper_id)
         if not paper:
             QMessageBox.warning(self, "错误", "论文不存在")
@@ -1717,25 +1893,28 @@ class VisionLiteratureSystem(QMainWindow):
                     QMessageBox.warning(self, "错误", "添加笔记失败")
     
     def refresh_results(self):
-        """刷新结果列表"""
-        self.result_list.clear()
-        for paper in self.current_papers:
-            item = QListWidgetItem()
-            item.setText(f"{paper.title}\n作者: {paper.authors}")
-            item.setData(Qt.ItemDataRole.UserRole, paper.id)
-            
-            # 设置颜色
-            if paper.pdf_path:
-                item.setBackground(COLOR_PDF_AVAILABLE)
-            elif paper.url:
-                item.setBackground(COLOR_LINK_AVAILABLE)
-            else:
-                item.setBackground(COLOR_NO_LINK)
-            
-            self.result_list.addItem(item)
+        """刷新结果列表（重新读取已入库论文的最新信息）"""
+        papers = []
+        for paper in self.result_model.papers:
+            if paper.get('id') is not None:
+                updated = self.db_manager.get_paper_by_id(paper['id'])
+                if updated is None:
+                    continue  # 已删除
+                paper = paper_to_item(updated)
+            papers.append(paper)
+        self.result_model.set_papers(papers)
+        self.current_papers = self.result_model.papers
+        self.update_result_stats()
     
     def closeEvent(self, event):
-        """关闭窗口时的处理"""
+        """关闭窗口时的处理（先停止工作线程，再关闭数据库）"""
+        for worker in (self.crawler_worker, self.download_worker, self.cluster_worker, self.related_worker):
+            if worker and worker.isRunning():
+                if hasattr(worker, 'stop'):
+                    worker.stop()
+                worker.wait()
+        if self.tts_service is not None:
+            self.tts_service.shutdown(wait=False, cancel_pending=True)
         self.db_manager.close()
         super().closeEvent(event)
 
@@ -65,6 +65,30 @@ class Note(Base):
     # 关系
     paper = relationship("Paper", back_populates="notes")
 
+class Blob(Base):
+    """按 SHA-256 内容寻址存储的文件"""
+    __tablename__ = 'blobs'
+
+    sha256 = Column(String(64), primary_key=True)
+    size = Column(Integer, nullable=False)
+    created_date = Column(DateTime, default=datetime.datetime.utcnow)
+
+    # 关系
+    links = relationship("BlobLink", back_populates="blob")
+
+class BlobLink(Base):
+    """可读路径（硬链接或符号链接）到文件内容的映射"""
+    __tablename__ = 'blob_links'
+
+    id = Column(Integer, primary_key=True)
+    path = Column(String(1000), nullable=False, unique=True)
+    sha256 = Column(String(64), ForeignKey('blobs.sha256'), nullable=False, index=True)
+    url = Column(String(1000), index=True)
+    created_date = Column(DateTime, default=datetime.datetime.utcnow)
+
+    # 关系
+    blob = relationship("Blob", back_populates="links")
+
 def init_db(db_path='sqlite:///papers.db'):
     """初始化数据库"""
     engine = create_engine(db_path)
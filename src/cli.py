@@ -1 +1,83 @@
- 
\ No newline at end of file
+"""命令行采集入口（无界面，可在服务器上定时运行）
+
+    python src/cli.py run                     # 执行 config.yaml 中的全部采集任务一次
+    python src/cli.py run --job daily_vision  # 只执行指定任务
+    python src/cli.py daemon                  # 按各任务的间隔持续运行
+    python src/cli.py harvest 工业视觉检测 --days 30 --full
+    python src/cli.py jobs                    # 列出配置的采集任务
+"""
+import argparse
+import asyncio
+import os
+import sys
+import yaml
+from loguru import logger
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.harvester import Harvester, HarvestJob, HarvestScheduler, load_jobs
+
+def load_config(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="机器视觉文献采集服务")
+    parser.add_argument("--config", default="config/config.yaml", help="配置文件路径")
+    parser.add_argument("--max-concurrent", type=int, help="每个任务的最大并发下载数")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="执行采集任务一次")
+    run.add_argument("--job", action="append", help="任务名（可重复，默认全部）")
+
+    commands.add_parser("daemon", help="按任务间隔持续采集")
+    commands.add_parser("jobs", help="列出采集任务")
+
+    harvest = commands.add_parser("harvest", help="不经任务配置直接采集")
+    harvest.add_argument("keywords", nargs="+", help="领域名或关键词")
+    harvest.add_argument("--source", action="append", help="数据源（可重复，默认 arxiv）")
+    harvest.add_argument("--days", type=int, default=7, help="时间范围（天）")
+    harvest.add_argument("--full", action="store_true", help="忽略水位线，采集完整时间范围")
+    return parser
+
+def select_jobs(jobs, names):
+    if not names:
+        return jobs
+    unknown = set(names) - {job.name for job in jobs}
+    if unknown:
+        raise SystemExit(f"未知的采集任务: {', '.join(sorted(unknown))}")
+    return [job for job in jobs if job.name in names]
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    config = load_config(args.config)
+    logging_config = config.get("logging", {})
+    logger.add(logging_config.get("file", "logs/crawler.log"), rotation="1 day", retention="30 days",
+               level=logging_config.get("level", "INFO"))
+
+    jobs = load_jobs(config)
+    if args.command == "jobs":
+        for job in jobs:
+            print(f"{job.name}: {', '.join(job.domains)} | {', '.join(job.sources)} | "
+                  f"{job.days} 天 | 每 {job.interval_hours} 小时")
+        return
+
+    harvester = Harvester(config, max_concurrent=args.max_concurrent)
+    max_concurrent_jobs = config.get("harvest", {}).get("max_concurrent_jobs", 1)
+    if args.command == "harvest":
+        job = HarvestJob("cli", args.keywords, args.source or ["arxiv"], args.days, incremental=not args.full)
+        scheduler = HarvestScheduler(harvester, [job])
+    else:
+        scheduler = HarvestScheduler(harvester, select_jobs(jobs, args.job if args.command == "run" else None),
+                                     max_concurrent_jobs)
+
+    try:
+        if args.command == "daemon":
+            asyncio.run(scheduler.run_forever())
+        else:
+            asyncio.run(scheduler.run_once())
+    except KeyboardInterrupt:
+        # 未完成的下载保留为 .part，水位线未推进，下次运行时续传
+        logger.info("采集已停止")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,14 @@
 import arxiv
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 import aiohttp
 import os
+from pathlib import Path
 from .base_crawler import BaseCrawler, Paper
+from .arxiv_paginator import ArxivPaginator, submitted_date_filter, to_utc
+from .cancellation import part_path
+from .query_planner import query_terms
+from .file_writer import AsyncFileWriter
 
 class ArxivCrawler(BaseCrawler):
     """arXiv爬虫实现"""
@@ -11,44 +16,62 @@ class ArxivCrawler(BaseCrawler):
     def __init__(self, config):
         super().__init__(config)
         self.client = arxiv.Client()
+        self.paginator = ArxivPaginator(self.client)
         self.categories = self.config["sources"]["arxiv"]["categories"]
         self.max_results = self.config["sources"]["arxiv"]["max_results_per_query"]
     
+    def result_limit(self, keyword: str) -> int:
+        """max_results_per_query 按每个关键词计，合并查询的上限随合并的关键词数放大"""
+        return self.max_results * query_terms(keyword)
+    
     async def search(self, keyword: str, from_date: datetime, to_date: datetime) -> List[Paper]:
         """搜索arXiv论文"""
+        papers, _ = await self.search_batch(keyword, from_date, to_date)
+        return papers
+    
+    async def search_batch(self, keyword: str, from_date: datetime, to_date: datetime) -> Tuple[List[Paper], int]:
+        """搜索arXiv论文，同时返回服务器返回的条数（含 to_date 所在分钟内晚于 to_date 的条目）"""
         papers = []
+        received = 0
+        to_date = to_utc(to_date)
         
-        # 构建查询
-        query = f"{keyword} AND cat:({' OR '.join(self.categories)})"
+        # 构建查询（提交日期范围交给服务器过滤）
+        query = (f"({keyword}) AND cat:({' OR '.join(self.categories)}) "
+                 f"AND {submitted_date_filter(from_date, to_date)}")
         
-        # 使用arxiv API搜索
+        # 使用arxiv API搜索（按提交时间倒序，分页器遇到早于 from_date 的结果即停止）
         search = arxiv.Search(
             query=query,
-            max_results=self.max_results,
-            sort_by=arxiv.SortCriterion.SubmittedDate
+            max_results=self.result_limit(keyword),
+            sort_by=arxiv.SortCriterion.SubmittedDate,
+            sort_order=arxiv.SortOrder.Descending
         )
         
-        async for result in self.client.results(search):
-            # 检查日期范围
-            if from_date <= result.published <= to_date:
-                paper = Paper(
-                    title=result.title,
-                    authors=[author.name for author in result.authors],
-                    abstract=result.summary,
-                    url=result.entry_id,
-                    pdf_url=result.pdf_url,
-                    published_date=result.published,
-                    source="arxiv",
-                    keywords=[cat.value for cat in result.categories],
-                    category=result.primary_category,
-                    language="en"
-                )
-                papers.append(paper)
+        # 晚于 to_date 的条目也占用 max_results，在这里计数后丢弃
+        async for result in self.paginator.results(search, from_date, telemetry=self.telemetry):
+            received += 1
+            if to_utc(result.published) > to_date:
+                continue
+            paper = Paper(
+                title=result.title,
+                authors=[author.name for author in result.authors],
+                abstract=result.summary,
+                url=result.entry_id,
+                pdf_url=result.pdf_url,
+                published_date=result.published,
+                source="arxiv",
+                keywords=list(result.categories),
+                category=result.primary_category,
+                language="en"
+            )
+            papers.append(paper)
         
-        return papers
+        if self.telemetry is not None:
+            self.telemetry.emitted(len(papers))
+        return papers, received
     
     async def download_paper(self, paper: Paper, save_path: str) -> bool:
-        """下载arXiv论文PDF"""
+        """下载arXiv论文PDF（断点续传：数据先写入 .part，任务被取消时保留，下次用 Range 请求续传）"""
         try:
             if not paper.pdf_url:
                 return False
@@ -58,24 +81,42 @@ class ArxivCrawler(BaseCrawler):
             
             # 构建文件名
             filename = f"{paper.title[:100].replace('/', '_')}.pdf"
-            filepath = os.path.join(save_path, filename)
+            filepath = Path(save_path) / filename
+            if filepath.exists():
+                return True
+            partial = part_path(filepath)
+            offset = partial.stat().st_size if partial.exists() else 0
+            headers = dict(self.headers)
+            if offset:
+                headers["Range"] = f"bytes={offset}-"
             
-            # 下载PDF
+            # 下载PDF（优先使用运行时注入的共享会话）
+            if self.session is not None:
+                return await self._fetch_pdf(self.session, paper.pdf_url, headers, partial, filepath)
             async with aiohttp.ClientSession() as session:
-                async with session.get(paper.pdf_url, headers=self.headers) as response:
-                    if response.status == 200:
-                        with open(filepath, 'wb') as f:
-                            while True:
-                                chunk = await response.content.read(8192)
-                                if not chunk:
-                                    break
-                                f.write(chunk)
-                        return True
-            return False
+                return await self._fetch_pdf(session, paper.pdf_url, headers, partial, filepath)
         except Exception as e:
             print(f"Error downloading paper {paper.title}: {str(e)}")
             return False
     
+    @staticmethod
+    async def _fetch_pdf(session: aiohttp.ClientSession, url: str, headers: dict,
+                         partial: Path, filepath: Path) -> bool:
+        async with session.get(url, headers=headers) as response:
+            if response.status == 416 and partial.exists():
+                # .part 已是完整文件
+                partial.replace(filepath)
+                return True
+            if response.status not in (200, 206):
+                return False
+            append = response.status == 206
+            # 写盘交给写入线程，不阻塞事件循环中的其他下载
+            async with AsyncFileWriter(partial, append=append) as writer:
+                async for chunk in response.content.iter_chunked(65536):
+                    await writer.write(chunk)
+        partial.replace(filepath)
+        return True
+    
     async def get_paper_details(self, paper: Paper) -> Paper:
         """获取论文详细信息"""
         # arXiv API已经提供了所有需要的信息
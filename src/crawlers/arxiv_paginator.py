@@ -0,0 +1,73 @@
+from concurrent.futures import Executor
+from datetime import datetime, timezone
+from itertools import islice
+from typing import AsyncIterator, Iterator, List, Optional, Tuple
+import asyncio
+import time
+from .telemetry import CrawlTelemetry
+
+def to_utc(value: datetime) -> datetime:
+    """统一为 UTC 时间（无时区的时间按本地时间处理），arXiv 返回的时间都带时区"""
+    return value.astimezone(timezone.utc)
+
+def submitted_date_filter(from_date: datetime, to_date: datetime) -> str:
+    """arXiv 查询语法的提交日期范围，让服务器端先按时间窗口过滤"""
+    fmt = "%Y%m%d%H%M"
+    return f"submittedDate:[{to_utc(from_date).strftime(fmt)} TO {to_utc(to_date).strftime(fmt)}]"
+
+class ArxivPaginator:
+    """arXiv 结果的异步分页器
+
+    arxiv.Client.results 是同步生成器（翻页之间还会 sleep），这里每次在线程中取一页，
+    取到后立即在后台预取下一页，事件循环不被阻塞。结果需按提交时间倒序：遇到早于
+    from_date 的结果即停止翻页，不会把整个分类的历史都翻一遍。
+    """
+
+    def __init__(self, client, page_size: Optional[int] = None, executor: Optional[Executor] = None):
+        self.client = client
+        # 与 client 的分页大小一致，每次取页正好对应一次 API 请求
+        self.page_size = page_size or getattr(client, "page_size", 100)
+        self.executor = executor
+        self.pages_fetched = 0
+
+    def _fetch_page(self, results: Iterator) -> Tuple[List, float]:
+        """在线程中取一页，返回 (结果, 耗时秒数)"""
+        start = time.perf_counter()
+        page = list(islice(results, self.page_size))
+        return page, time.perf_counter() - start
+
+    async def results(self, search, from_date: Optional[datetime] = None,
+                      to_date: Optional[datetime] = None,
+                      telemetry: Optional[CrawlTelemetry] = None) -> AsyncIterator:
+        """按页异步产出 search 的结果，只产出 [from_date, to_date] 内的论文
+
+        telemetry 记录每页的请求耗时（arxiv 库不提供响应字节数）。
+        """
+        from_date = to_utc(from_date) if from_date else None
+        to_date = to_utc(to_date) if to_date else None
+        loop = asyncio.get_running_loop()
+        results = self.client.results(search)
+        pending = loop.run_in_executor(self.executor, self._fetch_page, results)
+        try:
+            while pending is not None:
+                page, seconds = await pending
+                self.pages_fetched += 1
+                if telemetry is not None:
+                    telemetry.page(0, seconds)
+                # 整页取满时预取下一页，与本页结果的处理并行
+                pending = None
+                if len(page) == self.page_size:
+                    pending = loop.run_in_executor(self.executor, self._fetch_page, results)
+                for result in page:
+                    published = to_utc(result.published)
+                    if from_date and published < from_date:
+                        return
+                    if to_date and published > to_date:
+                        continue
+                    yield result
+        finally:
+            # 提前结束时，等后台预取结束后再关闭生成器（生成器不能在执行中关闭）
+            if pending is not None and not pending.done():
+                pending.add_done_callback(lambda _: results.close())
+            else:
+                results.close()
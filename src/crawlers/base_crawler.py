@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -24,6 +24,10 @@ class BaseCrawler(ABC):
     
     def __init__(self, config: Dict):
         self.config = config
+        # 由 CrawlerRuntime 注入的共享 aiohttp 会话（复用连接）；为 None 时每次请求自建会话
+        self.session = None
+        # 调用方注入的爬取遥测（页数、耗时、产出篇数）；为 None 时不统计
+        self.telemetry = None
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
@@ -33,6 +37,19 @@ class BaseCrawler(ABC):
         """搜索论文"""
         pass
     
+    def result_limit(self, keyword: str) -> Optional[int]:
+        """单次搜索服务器最多返回的条数，None 表示不限"""
+        return None
+    
+    async def search_batch(self, keyword: str, from_date: datetime, to_date: datetime) -> Tuple[List[Paper], int]:
+        """搜索论文，返回 (时间窗口内的论文, 服务器返回的条数)
+        
+        服务器按时间过滤的精度较粗时（arXiv 只精确到分钟），返回的条目中窗口外的会被丢弃，
+        判断结果是否被 result_limit 截断要看服务器返回的条数。默认两者相同。
+        """
+        papers = await self.search(keyword, from_date, to_date)
+        return papers, len(papers)
+    
     @abstractmethod
     async def download_paper(self, paper: Paper, save_path: str) -> bool:
         """下载论文PDF"""
@@ -49,7 +66,7 @@ class BaseCrawler(ABC):
         return all(hasattr(paper, field) and getattr(paper, field) for field in required_fields)
     
     async def process_paper(self, paper: Paper, save_path: str) -> Optional[Paper]:
-        """处理单篇论文"""
+        """处理单篇论文，失败（数据不完整、获取详情出错或PDF下载失败）时返回 None"""
         try:
             if not self._validate_paper(paper):
                 return None
@@ -62,6 +79,7 @@ class BaseCrawler(ABC):
                 success = await self.download_paper(paper, save_path)
                 if not success:
                     print(f"Failed to download PDF for paper: {paper.title}")
+                    return None
             
             return paper
         except Exception as e:
@@ -0,0 +1,137 @@
+from typing import Callable, List, Optional
+from pathlib import Path
+import threading
+
+class OperationCancelled(BaseException):
+    """操作已被取消
+
+    与 asyncio.CancelledError 一样继承 BaseException，不会被爬虫中的 except Exception 吞掉。
+    """
+
+class CancellationToken:
+    """协作式取消令牌
+
+    由界面线程调用 cancel()，工作线程在检查点调用 raise_if_cancelled() 退出；
+    register() 注册的回调（如关闭连接、取消异步任务）在取消时立即执行，用于中止进行中的请求。
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self):
+        """请求取消（可重复调用，回调只执行一次）"""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass  # 回调失败不影响取消本身
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise OperationCancelled()
+
+    def register(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """注册取消回调，返回注销函数；已取消时立即执行"""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                registered = True
+            else:
+                registered = False
+        if not registered:
+            callback()
+
+        def unregister():
+            with self._lock:
+                if callback in self._callbacks:
+                    self._callbacks.remove(callback)
+        return unregister
+
+    def sleep(self, seconds: float):
+        """可被取消打断的等待"""
+        if self._event.wait(seconds):
+            raise OperationCancelled()
+
+def fetch(http, url: str, token: Optional[CancellationToken] = None, **kwargs):
+    """可取消的 GET 请求，返回已读完响应体的响应
+
+    取消时关闭连接以中止正在读取的响应体，并抛出 OperationCancelled。
+    http 为 requests 模块或 requests.Session。
+    """
+    token = token or CancellationToken()
+    token.raise_if_cancelled()
+    response = http.get(url, stream=True, **kwargs)
+    unregister = token.register(response.close)
+    try:
+        response.content  # 读取响应体
+    except Exception:
+        token.raise_if_cancelled()
+        raise
+    finally:
+        unregister()
+    token.raise_if_cancelled()
+    return response
+
+def part_path(path: Path) -> Path:
+    """未完成下载的断点文件"""
+    return path.with_name(path.name + ".part")
+
+def download_resumable(http, url: str, path: Path, token: Optional[CancellationToken] = None,
+                       progress_callback: Optional[Callable[[int], None]] = None,
+                       chunk_size: int = 8192, **kwargs) -> Path:
+    """断点续传下载到 path
+
+    数据先写入 path.part，已有 .part 时用 Range 请求续传（服务器不支持则从头下载）；
+    完成后改名为 path。取消时关闭连接、保留 .part 并抛出 OperationCancelled。
+    http 为 requests 模块或 requests.Session。
+    """
+    token = token or CancellationToken()
+    token.raise_if_cancelled()
+    partial = part_path(path)
+    offset = partial.stat().st_size if partial.exists() else 0
+    headers = dict(kwargs.pop('headers', None) or {})
+    if offset:
+        headers['Range'] = f"bytes={offset}-"
+
+    response = http.get(url, stream=True, headers=headers, **kwargs)
+    unregister = token.register(response.close)
+    try:
+        if response.status_code == 416 and offset:
+            # .part 已是完整文件
+            partial.replace(path)
+            return path
+        response.raise_for_status()
+        if response.status_code != 206:
+            offset = 0
+        total_size = int(response.headers.get('content-length', 0)) + offset
+        downloaded = offset
+
+        with open(partial, 'ab' if offset else 'wb') as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                token.raise_if_cancelled()
+                if chunk:
+                    f.write(chunk)
+                    downloaded += len(chunk)
+                    if progress_callback and total_size > 0:
+                        progress_callback(int(downloaded / total_size * 100))
+    except Exception:
+        # 连接被取消回调关闭时 iter_content 会抛出网络异常
+        token.raise_if_cancelled()
+        raise
+    finally:
+        unregister()
+        response.close()
+
+    partial.replace(path)
+    return path
@@ -0,0 +1,129 @@
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Union
+import asyncio
+import os
+
+# 一次系统调用最多提交的缓冲区数（低于各平台 IOV_MAX）
+_IOV_BATCH = 512
+# 磁盘写入专用线程，不占用事件循环和默认线程池
+_executor: Optional[ThreadPoolExecutor] = None
+
+def disk_executor() -> ThreadPoolExecutor:
+    """所有下载共用的磁盘写入线程池（首次使用时创建）"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="file-writer")
+    return _executor
+
+def write_at(fd: int, chunks: List[bytes], offset: int) -> int:
+    """把 chunks 依次写到 fd 的 offset 处，返回写入的字节数
+
+    支持 os.pwritev 的平台一次系统调用写多个缓冲区（不拼接），否则定位后顺序写入。
+    """
+    total = sum(len(chunk) for chunk in chunks)
+    if hasattr(os, "pwritev"):
+        views = [memoryview(chunk) for chunk in chunks if chunk]
+        while views:
+            written = os.pwritev(fd, views[:_IOV_BATCH], offset)
+            offset += written
+            # 去掉已写完的缓冲区，部分写入的缓冲区从断点继续
+            while written:
+                if written >= len(views[0]):
+                    written -= len(views.pop(0))
+                else:
+                    views[0] = views[0][written:]
+                    written = 0
+    else:
+        data = memoryview(b"".join(chunks))
+        os.lseek(fd, offset, os.SEEK_SET)
+        while data:
+            data = data[os.write(fd, data):]
+    return total
+
+class AsyncFileWriter:
+    """异步下载的文件写入阶段
+
+    网络数据块先在内存中攒到 buffer_size，再交给磁盘写入线程落盘；同一时间最多一批在写，
+    下一批在事件循环中继续接收，慢速磁盘不会阻塞其他协程。
+
+    用法：
+        async with AsyncFileWriter(path, append=True) as writer:
+            async for chunk in response.content.iter_chunked(65536):
+                await writer.write(chunk)
+    """
+
+    def __init__(self, path: Union[str, Path], append: bool = False,
+                 buffer_size: int = 1 << 20, executor: Optional[Executor] = None):
+        self.path = Path(path)
+        self.append = append
+        self.buffer_size = buffer_size
+        self.executor = executor or disk_executor()
+        self.offset = 0
+        self._fd: Optional[int] = None
+        self._chunks: List[bytes] = []
+        self._buffered = 0
+        self._inflight: Optional[Future] = None
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    def _open(self) -> int:
+        flags = os.O_WRONLY | os.O_CREAT | getattr(os, "O_BINARY", 0)
+        if not self.append:
+            flags |= os.O_TRUNC
+        fd = os.open(self.path, flags, 0o644)
+        self.offset = os.fstat(fd).st_size
+        return fd
+
+    async def __aenter__(self):
+        self._fd = await self._run(self._open)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def write(self, chunk: bytes):
+        """写入一个数据块（攒满一批时提交给写入线程）"""
+        if not chunk:
+            return
+        self._chunks.append(chunk)
+        self._buffered += len(chunk)
+        if self._buffered >= self.buffer_size:
+            await self._submit()
+
+    async def _submit(self):
+        # 上一批写完才提交下一批，内存中最多保留两批数据
+        await self._wait_inflight()
+        if not self._chunks:
+            return
+        chunks, offset = self._chunks, self.offset
+        self._chunks, self._buffered = [], 0
+        self.offset += sum(len(chunk) for chunk in chunks)
+        self._inflight = self.executor.submit(write_at, self._fd, chunks, offset)
+
+    async def _wait_inflight(self):
+        if self._inflight is not None:
+            # shield：协程被取消时不去取消线程中的写入，文件在写完后才关闭
+            await asyncio.shield(asyncio.wrap_future(self._inflight))
+            self._inflight = None
+
+    async def flush(self):
+        """等待已接收的数据全部写入"""
+        await self._submit()
+        await self._wait_inflight()
+
+    async def close(self):
+        """写出剩余数据并关闭文件（写入失败时仍关闭文件并抛出异常）"""
+        if self._fd is None:
+            return
+        try:
+            await self.flush()
+        finally:
+            fd, self._fd = self._fd, None
+            inflight, self._inflight = self._inflight, None
+            if inflight is not None and not inflight.done():
+                # 协程被取消时写入线程可能仍在使用该文件，写完后再关闭
+                inflight.add_done_callback(lambda _: os.close(fd))
+            else:
+                await self._run(os.close, fd)
@@ -0,0 +1,135 @@
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Iterable, List, NamedTuple, Optional
+import asyncio
+import re
+from .arxiv_paginator import to_utc
+from .base_crawler import BaseCrawler, Paper
+
+if TYPE_CHECKING:
+    from .watermarks import Watermark
+
+_VERSION = re.compile(r"v\d+$")
+_PHRASE = re.compile(r'"[^"]*"')
+
+def expand_keywords(config: Dict, keywords: Iterable[str]) -> List[str]:
+    """把领域名展开为 config.yaml 中该领域的关键词，其他关键词原样保留"""
+    domains = config.get("keywords", {})
+    terms = []
+    for keyword in keywords:
+        terms.extend(domains.get(keyword, [keyword]))
+    return terms
+
+def query_terms(query: str) -> int:
+    """查询中合并的关键词数（QueryPlanner 生成的带引号短语数，普通关键词为 1）"""
+    return len(_PHRASE.findall(query)) or 1
+
+def paper_key(paper: Paper) -> str:
+    """论文去重键：优先 DOI，其次去掉版本号的链接（arXiv 的 .../abs/2401.00001v2），最后是标题"""
+    if paper.doi:
+        return f"doi:{paper.doi.lower()}"
+    if paper.url:
+        return f"url:{_VERSION.sub('', paper.url.rstrip('/'))}"
+    return f"title:{' '.join(paper.title.lower().split())}"
+
+class QueryPlanner:
+    """把同一数据源的多个关键词合并为 OR 查询
+
+    关键词按短语处理：重复的、包含另一关键词短语的（"deep learning object detection"
+    已被 "object detection" 覆盖）先去掉，剩下的按条数和查询长度上限分组，每组一次搜索。
+    """
+
+    def __init__(self, max_terms: int = 5, max_length: int = 300):
+        self.max_terms = max_terms
+        self.max_length = max_length
+
+    @classmethod
+    def for_source(cls, config: Dict, source: str) -> "QueryPlanner":
+        """按数据源配置的查询限制创建"""
+        source_config = config.get("sources", {}).get(source, {})
+        return cls(source_config.get("max_terms_per_query", 5), source_config.get("max_query_length", 300))
+
+    @staticmethod
+    def reduce_terms(terms: Iterable[str]) -> List[str]:
+        """去掉重复和被其他关键词覆盖的关键词（保持原顺序）"""
+        phrases = {}
+        for term in terms:
+            words = term.replace('"', " ").lower().split()
+            if words:
+                phrases.setdefault(" ".join(words), term.replace('"', "").strip())
+        padded = {phrase: f" {phrase} " for phrase in phrases}
+        return [
+            term for phrase, term in phrases.items()
+            if not any(other != phrase and padded[other] in padded[phrase] for other in phrases)
+        ]
+
+    def plan(self, terms: Iterable[str]) -> List[str]:
+        """生成查询列表，每条为若干带引号短语的 OR 组合"""
+        queries, group = [], []
+        for term in self.reduce_terms(terms):
+            candidate = group + [f'"{term}"']
+            if group and (len(candidate) > self.max_terms or len(" OR ".join(candidate)) > self.max_length):
+                queries.append(" OR ".join(group))
+                candidate = [f'"{term}"']
+            group = candidate
+        if group:
+            queries.append(" OR ".join(group))
+        return queries
+
+class QueryResult(NamedTuple):
+    """一条查询的结果；complete 为 False 时时间窗口没有取完（结果被截断）"""
+    papers: List[Paper]
+    complete: bool = True
+
+async def search_window(crawler: BaseCrawler, query: str, from_date: datetime, to_date: datetime) -> QueryResult:
+    """取完时间窗口内一条查询的全部结果
+
+    搜索结果按发表时间倒序，服务器返回的条数（不是过滤后的篇数）达到 crawler.result_limit 时说明被截断，
+    从已取到的最早论文处继续向前搜索，直到取完整个窗口；
+    同一时刻的论文就超过上限、无法继续向前时返回 complete=False。
+    """
+    limit = crawler.result_limit(query)
+    batches, end = [], to_date
+    while True:
+        batch, received = await crawler.search_batch(query, from_date, end)
+        batches.append(batch)
+        if limit is None or received < limit:
+            return QueryResult(merge_results(batches))
+        if not batch:
+            # 返回的条目全部晚于窗口终点，无法继续向前
+            return QueryResult(merge_results(batches), complete=False)
+        oldest = min(to_utc(paper.published_date) for paper in batch)
+        if oldest >= to_utc(end):
+            return QueryResult(merge_results(batches), complete=False)
+        end = oldest  # 含最早时刻本身，重复的论文去重
+
+async def search_queries(crawler: BaseCrawler, queries: List[str], from_date: datetime, to_date: datetime,
+                         watermarks: Optional[Dict[str, "Watermark"]] = None) -> Dict[str, QueryResult]:
+    """并发执行查询，返回每条查询的结果
+
+    watermarks 中有该查询的水位线时只请求水位线之后的论文，水位线时刻已采集过的论文也被跳过。
+    """
+    watermarks = watermarks or {}
+
+    async def run(query: str) -> QueryResult:
+        mark = watermarks.get(query)
+        if mark is None:
+            return await search_window(crawler, query, from_date, to_date)
+        result = await search_window(crawler, query, mark.start(from_date), to_date)
+        return QueryResult([paper for paper in result.papers if mark.is_new(paper)], result.complete)
+
+    results = await asyncio.gather(*(run(query) for query in queries))
+    return dict(zip(queries, results))
+
+def merge_results(results: Iterable[List[Paper]]) -> List[Paper]:
+    """按论文去重键合并多条查询的结果（保持先出现的顺序）"""
+    papers: Dict[str, Paper] = {}
+    for batch in results:
+        for paper in batch:
+            papers.setdefault(paper_key(paper), paper)
+    return list(papers.values())
+
+async def search_planned(crawler: BaseCrawler, queries: List[str],
+                         from_date: datetime, to_date: datetime) -> List[Paper]:
+    """并发执行计划中的查询并合并去重"""
+    found = await search_queries(crawler, queries, from_date, to_date)
+    return merge_results(result.papers for result in found.values())
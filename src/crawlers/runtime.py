@@ -0,0 +1,129 @@
+from typing import Callable, Dict, List, Optional
+from dataclasses import asdict
+import asyncio
+import threading
+import aiohttp
+from loguru import logger
+from .base_crawler import BaseCrawler, Paper
+
+class CrawlerRuntime:
+    """爬虫运行时
+
+    每个数据源持有一个长期存在的 aiohttp 会话（连接池 + keep-alive，复用 TCP/TLS 连接），
+    process_paper 在信号量限制下并发执行；处理完的论文放入队列，由单个写入任务依次入库，
+    数据库写入不阻塞下载，也不会并发写 SQLite。处理或入库失败的论文记录在 failed 中，
+    调用方据此决定哪些论文需要重新采集；数据不完整（未通过校验）的论文重试也不会成功，记录在 rejected 中。
+    多个运行时写同一个数据库时（如并发的采集任务）传入同一个 write_lock，入库依次进行。
+
+    用法：
+        async with CrawlerRuntime(config, db_manager) as runtime:
+            runtime.attach("arxiv", crawler)
+            await runtime.process_all(crawler, papers, save_path_for)
+    """
+
+    def __init__(self, config: Dict, db_manager=None, write_lock: Optional[threading.Lock] = None):
+        download = config.get("download", {})
+        self.max_concurrent = download.get("max_concurrent", 5)
+        self.limit_per_host = download.get("limit_per_host", self.max_concurrent)
+        self.keepalive_timeout = download.get("keepalive_timeout", 30)
+        self.timeout = aiohttp.ClientTimeout(total=None, sock_connect=download.get("timeout", 30),
+                                             sock_read=download.get("timeout", 30))
+        self.db_manager = db_manager
+        self.write_lock = write_lock or threading.Lock()
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+        self.stored = 0
+        self.failed: List[Paper] = []
+        self.rejected: List[Paper] = []
+
+    async def __aenter__(self):
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        if self.db_manager is not None:
+            self._queue = asyncio.Queue()
+            self._writer = asyncio.create_task(self._write_loop())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close(flush=exc_type is None)
+
+    def session(self, source: str) -> aiohttp.ClientSession:
+        """数据源的共享会话（首次使用时创建）"""
+        session = self._sessions.get(source)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_concurrent,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=300,
+            )
+            session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+            self._sessions[source] = session
+        return session
+
+    def attach(self, source: str, crawler: BaseCrawler) -> BaseCrawler:
+        """让爬虫使用该数据源的共享会话"""
+        crawler.session = self.session(source)
+        return crawler
+
+    async def process_all(self, crawler: BaseCrawler, papers: List[Paper],
+                          save_path_for: Callable[[Paper], str],
+                          on_done: Optional[Callable[[int, int], None]] = None) -> List[Optional[Paper]]:
+        """并发处理一批论文（最多 max_concurrent 篇同时进行），结果按输入顺序返回
+
+        on_done(已完成数, 总数) 在每篇完成时调用；成功的论文同时送入入库队列，
+        未通过校验的记入 rejected，其他失败的记入 failed。
+        """
+        done = 0
+
+        async def one(paper: Paper) -> Optional[Paper]:
+            nonlocal done
+            valid = crawler._validate_paper(paper)
+            result = None
+            if valid:
+                async with self._semaphore:
+                    result = await crawler.process_paper(paper, save_path_for(paper))
+            done += 1
+            if on_done is not None:
+                on_done(done, len(papers))
+            if not valid:
+                self.rejected.append(paper)
+            elif result is None:
+                self.failed.append(paper)
+            elif self._queue is not None:
+                self._queue.put_nowait((paper, result))
+            return result
+
+        return await asyncio.gather(*(one(paper) for paper in papers))
+
+    async def _write_loop(self):
+        """依次把处理完的论文写入数据库（同步写入放到线程中执行）"""
+        while True:
+            paper, result = await self._queue.get()
+            try:
+                await asyncio.to_thread(self._store, result)
+            except Exception as e:
+                logger.error(f"Failed to store paper {paper.title}: {str(e)}")
+                self.failed.append(paper)
+            finally:
+                self._queue.task_done()
+
+    def _store(self, paper: Paper):
+        with self.write_lock:
+            if self.db_manager.get_paper_by_title(paper.title) is not None:
+                return
+            self.db_manager.add_paper(asdict(paper))
+        self.stored += 1
+
+    async def close(self, flush: bool = True):
+        """关闭会话；flush 为 True 时先等待入库队列写完"""
+        if self._writer is not None:
+            if flush:
+                await self._queue.join()
+            self._writer.cancel()
+            await asyncio.gather(self._writer, return_exceptions=True)
+            self._writer = None
+        for session in self._sessions.values():
+            await session.close()
+        self._sessions.clear()
@@ -0,0 +1,128 @@
+from typing import Callable, Optional
+from contextlib import contextmanager
+from dataclasses import dataclass
+import threading
+import time
+
+@dataclass
+class CrawlSnapshot:
+    """某一时刻的爬取统计"""
+    pages: int
+    bytes_received: int
+    items: int
+    fetch_seconds: float
+    parse_seconds: float
+    elapsed: float
+    expected_items: Optional[int] = None
+    finished: bool = False
+
+    @property
+    def progress(self) -> int:
+        """进度百分比（按已产出条目数 / 预期条目数，完成前最多 99）"""
+        if self.finished:
+            return 100
+        if not self.expected_items:
+            return 0
+        return min(99, int(self.items * 100 / self.expected_items))
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes_received / self.fetch_seconds if self.fetch_seconds > 0 else 0.0
+
+    @property
+    def eta(self) -> Optional[float]:
+        """按当前产出速度估计的剩余秒数，无法估计时为 None"""
+        if self.finished:
+            return 0.0
+        if not self.expected_items or not self.items:
+            return None
+        remaining = max(0, self.expected_items - self.items)
+        return remaining / self.items_per_second
+
+    def describe(self) -> str:
+        """状态栏使用的简短描述"""
+        text = (f"{self.pages} 页 | {self.bytes_received / 1024:.1f} KB | "
+                f"{self.items} 篇 | 解析 {self.parse_seconds:.2f}s | {self.items_per_second:.1f} 篇/秒")
+        eta = self.eta
+        if eta is not None and not self.finished:
+            text += f" | 预计剩余 {eta:.0f}s"
+        return text
+
+class CrawlTelemetry:
+    """爬取遥测：爬虫报告抓取的页数、接收字节数、解析耗时和产出条目数，
+    调用方据此得到真实的进度、吞吐量和剩余时间。
+
+    listener 在统计变化时收到 CrawlSnapshot（最多每 min_interval 秒一次，结束时必定通知一次）；
+    各方法加锁，可在多个线程或协程中共用。
+    """
+
+    def __init__(self, expected_items: Optional[int] = None,
+                 listener: Optional[Callable[[CrawlSnapshot], None]] = None, min_interval: float = 0.1):
+        self.expected_items = expected_items
+        self.listener = listener
+        self.min_interval = min_interval
+        self.pages = 0
+        self.bytes_received = 0
+        self.items = 0
+        self.fetch_seconds = 0.0
+        self.parse_seconds = 0.0
+        self.finished = False
+        self._started = time.perf_counter()
+        self._last_notified = float('-inf')  # 第一次更新总是通知
+        self._lock = threading.Lock()
+
+    def page(self, nbytes: int, seconds: float = 0.0):
+        """记录一次抓取（响应字节数、网络耗时）"""
+        with self._lock:
+            self.pages += 1
+            self.bytes_received += nbytes
+            self.fetch_seconds += seconds
+        self._notify()
+
+    def emitted(self, count: int):
+        """记录产出的条目数"""
+        with self._lock:
+            self.items += count
+        self._notify()
+
+    @contextmanager
+    def parsing(self):
+        """统计代码块的解析耗时"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.parse_seconds += time.perf_counter() - start
+
+    def finish(self) -> CrawlSnapshot:
+        """标记完成并通知最终统计"""
+        with self._lock:
+            self.finished = True
+        return self._notify(force=True)
+
+    def snapshot(self) -> CrawlSnapshot:
+        with self._lock:
+            return CrawlSnapshot(
+                pages=self.pages,
+                bytes_received=self.bytes_received,
+                items=self.items,
+                fetch_seconds=self.fetch_seconds,
+                parse_seconds=self.parse_seconds,
+                elapsed=time.perf_counter() - self._started,
+                expected_items=self.expected_items,
+                finished=self.finished,
+            )
+
+    def _notify(self, force: bool = False) -> CrawlSnapshot:
+        snapshot = self.snapshot()
+        if self.listener is not None:
+            now = time.perf_counter()
+            if force or now - self._last_notified >= self.min_interval:
+                self._last_notified = now
+                self.listener(snapshot)
+        return snapshot
@@ -0,0 +1,79 @@
+from datetime import datetime, timezone
+from typing import Dict, FrozenSet, Iterable, NamedTuple, Optional, Set
+import json
+from .arxiv_paginator import to_utc
+from .base_crawler import Paper
+from .query_planner import paper_key
+
+class Watermark(NamedTuple):
+    """某条查询已采集到的位置：最新发表时间（UTC）及该时刻已采集的论文"""
+    published: datetime
+    keys: FrozenSet[str]
+
+    def start(self, from_date: datetime) -> datetime:
+        """本次采集的起始时间：时间窗口起点与水位线中较晚者（含水位线时刻本身）"""
+        return max(to_utc(from_date), self.published)
+
+    def is_new(self, paper: Paper) -> bool:
+        published = to_utc(paper.published_date)
+        return published > self.published or (published == self.published and paper_key(paper) not in self.keys)
+
+def advance_watermark(mark: Optional[Watermark], papers: Iterable[Paper],
+                      failed: Iterable[Paper] = ()) -> Optional[Watermark]:
+    """用本次成功处理的论文推进水位线
+
+    有处理失败的论文时，水位线只推进到最早失败论文之前，下次采集会重新获取它。
+    """
+    failed_dates = [to_utc(paper.published_date) for paper in failed]
+    limit = min(failed_dates) if failed_dates else None
+    for paper in papers:
+        published = to_utc(paper.published_date)
+        if limit is not None and published >= limit:
+            continue
+        if mark is None or published > mark.published:
+            mark = Watermark(published, frozenset([paper_key(paper)]))
+        elif published == mark.published:
+            mark = Watermark(published, mark.keys | {paper_key(paper)})
+    return mark
+
+class WatermarkStore:
+    """按 (数据源, 查询) 保存的增量采集水位线（存放在 DatabaseManager 的 harvest_watermarks 表中）
+
+    处理失败的论文按数据源记录失败次数（harvest_failures 表），未达到 max_attempts 次时水位线停在它之前，
+    下次采集重试；达到后不再停留（如已撤回的 PDF），避免之后每次采集都重新获取它之后的全部论文。
+    """
+
+    def __init__(self, db_manager, max_attempts: int = 3):
+        self.db_manager = db_manager
+        self.max_attempts = max_attempts
+
+    def get(self, source: str, query: str) -> Optional[Watermark]:
+        row = self.db_manager.get_harvest_watermark(source, query)
+        if row is None:
+            return None
+        # 数据库中保存不带时区的 UTC 时间
+        return Watermark(row.last_published.replace(tzinfo=timezone.utc), frozenset(json.loads(row.last_keys)))
+
+    def advance(self, source: str, query: str, papers: Iterable[Paper],
+                failed: Iterable[Paper] = ()) -> Optional[Watermark]:
+        """推进并保存水位线，返回新的水位线（没有可推进的论文时不变）"""
+        current = self.get(source, query)
+        mark = advance_watermark(current, papers, failed)
+        if mark is not None and mark != current:
+            self.db_manager.save_harvest_watermark(source, query, mark.published.replace(tzinfo=None), list(mark.keys))
+        return mark
+
+    def record_attempts(self, source: str, failed: Iterable[Paper],
+                        succeeded: Iterable[Paper] = ()) -> Dict[str, int]:
+        """记录本次处理失败的论文，返回 {去重键: 失败次数}（成功处理的论文清除失败记录）"""
+        return self.db_manager.record_harvest_failures(
+            source, [paper_key(paper) for paper in failed], [paper_key(paper) for paper in succeeded]
+        )
+
+    def retry_keys(self, attempts: Dict[str, int]) -> Set[str]:
+        """仍需重试（失败次数未达 max_attempts）的论文去重键"""
+        return {key for key, count in attempts.items() if count < self.max_attempts}
+
+    def reset(self, source: Optional[str] = None):
+        """清除水位线和失败记录（下次从完整时间窗口重新采集）"""
+        self.db_manager.clear_harvest_watermarks(source)
@@ -0,0 +1,213 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+import asyncio
+import threading
+import time
+from loguru import logger
+
+from src.crawlers.base_crawler import BaseCrawler, Paper
+from src.crawlers.cancellation import CancellationToken
+from src.crawlers.query_planner import QueryPlanner, expand_keywords, merge_results, paper_key, search_queries
+from src.crawlers.runtime import CrawlerRuntime
+from src.crawlers.telemetry import CrawlTelemetry
+from src.crawlers.watermarks import WatermarkStore
+from src.models.database import DatabaseManager
+
+def default_crawlers(config: Dict) -> Dict[str, BaseCrawler]:
+    """创建各数据源的爬虫（每次采集新建，共享会话由各自的运行时注入）"""
+    from src.crawlers.arxiv_crawler import ArxivCrawler
+    return {
+        "arxiv": ArxivCrawler(config),
+        # 添加其他爬虫...
+    }
+
+@dataclass
+class HarvestResult:
+    """一次采集的结果"""
+    found: int = 0
+    stored: int = 0
+    queries: int = 0
+
+@dataclass
+class HarvestJob:
+    """定时采集任务（对应 config.yaml 中 harvest.jobs 的一项）"""
+    name: str
+    domains: List[str]
+    sources: List[str] = field(default_factory=lambda: ["arxiv"])
+    days: int = 7
+    interval_hours: float = 24
+    incremental: bool = True
+
+def load_jobs(config: Dict) -> List[HarvestJob]:
+    """读取配置中的采集任务"""
+    return [HarvestJob(**job) for job in config.get("harvest", {}).get("jobs", [])]
+
+class Harvester:
+    """无界面的采集服务
+
+    按领域关键词合并查询、从各查询的水位线之后增量获取论文，并发下载并写入数据库；
+    界面和命令行都通过它采集，不依赖 Qt。同一个 Harvester 上并发的采集（多个任务同时运行）
+    共用一把写锁，论文入库和水位线更新依次进行，保持对 SQLite 的单写入者。
+    """
+
+    def __init__(self, config: Dict, db_manager: Optional[DatabaseManager] = None,
+                 create_crawlers: Callable[[Dict], Dict[str, BaseCrawler]] = default_crawlers,
+                 max_concurrent: Optional[int] = None):
+        self.config = config
+        self.db_manager = db_manager or DatabaseManager(config.get("database", {}).get("url", "sqlite:///papers.db"))
+        self.create_crawlers = create_crawlers
+        self.watermarks = WatermarkStore(self.db_manager, config.get("harvest", {}).get("max_attempts", 3))
+        self.write_lock = threading.Lock()
+        # 采集服务自己的下载并发数，未设置时沿用 download.max_concurrent
+        max_concurrent = max_concurrent or config.get("harvest", {}).get("max_concurrent")
+        self.runtime_config = config
+        if max_concurrent:
+            self.runtime_config = {**config, "download": {**config.get("download", {}), "max_concurrent": max_concurrent}}
+
+    async def harvest(self, keywords: Iterable[str], sources: Iterable[str], days: int, incremental: bool = True,
+                      token: Optional[CancellationToken] = None,
+                      on_status: Callable[[str], None] = logger.info,
+                      on_progress: Optional[Callable[[int], None]] = None) -> HarvestResult:
+        """采集一次：keywords 为领域名或关键词，取消时中止进行中的请求并抛出 CancelledError"""
+        if token is not None:
+            # 取消时在事件循环中取消本任务
+            loop = asyncio.get_running_loop()
+            task = asyncio.current_task()
+            unregister = token.register(lambda: loop.call_soon_threadsafe(task.cancel))
+        try:
+            return await self._harvest(list(keywords), list(sources), days, incremental, on_status, on_progress)
+        finally:
+            if token is not None:
+                unregister()
+
+    async def _harvest(self, keywords: List[str], sources: List[str], days: int, incremental: bool,
+                       on_status: Callable[[str], None],
+                       on_progress: Optional[Callable[[int], None]]) -> HarvestResult:
+        crawlers = self.create_crawlers(self.config)
+        terms = expand_keywords(self.config, keywords)
+        result = HarvestResult()
+        advances = []
+        to_date = datetime.now(timezone.utc)
+        from_date = to_date - timedelta(days=days)
+
+        def on_done(done: int, total: int):
+            if on_progress is not None:
+                on_progress(int(done / total * 100))
+
+        # 每个数据源共用一个会话，论文并发处理，结果由运行时依次入库
+        async with CrawlerRuntime(self.runtime_config, self.db_manager, self.write_lock) as runtime:
+            for source in sources:
+                if source not in crawlers:
+                    on_status(f"未知数据源: {source}")
+                    continue
+
+                crawler = runtime.attach(source, crawlers[source])
+                crawler.telemetry = CrawlTelemetry(
+                    listener=lambda snapshot, source=source: on_status(f"{source}: {snapshot.describe()}"),
+                    min_interval=1.0
+                )
+                on_status(f"正在从 {source} 获取论文...")
+
+                # 多个关键词合并为少量 OR 查询并发执行，只请求各查询水位线之后的论文，去重后再下载
+                queries = QueryPlanner.for_source(self.config, source).plan(terms)
+                marks = {query: self.watermarks.get(source, query) for query in queries} if incremental else {}
+                found = await search_queries(crawler, queries, from_date, to_date, marks)
+                crawler.telemetry.finish()
+                papers = merge_results(result.papers for result in found.values())
+                result.queries += len(queries)
+                result.found += len(papers)
+                on_status(f"{len(terms)} 个关键词合并为 {len(queries)} 次查询，新论文 {len(papers)} 篇")
+
+                def save_path_for(paper, source=source):
+                    return str(Path(self.config["download"]["path"]) / source / (paper.category or "other"))
+
+                await runtime.process_all(crawler, papers, save_path_for, on_done)
+                advances.extend((source, query, query_result) for query, query_result in found.items())
+
+        # 入库队列写完后才推进水位线，中途停止的采集下次会重新获取；下载或入库失败的论文在失败次数
+        # 达到上限前不越过，结果被截断的查询不推进（否则窗口中未取到的论文再也不会被采集）
+        failed = {paper_key(paper) for paper in runtime.failed}
+        processed: Dict[str, Dict[str, Paper]] = {}
+        complete = []
+        for source, query, query_result in advances:
+            processed.setdefault(source, {}).update((paper_key(paper), paper) for paper in query_result.papers)
+            if not query_result.complete:
+                on_status(f"{source} 查询结果超出上限未能取完，水位线保持不变: {query}")
+                continue
+            complete.append((source, query, query_result.papers))
+        given_up = await asyncio.to_thread(self._advance_watermarks, processed, failed, complete)
+        for source, papers in given_up.items():
+            if papers:
+                on_status(f"{source} 有 {len(papers)} 篇论文多次处理失败，不再重试: "
+                          f"{', '.join(paper.title for paper in papers)}")
+        result.stored = runtime.stored
+        return result
+
+    def _advance_watermarks(self, processed: Dict[str, Dict[str, Paper]], failed: Set[str],
+                            complete: List[Tuple[str, str, List[Paper]]]) -> Dict[str, List[Paper]]:
+        """在写锁内记录失败次数并保存各查询的水位线（与其他任务的入库依次进行）
+
+        processed 为各数据源本次处理的论文（按去重键），返回各数据源失败次数达到上限、不再重试的论文。
+        """
+        with self.write_lock:
+            retry, given_up = {}, {}
+            for source, papers in processed.items():
+                attempts = self.watermarks.record_attempts(
+                    source,
+                    [paper for key, paper in papers.items() if key in failed],
+                    [paper for key, paper in papers.items() if key not in failed]
+                )
+                retry[source] = self.watermarks.retry_keys(attempts)
+                given_up[source] = [papers[key] for key in attempts.keys() - retry[source]]
+            for source, query, papers in complete:
+                self.watermarks.advance(source, query, papers,
+                                        [paper for paper in papers if paper_key(paper) in retry[source]])
+            return given_up
+
+    async def run_job(self, job: HarvestJob) -> HarvestResult:
+        """执行一个采集任务"""
+        logger.info(f"采集任务 {job.name} 开始")
+        started = time.monotonic()
+        result = await self.harvest(job.domains, job.sources, job.days, job.incremental,
+                                    on_status=lambda message: logger.info(f"[{job.name}] {message}"))
+        logger.info(f"采集任务 {job.name} 完成：新论文 {result.found} 篇，入库 {result.stored} 篇，"
+                    f"{result.queries} 次查询，耗时 {time.monotonic() - started:.1f} 秒")
+        return result
+
+class HarvestScheduler:
+    """按间隔定时执行采集任务，同时运行的任务数不超过 max_concurrent_jobs"""
+
+    def __init__(self, harvester: Harvester, jobs: List[HarvestJob], max_concurrent_jobs: int = 1):
+        self.harvester = harvester
+        self.jobs = jobs
+        self.max_concurrent_jobs = max_concurrent_jobs
+
+    async def run_once(self) -> Dict[str, HarvestResult]:
+        """每个任务执行一次"""
+        semaphore = asyncio.Semaphore(self.max_concurrent_jobs)
+
+        async def run(job: HarvestJob) -> HarvestResult:
+            async with semaphore:
+                return await self.harvester.run_job(job)
+
+        results = await asyncio.gather(*(run(job) for job in self.jobs))
+        return {job.name: result for job, result in zip(self.jobs, results)}
+
+    async def run_forever(self):
+        """启动后立即执行各任务，之后按各自的间隔重复；单次失败只记录日志"""
+        semaphore = asyncio.Semaphore(self.max_concurrent_jobs)
+
+        async def loop(job: HarvestJob):
+            interval = job.interval_hours * 3600
+            while True:
+                started = time.monotonic()
+                async with semaphore:
+                    try:
+                        await self.harvester.run_job(job)
+                    except Exception:
+                        logger.exception(f"采集任务 {job.name} 失败")
+                await asyncio.sleep(max(0.0, started + interval - time.monotonic()))
+
+        await asyncio.gather(*(loop(job) for job in self.jobs))
@@ -1,18 +1,19 @@
 import sys
+import os
 import yaml
 import asyncio
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QComboBox, QTextEdit, QProgressBar,
-    QMessageBox, QFileDialog
+    QMessageBox, QFileDialog, QCheckBox
 )
 from PyQt6.QtCore import Qt, QThread, pyqtSignal
-from datetime import datetime, timedelta
-from pathlib import Path
 from loguru import logger
 
-from crawlers.arxiv_crawler import ArxivCrawler
-# 导入其他爬虫...
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.crawlers.cancellation import CancellationToken, OperationCancelled
+from src.harvester import Harvester
 
 class CrawlerWorker(QThread):
     """爬虫工作线程"""
@@ -20,52 +21,34 @@ class CrawlerWorker(QThread):
     status = pyqtSignal(str)
     finished = pyqtSignal()
     
-    def __init__(self, config, keywords, sources, days):
+    def __init__(self, config, keywords, sources, days, incremental=True):
         super().__init__()
         self.config = config
         self.keywords = keywords
         self.sources = sources
         self.days = days
+        self.incremental = incremental  # 只采集上次运行之后的新论文
+        self.token = CancellationToken()
+    
+    def stop(self):
+        """请求停止：取消进行中的异步请求，未完成的下载保留为 .part"""
+        self.token.cancel()
         
     def run(self):
-        """运行爬虫"""
+        """运行爬虫（采集逻辑在 Harvester 中，本线程只转发进度和状态）"""
         try:
-            asyncio.run(self._run_crawler())
+            harvester = Harvester(self.config)
+            result = asyncio.run(harvester.harvest(
+                self.keywords, self.sources, self.days, self.incremental, token=self.token,
+                on_status=self.status.emit, on_progress=self.progress.emit
+            ))
+            self.status.emit(f"完成！共获取 {result.found} 篇论文，新入库 {result.stored} 篇")
+        except (asyncio.CancelledError, OperationCancelled):
+            self.status.emit("已停止，再次运行时续传未完成的下载")
         except Exception as e:
             self.status.emit(f"Error: {str(e)}")
         finally:
             self.finished.emit()
-    
-    async def _run_crawler(self):
-        """异步运行爬虫"""
-        # 初始化爬虫
-        crawlers = {
-            "arxiv": ArxivCrawler(self.config),
-            # 添加其他爬虫...
-        }
-        
-        total_papers = 0
-        from_date = datetime.now() - timedelta(days=self.days)
-        to_date = datetime.now()
-        
-        for source in self.sources:
-            if source not in crawlers:
-                continue
-                
-            crawler = crawlers[source]
-            self.status.emit(f"正在从 {source} 获取论文...")
-            
-            for keyword in self.keywords:
-                papers = await crawler.search(keyword, from_date, to_date)
-                total_papers += len(papers)
-                
-                for i, paper in enumerate(papers):
-                    save_path = Path(self.config["download"]["path"]) / source / paper.category
-                    await crawler.process_paper(paper, str(save_path))
-                    progress = int((i + 1) / len(papers) * 100)
-                    self.progress.emit(progress)
-                    
-        self.status.emit(f"完成！共获取 {total_papers} 篇论文")
 
 class MainWindow(QMainWindow):
     """主窗口"""
@@ -120,6 +103,9 @@ class MainWindow(QMainWindow):
         self.time_combo = QComboBox()
         self.time_combo.addItems(["7", "30", "90", "180", "365"])
         time_layout.addWidget(self.time_combo)
+        self.incremental_check = QCheckBox("仅获取上次运行后的新论文")
+        self.incremental_check.setChecked(True)
+        time_layout.addWidget(self.incremental_check)
         config_layout.addLayout(time_layout)
         
         layout.addLayout(config_layout)
@@ -172,7 +158,8 @@ class MainWindow(QMainWindow):
             self.config,
             [keyword],
             [source],
-            days
+            days,
+            incremental=self.incremental_check.isChecked()
         )
         
         # 连接信号
@@ -184,11 +171,10 @@ class MainWindow(QMainWindow):
         self.worker.start()
     
     def stop_crawler(self):
-        """停止爬虫"""
-        if hasattr(self, "worker"):
-            self.worker.terminate()
-            self.worker.wait()
-            self.crawler_finished()
+        """停止爬虫（协作式取消，线程退出后发出 finished）"""
+        if hasattr(self, "worker") and self.worker.isRunning():
+            self.stop_button.setEnabled(False)
+            self.worker.stop()
     
     def update_status(self, message):
         """更新状态信息"""
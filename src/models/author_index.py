@@ -0,0 +1,248 @@
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+from sqlalchemy.orm import Session
+from .database import Author, AuthorAlias, CanonicalAuthor, Paper, paper_authors
+
+# 作者字符串分隔符：逗号、分号、顿号、and、&
+_AUTHOR_SEPARATOR = re.compile(r'\s*(?:[,;，；、]|\band\b|&)\s*', re.IGNORECASE)
+_CJK = re.compile(r'[一-鿿]')
+_PLACEHOLDER_NAMES = {"未知作者", "unknown", "anonymous"}
+
+def split_author_names(authors: Union[str, Iterable[str], None]) -> List[str]:
+    """把作者列表或逗号拼接的作者字符串拆成名字列表"""
+    if not authors:
+        return []
+    if isinstance(authors, str):
+        authors = _AUTHOR_SEPARATOR.split(authors)
+    names = []
+    for name in authors:
+        name = (name or "").strip()
+        if name and name.lower() not in _PLACEHOLDER_NAMES:
+            names.append(name)
+    return names
+
+def normalize_author_name(name: str) -> str:
+    """规范化作者名：去重音、小写、去标点，并把 "姓, 名" 调整为 "名 姓" 的顺序"""
+    name = unicodedata.normalize('NFKD', name or "")
+    name = ''.join(ch for ch in name if not unicodedata.combining(ch))
+    if name.count(',') == 1:
+        family, given = name.split(',')
+        name = f"{given} {family}"
+    name = re.sub(r"[.\-'’_]", ' ', name.lower())
+    name = re.sub(r'[^\w\s]', '', name)
+    return ' '.join(name.split())
+
+def _name_parts(normalized: str) -> Tuple[List[str], str]:
+    """拆分为 (名字部分, 姓)"""
+    if _CJK.search(normalized) and ' ' not in normalized:
+        return [], normalized
+    tokens = normalized.split()
+    if not tokens:
+        return [], ""
+    return tokens[:-1], tokens[-1]
+
+def author_blocking_key(normalized: str) -> str:
+    """分块键：姓 + 名首字母，同一块内的名字才可能是同一作者"""
+    given, family = _name_parts(normalized)
+    return f"{family}_{given[0][0]}" if given else family
+
+def names_compatible(a: str, b: str) -> bool:
+    """两个规范化名字是否可能指同一人（缩写与全名相容，如 "j smith" 与 "john smith"）"""
+    given_a, family_a = _name_parts(a)
+    given_b, family_b = _name_parts(b)
+    if family_a != family_b:
+        return False
+    for x, y in zip(given_a, given_b):
+        if x == y:
+            continue
+        if len(x) == 1 and y.startswith(x):
+            continue
+        if len(y) == 1 and x.startswith(y):
+            continue
+        return False
+    return True
+
+def canonical_author_key(author: Author) -> Tuple[Union[int, str], str]:
+    """返回作者的 (规范作者ID, 显示名)，没有映射的旧数据退回到原始名字"""
+    alias = author.alias
+    if alias is not None and alias.canonical is not None:
+        return alias.canonical_id, alias.canonical.name
+    return author.name, author.name
+
+class AuthorIndex:
+    """规范作者查找表：规范化名字 -> (作者ID, 规范作者ID)"""
+
+    def __init__(self):
+        self._entries: Optional[Dict[str, Tuple[int, int]]] = None
+
+    def reset(self):
+        """清空缓存，下次使用时从数据库重新加载"""
+        self._entries = None
+
+    def _load(self, session: Session) -> Dict[str, Tuple[int, int]]:
+        if self._entries is None:
+            self._entries = {
+                normalized: (author_id, canonical_id)
+                for normalized, author_id, canonical_id in session.query(
+                    AuthorAlias.normalized_name, AuthorAlias.author_id, AuthorAlias.canonical_id
+                )
+            }
+        return self._entries
+
+    def lookup(self, session: Session, name: str) -> Optional[int]:
+        """通过名字查找规范作者ID"""
+        entry = self._load(session).get(normalize_author_name(name))
+        return entry[1] if entry else None
+
+    def get_or_create_authors(self, session: Session, names: Union[str, Iterable[str], None]) -> List[Author]:
+        """获取或创建作者，同一篇论文中的重复变体只保留一个"""
+        authors = []
+        seen = set()
+        for name in split_author_names(names):
+            normalized = normalize_author_name(name)
+            if not normalized or normalized in seen:
+                continue
+            seen.add(normalized)
+            authors.append(self._get_or_create(session, name, normalized))
+        return authors
+
+    def _get_or_create(self, session: Session, name: str, normalized: str) -> Author:
+        entries = self._load(session)
+        entry = entries.get(normalized)
+        if entry:
+            author = session.get(Author, entry[0])
+            if author is not None:
+                return author
+
+        # 旧数据中可能已有同名作者，只是还没有建立映射
+        author = session.query(Author).filter_by(name=name).first()
+        if author is None:
+            author = Author(name=name)
+            session.add(author)
+        canonical = CanonicalAuthor(name=name, block_key=author_blocking_key(normalized))
+        session.add(AuthorAlias(author=author, canonical=canonical, normalized_name=normalized))
+        session.flush()
+        entries[normalized] = (author.id, canonical.id)
+        return author
+
+    @staticmethod
+    def backfill(session: Session) -> int:
+        """为没有映射的旧作者记录建立规范作者，返回处理的作者数"""
+        orphans = session.query(Author).outerjoin(Author.alias).filter(AuthorAlias.id.is_(None)).all()
+        by_name: Dict[str, CanonicalAuthor] = {
+            normalized: canonical
+            for normalized, canonical in session.query(AuthorAlias.normalized_name, CanonicalAuthor).join(AuthorAlias.canonical)
+        }
+        for author in orphans:
+            normalized = normalize_author_name(author.name)
+            canonical = by_name.get(normalized)
+            if canonical is None:
+                canonical = CanonicalAuthor(name=author.name, block_key=author_blocking_key(normalized))
+                by_name[normalized] = canonical
+            session.add(AuthorAlias(author=author, canonical=canonical, normalized_name=normalized))
+        session.flush()
+        return len(orphans)
+
+class AuthorDisambiguator:
+    """批量作者消歧：同一分块内名字相容、且合作者和发表类别有重合的规范作者合并为一个
+
+    合并得分 = 共同合作者数 + 类别 Jaccard 相似度，默认阈值 1.5，
+    即两个共同合作者，或一个共同合作者加上一半以上的类别重合。
+    """
+
+    def __init__(self, merge_threshold: float = 1.5, max_rounds: int = 3):
+        self.merge_threshold = merge_threshold
+        self.max_rounds = max_rounds
+
+    def run(self, session: Session) -> int:
+        """执行消歧，返回被合并掉的规范作者数"""
+        AuthorIndex.backfill(session)
+
+        names: Dict[int, Set[str]] = defaultdict(set)
+        blocks: Dict[str, Set[int]] = defaultdict(set)
+        for canonical_id, normalized, block_key in session.query(
+            AuthorAlias.canonical_id, AuthorAlias.normalized_name, CanonicalAuthor.block_key
+        ).join(AuthorAlias.canonical):
+            names[canonical_id].add(normalized)
+            blocks[block_key].add(canonical_id)
+
+        paper_members: Dict[int, Set[int]] = defaultdict(set)
+        venues: Dict[int, Set[str]] = defaultdict(set)
+        for paper_id, canonical_id, category in session.query(
+            paper_authors.c.paper_id, AuthorAlias.canonical_id, Paper.category
+        ).join(AuthorAlias, AuthorAlias.author_id == paper_authors.c.author_id).join(
+            Paper, Paper.id == paper_authors.c.paper_id
+        ):
+            paper_members[paper_id].add(canonical_id)
+            if category:
+                venues[canonical_id].add(category)
+
+        parent = {canonical_id: canonical_id for canonical_id in names}
+
+        def find(x: int) -> int:
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        for _ in range(self.max_rounds):
+            # 每轮按当前合并结果重新计算合作者，使合作者自身的变体也能对上
+            coauthors: Dict[int, Set[int]] = defaultdict(set)
+            for members in paper_members.values():
+                roots = {find(m) for m in members}
+                for root in roots:
+                    coauthors[root] |= roots - {root}
+
+            merged_this_round = 0
+            for block in blocks.values():
+                roots = sorted({find(c) for c in block})
+                for i, a in enumerate(roots):
+                    for b in roots[i + 1:]:
+                        ra, rb = find(a), find(b)
+                        if ra == rb or not self._compatible(names[ra], names[rb]):
+                            continue
+                        if self._score(coauthors, venues, ra, rb) >= self.merge_threshold:
+                            keep, drop = sorted((ra, rb), key=lambda c: (-max(map(len, names[c])), c))
+                            parent[drop] = keep
+                            names[keep] |= names.pop(drop)
+                            venues[keep] |= venues.pop(drop, set())
+                            coauthors[keep] |= coauthors.pop(drop, set())
+                            coauthors[keep] -= {keep, drop}
+                            merged_this_round += 1
+            if not merged_this_round:
+                break
+
+        return self._apply(session, {c: find(c) for c in parent if find(c) != c})
+
+    @staticmethod
+    def _compatible(names_a: Set[str], names_b: Set[str]) -> bool:
+        return all(names_compatible(a, b) for a in names_a for b in names_b)
+
+    @staticmethod
+    def _score(coauthors: Dict[int, Set[int]], venues: Dict[int, Set[str]], a: int, b: int) -> float:
+        shared = len(coauthors.get(a, set()) & coauthors.get(b, set()))
+        venues_a, venues_b = venues.get(a, set()), venues.get(b, set())
+        union = venues_a | venues_b
+        jaccard = len(venues_a & venues_b) / len(union) if union else 0.0
+        return shared + jaccard
+
+    @staticmethod
+    def _apply(session: Session, mapping: Dict[int, int]) -> int:
+        """把合并结果写回数据库，并用最完整的名字作为规范名"""
+        if not mapping:
+            return 0
+        for drop, keep in mapping.items():
+            session.query(AuthorAlias).filter(AuthorAlias.canonical_id == drop).update(
+                {AuthorAlias.canonical_id: keep}, synchronize_session=False
+            )
+        session.query(CanonicalAuthor).filter(CanonicalAuthor.id.in_(list(mapping))).delete(synchronize_session=False)
+
+        for keep in set(mapping.values()):
+            variants = session.query(Author.name).join(Author.alias).filter(AuthorAlias.canonical_id == keep).all()
+            best = max((name for name, in variants), key=lambda n: (len(normalize_author_name(n)), n))
+            session.query(CanonicalAuthor).filter(CanonicalAuthor.id == keep).update(
+                {CanonicalAuthor.name: best}, synchronize_session=False
+            )
+        return len(mapping)
@@ -1,8 +1,8 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Float, ForeignKey, Table
+from sqlalchemy import create_engine, Column, Integer, String, DateTime, Float, ForeignKey, Table, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
 from datetime import datetime
-from typing import List
+from typing import Dict, Iterable, List, Optional
 import json
 
 Base = declarative_base()
@@ -52,10 +52,31 @@ class Author(Base):
     __tablename__ = 'authors'
     
     id = Column(Integer, primary_key=True)
-    name = Column(String(100), nullable=False)
+    name = Column(String(100), nullable=False, index=True)
     affiliation = Column(String(200))
     email = Column(String(100))
     papers = relationship('Paper', secondary=paper_authors, back_populates='authors')
+    alias = relationship('AuthorAlias', back_populates='author', uselist=False)
+
+class CanonicalAuthor(Base):
+    """规范作者表（同一作者的所有名字变体归并到一条记录）"""
+    __tablename__ = 'canonical_authors'
+    
+    id = Column(Integer, primary_key=True)
+    name = Column(String(100), nullable=False)
+    block_key = Column(String(100), nullable=False, index=True)
+    aliases = relationship('AuthorAlias', back_populates='canonical')
+
+class AuthorAlias(Base):
+    """作者名变体到规范作者的映射表"""
+    __tablename__ = 'author_aliases'
+    
+    id = Column(Integer, primary_key=True)
+    author_id = Column(Integer, ForeignKey('authors.id'), nullable=False, unique=True)
+    canonical_id = Column(Integer, ForeignKey('canonical_authors.id'), nullable=False, index=True)
+    normalized_name = Column(String(100), nullable=False, index=True)
+    author = relationship('Author', back_populates='alias')
+    canonical = relationship('CanonicalAuthor', back_populates='aliases')
 
 class Keyword(Base):
     """关键词表"""
@@ -100,6 +121,55 @@ class PaperMetrics(Base):
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
     paper = relationship('Paper', back_populates='metrics')
 
+class Term(Base):
+    """词表（含文档频率）"""
+    __tablename__ = 'terms'
+    
+    id = Column(Integer, primary_key=True)
+    word = Column(String(100), nullable=False, unique=True)
+    doc_freq = Column(Integer, default=0)
+    frequencies = relationship('TermFrequency', back_populates='term')
+
+class TermFrequency(Base):
+    """按类别和月份汇总的词频表"""
+    __tablename__ = 'term_frequencies'
+    __table_args__ = (UniqueConstraint('term_id', 'category', 'period'),)
+    
+    id = Column(Integer, primary_key=True)
+    term_id = Column(Integer, ForeignKey('terms.id'), nullable=False)
+    category = Column(String(100), nullable=False, index=True)
+    period = Column(String(7), nullable=False, index=True)
+    count = Column(Integer, default=0)
+    doc_count = Column(Integer, default=0)
+    term = relationship('Term', back_populates='frequencies')
+
+class ProcessingWatermark(Base):
+    """增量处理进度表：记录各处理任务已处理到的最大论文ID"""
+    __tablename__ = 'processing_watermarks'
+    
+    name = Column(String(50), primary_key=True)
+    last_paper_id = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+class HarvestWatermark(Base):
+    """增量采集进度表：记录各数据源每条查询已采集到的最新发表时间（UTC）及该时刻的论文"""
+    __tablename__ = 'harvest_watermarks'
+    
+    source = Column(String(50), primary_key=True)
+    query = Column(String(500), primary_key=True)
+    last_published = Column(DateTime, nullable=False)
+    last_keys = Column(String(2000), default='[]')  # 发表时间等于 last_published 的论文去重键（JSON）
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+class HarvestFailure(Base):
+    """增量采集失败记录：各数据源处理失败的论文及已失败次数（失败次数达到上限后水位线不再为其停留）"""
+    __tablename__ = 'harvest_failures'
+    
+    source = Column(String(50), primary_key=True)
+    paper_key = Column(String(500), primary_key=True)
+    attempts = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
 class DatabaseManager:
     """数据库管理器"""
     
@@ -107,18 +177,16 @@ class DatabaseManager:
         self.engine = create_engine(connection_string)
         Base.metadata.create_all(self.engine)
         self.Session = sessionmaker(bind=self.engine)
+        # author_index 依赖本模块的表定义，放在这里导入以避免循环导入
+        from .author_index import AuthorIndex
+        self.author_index = AuthorIndex()
     
     def add_paper(self, paper_data: dict) -> Paper:
         """添加论文"""
         session = self.Session()
         try:
-            # 创建或获取作者
-            authors = []
-            for author_name in paper_data.get('authors', []):
-                author = session.query(Author).filter_by(name=author_name).first()
-                if not author:
-                    author = Author(name=author_name)
-                authors.append(author)
+            # 创建或获取作者（按规范化名字查找，兼容逗号拼接的作者字符串）
+            authors = self.author_index.get_or_create_authors(session, paper_data.get('authors'))
             
             # 创建或获取关键词
             keywords = []
@@ -151,10 +219,52 @@ class DatabaseManager:
             return paper
         except Exception as e:
             session.rollback()
+            # 回滚后缓存里可能有未提交的作者ID，下次使用时重新加载
+            self.author_index.reset()
             raise e
         finally:
             session.close()
     
+    def get_canonical_author(self, name: str) -> Optional[CanonicalAuthor]:
+        """通过任意名字变体获取规范作者"""
+        session = self.Session()
+        try:
+            canonical_id = self.author_index.lookup(session, name)
+            if canonical_id is None:
+                return None
+            return session.get(CanonicalAuthor, canonical_id)
+        finally:
+            session.close()
+    
+    def get_papers_by_author(self, name: str) -> List[Paper]:
+        """获取某作者（含所有名字变体）的论文"""
+        session = self.Session()
+        try:
+            canonical_id = self.author_index.lookup(session, name)
+            if canonical_id is None:
+                return []
+            return session.query(Paper).join(Paper.authors).join(Author.alias).filter(
+                AuthorAlias.canonical_id == canonical_id
+            ).distinct().all()
+        finally:
+            session.close()
+    
+    def disambiguate_authors(self, **kwargs) -> int:
+        """批量作者消歧，返回合并的规范作者数"""
+        from .author_index import AuthorDisambiguator
+        
+        session = self.Session()
+        try:
+            merged = AuthorDisambiguator(**kwargs).run(session)
+            session.commit()
+            return merged
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            self.author_index.reset()
+            session.close()
+    
     def get_paper_by_title(self, title: str) -> Paper:
         """通过标题获取论文"""
         session = self.Session()
@@ -191,4 +301,71 @@ class DatabaseManager:
             session.rollback()
             raise e
         finally:
-            session.close() 
\ No newline at end of file
+            session.close() 
+    
+    def get_harvest_watermark(self, source: str, query: str) -> Optional[HarvestWatermark]:
+        """获取查询的增量采集水位线"""
+        session = self.Session()
+        try:
+            return session.get(HarvestWatermark, (source, query))
+        finally:
+            session.close()
+    
+    def save_harvest_watermark(self, source: str, query: str, last_published: datetime, last_keys: List[str]):
+        """保存查询的增量采集水位线（last_published 为不带时区的 UTC 时间）"""
+        session = self.Session()
+        try:
+            watermark = session.get(HarvestWatermark, (source, query))
+            if not watermark:
+                watermark = HarvestWatermark(source=source, query=query)
+                session.add(watermark)
+            watermark.last_published = last_published
+            watermark.last_keys = json.dumps(sorted(last_keys))
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+    
+    def record_harvest_failures(self, source: str, failed_keys: Iterable[str],
+                                succeeded_keys: Iterable[str] = ()) -> Dict[str, int]:
+        """失败论文的失败次数加一并返回 {去重键: 失败次数}，成功处理的论文删除失败记录"""
+        failed_keys, succeeded_keys = set(failed_keys), set(succeeded_keys) - set(failed_keys)
+        session = self.Session()
+        try:
+            attempts = {}
+            for key in failed_keys:
+                failure = session.get(HarvestFailure, (source, key))
+                if not failure:
+                    failure = HarvestFailure(source=source, paper_key=key, attempts=0)
+                    session.add(failure)
+                failure.attempts += 1
+                attempts[key] = failure.attempts
+            if succeeded_keys:
+                session.query(HarvestFailure).filter(
+                    HarvestFailure.source == source, HarvestFailure.paper_key.in_(succeeded_keys)
+                ).delete(synchronize_session=False)
+            session.commit()
+            return attempts
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+    
+    def clear_harvest_watermarks(self, source: Optional[str] = None):
+        """清除增量采集水位线及失败记录（下次从完整时间窗口重新采集）"""
+        session = self.Session()
+        try:
+            for model in (HarvestWatermark, HarvestFailure):
+                rows = session.query(model)
+                if source is not None:
+                    rows = rows.filter_by(source=source)
+                rows.delete()
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
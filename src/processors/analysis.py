@@ -8,20 +8,47 @@ from nltk.tokenize import word_tokenize, sent_tokenize
 from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
 import networkx as nx
+from sqlalchemy.orm import selectinload
 from collections import Counter
-import matplotlib.pyplot as plt
-from wordcloud import WordCloud
-import seaborn as sns
 from datetime import datetime
 import nltk
 from ..models.database import Paper, DatabaseManager
+from ..models.author_index import canonical_author_key
+from .temporal import TemporalAnalyzer, to_datetime64, rollup_dates
+from .graph_layout import LayoutService
+from .term_frequency import TermFrequencyStore
+from .report_engine import ReportEngine
+from .trend_engine import TrendEngine
+from .embeddings import EmbeddingIndex
+from .rendering import (
+    FigureJob, FigureRenderer, render_wordcloud, render_year_distribution, render_citation_network
+)
 import os
 
+def eigenvector_centrality(G: nx.Graph) -> Dict:
+    """按连通分量计算特征向量中心性
+
+    不连通的图整体没有唯一解（networkx 抛出 AmbiguousSolution），合作网络几乎总是不连通的；
+    每个分量单独求解后乘以分量占全部节点的比例，小团体的成员不会排在大网络的核心作者之前。
+    """
+    total = G.number_of_nodes()
+    centrality = {}
+    for nodes in nx.connected_components(G):
+        if len(nodes) < 3:
+            # 一到两个节点的分量中心性相同，无需求解
+            scores = {node: 1 / np.sqrt(len(nodes)) for node in nodes}
+        else:
+            scores = nx.eigenvector_centrality_numpy(G.subgraph(nodes))
+        share = len(nodes) / total
+        centrality.update((node, score * share) for node, score in scores.items())
+    return centrality
+
 class PaperAnalyzer:
     """增强的论文分析器"""
     
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
+        self.temporal = TemporalAnalyzer(db_manager)
         self.lemmatizer = WordNetLemmatizer()
         
         # 下载必要的NLTK数据
@@ -35,6 +62,12 @@ class PaperAnalyzer:
             nltk.download('wordnet')
         
         self.stop_words = set(stopwords.words('english') + stopwords.words('chinese'))
+        self.term_frequencies = TermFrequencyStore(db_manager, stop_words=self.stop_words)
+        self.trend_engine = TrendEngine(self.term_frequencies)
+        
+        # 相似论文向量索引（首次查询时加载）
+        self.embedding_dir = "./data/embeddings"
+        self.embedding_index = None
     
     def preprocess_text(self, text: str) -> str:
         """文本预处理"""
@@ -48,9 +81,12 @@ class PaperAnalyzer:
     
     def topic_modeling(self, papers: List[Paper], num_topics: int = 5) -> Dict:
         """主题建模分析"""
-        # 准备文档
-        documents = [f"{p.title} {p.abstract}" for p in papers]
-        processed_docs = [self.preprocess_text(doc) for doc in documents]
+        return self.topic_modeling_documents([f"{p.title} {p.abstract}" for p in papers], num_topics)
+    
+    def topic_modeling_documents(self, documents: List[str], num_topics: int = 5) -> Dict:
+        """对文档文本做主题建模"""
+        # 逐篇预处理后直接交给向量化器，documents 可以是流式的可迭代对象
+        processed_docs = (self.preprocess_text(doc) for doc in documents)
         
         # TF-IDF向量化
         vectorizer = TfidfVectorizer(max_features=1000)
@@ -79,9 +115,7 @@ class PaperAnalyzer:
         # 构建引文网络
         for paper in papers:
             G.add_node(paper.title, year=paper.published_date.year)
-            for ref in paper.references:
-                if ref.reference_title:
-                    G.add_edge(paper.title, ref.reference_title)
+        G.add_edges_from(self.citation_edges(papers))
         
         # 计算网络指标
         metrics = {
@@ -90,27 +124,54 @@ class PaperAnalyzer:
             "pagerank": nx.pagerank(G)
         }
         
-        # 识别关键论文
-        key_papers = sorted(
-            metrics["pagerank"].items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:10]
-        
         return {
             "metrics": metrics,
-            "key_papers": key_papers,
+            "key_papers": self.key_papers(G, pagerank=metrics["pagerank"]),
             "network_density": nx.density(G),
             "average_clustering": nx.average_clustering(G)
         }
     
+    @staticmethod
+    def citation_edges(papers: List[Paper]) -> List[Tuple[str, str]]:
+        """引文网络的边（论文标题 -> 参考文献标题）"""
+        return [
+            (paper.title, ref.reference_title)
+            for paper in papers for ref in paper.references if ref.reference_title
+        ]
+    
+    @staticmethod
+    def key_papers(G: nx.DiGraph, top_n: int = 10, pagerank: Dict = None) -> List[Tuple[str, float]]:
+        """按PageRank识别关键论文"""
+        if G.number_of_nodes() == 0:
+            return []
+        if pagerank is None:
+            pagerank = nx.pagerank(G)
+        return sorted(pagerank.items(), key=lambda x: x[1], reverse=True)[:top_n]
+    
+    @staticmethod
+    def core_authors(G: nx.Graph, author_names: Dict, top_n: int = 10,
+                     centrality: Dict = None) -> List[Tuple[str, float]]:
+        """按特征向量中心性识别核心作者（按连通分量计算）"""
+        if G.number_of_nodes() == 0:
+            return []
+        if centrality is None:
+            centrality = eigenvector_centrality(G)
+        ranked = sorted(centrality.items(), key=lambda x: x[1], reverse=True)[:top_n]
+        return [(author_names[key], score) for key, score in ranked]
+    
     def author_collaboration_analysis(self, papers: List[Paper]) -> Dict:
         """作者合作网络分析"""
         G = nx.Graph()
+        author_names = {}
         
-        # 构建合作网络
+        # 构建合作网络（节点为规范作者ID，同一作者的名字变体合并为一个节点）
         for paper in papers:
-            authors = [author.name for author in paper.authors]
+            authors = []
+            for author in paper.authors:
+                key, name = canonical_author_key(author)
+                author_names[key] = name
+                if key not in authors:
+                    authors.append(key)
             for i in range(len(authors)):
                 for j in range(i + 1, len(authors)):
                     if G.has_edge(authors[i], authors[j]):
@@ -122,136 +183,128 @@ class PaperAnalyzer:
         metrics = {
             "degree_centrality": nx.degree_centrality(G),
             "clustering_coefficient": nx.clustering(G),
-            "eigenvector_centrality": nx.eigenvector_centrality_numpy(G)
+            "eigenvector_centrality": eigenvector_centrality(G)
         }
         
-        # 识别核心作者
-        core_authors = sorted(
-            metrics["eigenvector_centrality"].items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:10]
-        
         return {
             "metrics": metrics,
-            "core_authors": core_authors,
+            "author_names": author_names,
+            "core_authors": self.core_authors(G, author_names, centrality=metrics["eigenvector_centrality"]),
             "network_density": nx.density(G),
             "average_clustering": nx.average_clustering(G)
         }
     
     def temporal_analysis(self, papers: List[Paper]) -> Dict:
         """时间序列分析"""
-        # 准备时间序列数据
-        dates = pd.Series([p.published_date for p in papers])
-        daily_counts = dates.value_counts().sort_index()
-        monthly_counts = dates.dt.to_period('M').value_counts().sort_index()
+        # 按天精度汇总，一次得到日/周/月/年发文量
+        rollups = rollup_dates(to_datetime64(p.published_date for p in papers))
+        monthly_counts = pd.Series(rollups["month"], dtype='int64')
         
         # 计算趋势
         monthly_moving_avg = monthly_counts.rolling(window=3).mean()
         
         return {
-            "daily_counts": daily_counts.to_dict(),
-            "monthly_counts": monthly_counts.to_dict(),
+            "daily_counts": rollups["day"],
+            "weekly_counts": rollups["week"],
+            "monthly_counts": rollups["month"],
+            "yearly_counts": rollups["year"],
             "trend": monthly_moving_avg.to_dict()
         }
     
-    def generate_visualizations(self, papers: List[Paper], output_dir: str):
-        """生成可视化图表"""
-        # 创建输出目录
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # 1. 词云图
-        text = ' '.join([f"{p.title} {p.abstract}" for p in papers])
-        wordcloud = WordCloud(
-            width=1200, height=800,
-            background_color='white',
-            stopwords=self.stop_words
-        ).generate(text)
-        
-        plt.figure(figsize=(15, 10))
-        plt.imshow(wordcloud, interpolation='bilinear')
-        plt.axis('off')
-        plt.savefig(f"{output_dir}/wordcloud.png")
-        plt.close()
-        
-        # 2. 发布时间分布图
-        dates = pd.Series([p.published_date for p in papers])
-        plt.figure(figsize=(15, 6))
-        dates.dt.year.value_counts().sort_index().plot(kind='bar')
-        plt.title('Publication Year Distribution')
-        plt.xlabel('Year')
-        plt.ylabel('Number of Papers')
-        plt.savefig(f"{output_dir}/year_distribution.png")
-        plt.close()
-        
-        # 3. 引用网络图
-        citation_network = self.citation_network_analysis(papers)
-        G = nx.DiGraph()
-        for paper in papers[:50]:  # 限制显示前50篇论文以避免图太复杂
-            for ref in paper.references:
-                if ref.reference_title:
-                    G.add_edge(paper.title[:30], ref.reference_title[:30])
-        
-        plt.figure(figsize=(20, 20))
-        pos = nx.spring_layout(G)
-        nx.draw(G, pos, with_labels=True, node_color='lightblue', 
-                node_size=1000, font_size=8, arrows=True)
-        plt.savefig(f"{output_dir}/citation_network.png")
-        plt.close()
+    def database_temporal_analysis(self, min_count: int = 3) -> Dict:
+        """基于数据库全量论文的时间序列分析（缓存并增量更新）"""
+        rollups = self.temporal.rollups()
+        monthly_counts = pd.Series(self.temporal.monthly_series(), dtype='int64')
+        return {
+            "daily_counts": rollups["day"],
+            "weekly_counts": rollups["week"],
+            "monthly_counts": rollups["month"],
+            "yearly_counts": rollups["year"],
+            "trend": monthly_counts.rolling(window=3).mean().to_dict(),
+            "keyword_trends": self.temporal.keyword_trends(min_count=min_count)
+        }
     
-    def generate_comprehensive_report(self, papers: List[Paper], output_dir: str) -> str:
-        """生成综合分析报告"""
-        # 生成可视化
-        self.generate_visualizations(papers, f"{output_dir}/figures")
-        
-        # 获取各种分析结果
-        topics = self.topic_modeling(papers)
-        citation_analysis = self.citation_network_analysis(papers)
-        author_analysis = self.author_collaboration_analysis(papers)
-        temporal_analysis = self.temporal_analysis(papers)
-        
-        # 生成报告
-        report_path = f"{output_dir}/comprehensive_analysis.md"
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write("# 机器视觉文献综合分析报告\n\n")
-            
-            # 基本统计
-            f.write("## 1. 基本统计\n\n")
-            f.write(f"- 总论文数：{len(papers)}\n")
-            f.write(f"- 时间跨度：{min(p.published_date for p in papers).year} - {max(p.published_date for p in papers).year}\n")
-            f.write(f"- 涉及作者数：{len(set(author.name for p in papers for author in p.authors))}\n\n")
-            
-            # 研究主题
-            f.write("## 2. 研究主题分析\n\n")
-            for topic, words in topics["topics"].items():
-                f.write(f"### {topic}\n")
-                f.write(f"关键词：{', '.join(words)}\n\n")
-            
-            # 引文分析
-            f.write("## 3. 引文网络分析\n\n")
-            f.write("### 最具影响力的论文（基于PageRank）\n\n")
-            for paper, score in citation_analysis["key_papers"]:
-                f.write(f"- {paper}: {score:.4f}\n")
-            
-            # 作者合作分析
-            f.write("\n## 4. 作者合作网络分析\n\n")
-            f.write("### 核心作者\n\n")
-            for author, score in author_analysis["core_authors"]:
-                f.write(f"- {author}: {score:.4f}\n")
-            
-            # 时间趋势
-            f.write("\n## 5. 发展趋势分析\n\n")
-            f.write("### 月度发文量趋势\n\n")
-            for date, count in temporal_analysis["monthly_counts"].items():
-                f.write(f"- {date}: {count}篇\n")
+    def related_papers(self, paper_id: int, k: int = 10) -> List[Tuple[Paper, float]]:
+        """查找与指定论文最相似的论文（向量索引增量同步新入库的论文）"""
+        if self.embedding_index is None:
+            self.embedding_index = EmbeddingIndex(self.embedding_dir)
+        session = self.db_manager.Session()
+        try:
+            def texts_after(after_id: int):
+                rows = session.query(Paper.id, Paper.title, Paper.abstract).filter(
+                    Paper.id > after_id
+                ).order_by(Paper.id).yield_per(1000)
+                return ((pid, f"{title} {abstract or ''}") for pid, title, abstract in rows)
+            self.embedding_index.sync(texts_after)
             
-            # 可视化图表
-            f.write("\n## 6. 可视化图表\n\n")
-            f.write("### 词云图\n")
-            f.write("![词云图](figures/wordcloud.png)\n\n")
-            f.write("### 年度发文量分布\n")
-            f.write("![年度分布](figures/year_distribution.png)\n\n")
-            f.write("### 引文网络图\n")
-            f.write("![引文网络](figures/citation_network.png)\n")
+            related = self.embedding_index.related(paper_id, k)
+            # 作者随论文一起读出，会话关闭后（如在界面线程中）仍可访问
+            papers = {p.id: p for p in session.query(Paper).options(selectinload(Paper.authors)).filter(
+                Paper.id.in_([pid for pid, _ in related])
+            )}
+            return [(papers[pid], score) for pid, score in related if pid in papers]
+        finally:
+            session.close()
+    
+    def keyword_trend_analysis(self, window: int = 3, top_n: int = 20, categories: List[str] = None) -> Dict:
+        """基于持久化词表的上升/下降词分析（只对新增论文分词）"""
+        return self.trend_engine.trends(window=window, top_n=top_n, categories=categories)
+    
+    def generate_visualizations(self, papers: List[Paper], output_dir: str,
+                                temporal: Dict = None) -> Dict[str, str]:
+        """生成可视化图表（各图并行渲染，输入未变化的图跳过）"""
+        if temporal is None:
+            temporal = self.temporal_analysis(papers)
+        return self.render_figures(
+            output_dir,
+            frequencies=self.word_frequencies(papers),
+            yearly_counts=temporal["yearly_counts"],
+            edges=self.citation_edges(papers)
+        )
+    
+    def render_figures(self, output_dir: str, frequencies: Dict[str, int],
+                       yearly_counts: Dict[str, int], edges: List[Tuple[str, str]]) -> Dict[str, str]:
+        """由已汇总的数据渲染报告图表"""
+        # 引用网络布局（坐标按节点持久化，增量报告只调整新节点）
+        positions = LayoutService(os.path.join(output_dir, ".citation_layout.json")).layout(edges)
         
-        return report_path 
\ No newline at end of file
+        jobs = {
+            # 1. 词云图
+            "wordcloud.png": FigureJob(render_wordcloud, {
+                "frequencies": frequencies
+            }),
+            # 2. 发布时间分布图
+            "year_distribution.png": FigureJob(render_year_distribution, {
+                "yearly_counts": yearly_counts
+            }),
+            # 3. 引用网络图
+            "citation_network.png": FigureJob(render_citation_network, {
+                "edges": edges,
+                "positions": positions
+            })
+        }
+        return FigureRenderer(output_dir).render(jobs)
+    
+    def word_frequencies(self, papers: List[Paper], top_n: int = 200) -> Dict[str, int]:
+        """词云用词频：只统计给定论文（覆盖完整类别/月份时直接读取持久化词频表）"""
+        return self.term_frequencies.paper_frequencies(papers, top_n=top_n)
+    
+    def generate_category_wordclouds(self, output_dir: str, top_n: int = 200) -> Dict[str, str]:
+        """为每个类别生成词云（直接读取词频表，无需重新分词）"""
+        self.term_frequencies.update()
+        jobs = {}
+        for category in self.term_frequencies.categories():
+            frequencies = self.term_frequencies.frequencies(categories=[category], top_n=top_n)
+            if frequencies:
+                filename = f"wordcloud_{category.replace('/', '_').replace(' ', '_')}.png"
+                jobs[filename] = FigureJob(render_wordcloud, {"frequencies": frequencies})
+        return FigureRenderer(output_dir).render(jobs)
+    
+    def generate_comprehensive_report(self, papers: List[Paper], output_dir: str) -> str:
+        """生成综合分析报告（章节按输入缓存，只重新生成有变化的部分）"""
+        engine = ReportEngine(self)
+        return engine.generate(output_dir, engine.collect_papers(papers))
+    
+    def generate_database_report(self, output_dir: str) -> str:
+        """基于数据库全量论文流式生成综合分析报告"""
+        return ReportEngine(self).generate(output_dir)
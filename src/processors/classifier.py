@@ -0,0 +1,152 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from pathlib import Path
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.metrics import classification_report
+from sklearn.model_selection import train_test_split
+from sklearn.naive_bayes import MultinomialNB
+from loguru import logger
+from ..models.database import DatabaseManager, Paper, ProcessingWatermark
+from ..crawlers.cancellation import CancellationToken
+from .term_frequency import UNCATEGORIZED
+
+def paper_text(title: str, abstract: Optional[str]) -> str:
+    """分类使用的文本：标题 + 摘要"""
+    return f"{title} {abstract or ''}"
+
+class PaperClassifier:
+    """基于已分类论文训练的朴素贝叶斯分类器
+
+    使用无状态的 HashingVectorizer，特征空间固定，新论文入库后可以用 partial_fit 增量训练；
+    向量化器和模型一起持久化到 model_path。
+    """
+
+    WATERMARK = "classifier"
+
+    def __init__(self, model_path: str, n_features: int = 2 ** 18, batch_size: int = 1000,
+                 min_confidence: float = 0.5):
+        self.model_path = Path(model_path)
+        self.batch_size = batch_size
+        self.min_confidence = min_confidence
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features, alternate_sign=False, ngram_range=(1, 2), stop_words='english'
+        )
+        self.model: Optional[MultinomialNB] = None
+        self.load()
+
+    @property
+    def is_trained(self) -> bool:
+        return self.model is not None
+
+    def load(self) -> bool:
+        """读取已持久化的向量化器和模型"""
+        if not self.model_path.exists():
+            return False
+        try:
+            self.vectorizer, self.model = joblib.load(self.model_path)
+            return True
+        except Exception as e:
+            logger.warning(f"Classifier model unreadable, retraining required: {str(e)}")
+            self.model = None
+            return False
+
+    def save(self):
+        """持久化向量化器和模型"""
+        self.model_path.parent.mkdir(parents=True, exist_ok=True)
+        joblib.dump((self.vectorizer, self.model), self.model_path)
+
+    def _labeled_batches(self, session, after_id: int = 0) -> Iterable[Tuple[int, List[str], List[str]]]:
+        """按ID分批读取已分类的论文，产出 (批内最大ID, 文本, 类别)"""
+        last_id = after_id
+        while True:
+            rows = session.query(Paper.id, Paper.title, Paper.abstract, Paper.category).filter(
+                Paper.id > last_id,
+                Paper.category.isnot(None),
+                Paper.category != UNCATEGORIZED
+            ).order_by(Paper.id).limit(self.batch_size).all()
+            if not rows:
+                return
+            last_id = rows[-1].id
+            yield last_id, [paper_text(r.title, r.abstract) for r in rows], [r.category for r in rows]
+
+    def train(self, db_manager: DatabaseManager, incremental: bool = True,
+              token: Optional[CancellationToken] = None) -> int:
+        """用数据库中已分类的论文训练，返回本次训练的论文数
+
+        incremental 为 True 时只用上次训练之后新增的论文做 partial_fit；
+        出现模型中没有的新类别时自动全量重训。
+        token 取消时在批次之间停下，保存已训练的部分和水位线后抛出 OperationCancelled。
+        """
+        session = db_manager.Session()
+        try:
+            categories = sorted(c for c, in session.query(Paper.category).filter(
+                Paper.category.isnot(None),
+                Paper.category != UNCATEGORIZED
+            ).distinct())
+            if not categories:
+                return 0
+
+            watermark = session.get(ProcessingWatermark, self.WATERMARK)
+            if watermark is None:
+                watermark = ProcessingWatermark(name=self.WATERMARK, last_paper_id=0)
+                session.add(watermark)
+
+            model, after_id = self.model, watermark.last_paper_id
+            if not (incremental and self.is_trained and set(categories) <= set(self.model.classes_)):
+                # 首次训练或出现新类别：partial_fit 无法追加类别，只能从头训练
+                model, after_id = MultinomialNB(alpha=0.1), 0
+
+            trained = 0
+            classes = np.array(model.classes_ if hasattr(model, 'classes_') else categories)
+            for last_id, texts, labels in self._labeled_batches(session, after_id):
+                if token is not None and token.cancelled:
+                    break
+                model.partial_fit(self.vectorizer.transform(texts), labels, classes=classes)
+                # 新模型拟合完第一批后才替换旧模型，在此之前取消时旧模型和水位线保持不变
+                self.model = model
+                watermark.last_paper_id = last_id
+                trained += len(texts)
+
+            if trained:
+                self.save()
+            session.commit()
+            logger.info(f"Classifier trained on {trained} papers ({len(classes)} categories)")
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+        if token is not None:
+            token.raise_if_cancelled()
+        return trained
+
+    def predict(self, texts: List[str]) -> List[Optional[str]]:
+        """批量分类（一次稀疏矩阵运算），置信度不足的返回 None"""
+        if not self.is_trained or not texts:
+            return [None] * len(texts)
+        probabilities = self.model.predict_proba(self.vectorizer.transform(texts))
+        best = probabilities.argmax(axis=1)
+        confident = probabilities[np.arange(len(texts)), best] >= self.min_confidence
+        return [str(self.model.classes_[i]) if ok else None for i, ok in zip(best, confident)]
+
+    def evaluate(self, db_manager: DatabaseManager, test_size: float = 0.2, seed: int = 42) -> Dict:
+        """留出法评估：在训练集上单独拟合一个模型并在测试集上计算各类别的精确率/召回率/F1
+
+        不会修改已持久化的模型。
+        """
+        session = db_manager.Session()
+        try:
+            texts, labels = [], []
+            for _, batch_texts, batch_labels in self._labeled_batches(session):
+                texts.extend(batch_texts)
+                labels.extend(batch_labels)
+        finally:
+            session.close()
+
+        if len(set(labels)) < 2:
+            return {}
+        X = self.vectorizer.transform(texts)
+        X_train, X_test, y_train, y_test = train_test_split(X, labels, test_size=test_size, random_state=seed)
+        model = MultinomialNB(alpha=0.1).fit(X_train, y_train)
+        return classification_report(y_test, model.predict(X_test), output_dict=True, zero_division=0)
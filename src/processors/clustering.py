@@ -0,0 +1,49 @@
+from typing import List, NamedTuple, Optional, Sequence
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+class ResultCluster(NamedTuple):
+    """一组语义相近的检索结果"""
+    label: str
+    members: List[int]          # 结果在原列表中的下标，按与簇中心的相似度排序
+    representatives: List[int]  # 最靠近簇中心的几篇
+
+def suggest_cluster_count(n: int, max_clusters: int = 30) -> int:
+    """按结果数量估计簇数（约 sqrt(n/2)）"""
+    return int(min(max_clusters, max(2, np.sqrt(n / 2))))
+
+def cluster_texts(texts: Sequence[str], n_clusters: Optional[int] = None, n_terms: int = 3,
+                  n_representatives: int = 3, seed: int = 42) -> List[ResultCluster]:
+    """用 TF-IDF + MiniBatchKMeans 对文本聚类，簇标签取簇中心权重最高的词，结果按簇大小排序"""
+    if len(texts) < 2:
+        return [ResultCluster("全部结果", list(range(len(texts))), list(range(len(texts))))]
+
+    vectorizer = TfidfVectorizer(max_features=20000, sublinear_tf=True, stop_words='english')
+    try:
+        features = vectorizer.fit_transform(texts)
+    except ValueError:
+        # 文本全是停用词或为空
+        return [ResultCluster("全部结果", list(range(len(texts))), list(range(min(len(texts), n_representatives))))]
+
+    n_clusters = min(n_clusters or suggest_cluster_count(len(texts)), len(texts))
+    kmeans = MiniBatchKMeans(n_clusters=n_clusters, batch_size=1024, n_init=3, random_state=seed)
+    assignments = kmeans.fit_predict(features)
+    terms = vectorizer.get_feature_names_out()
+    # TF-IDF 行向量已归一化，与簇中心的点积即相似度
+    similarity = np.asarray((features @ kmeans.cluster_centers_.T))
+
+    clusters = []
+    for cluster in range(n_clusters):
+        members = np.flatnonzero(assignments == cluster)
+        if not len(members):
+            continue
+        members = members[np.argsort(-similarity[members, cluster])]
+        top_terms = terms[np.argsort(-kmeans.cluster_centers_[cluster])[:n_terms]]
+        clusters.append(ResultCluster(
+            label=" / ".join(top_terms),
+            members=members.tolist(),
+            representatives=members[:n_representatives].tolist()
+        ))
+    clusters.sort(key=lambda c: len(c.members), reverse=True)
+    return clusters
@@ -0,0 +1,258 @@
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from pathlib import Path
+import json
+import joblib
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import TfidfVectorizer
+from loguru import logger
+
+class EmbeddingIndex:
+    """论文向量索引（离线 TF-IDF + SVD）
+
+    向量以 float32 内存映射矩阵保存（vectors.f32），第 i 行对应 ids.npy 中的第 i 个论文ID；
+    论文数不超过 exact_limit 时暴力检索，否则建立 IVF 倒排索引（k-means 聚类，只检索最近的 n_probe 个簇）。
+    所有向量都做了 L2 归一化，相似度即余弦相似度。
+    模型只用建索引时的语料拟合，论文数或新词数相对拟合时增长到 refit_ratio 倍后全量重建（重新拟合并重新嵌入所有论文）。
+    """
+
+    VECTORS = "vectors.f32"
+    IDS = "ids.npy"
+    MODEL = "model.joblib"
+    IVF = "ivf.npz"
+    META = "meta.json"
+
+    def __init__(self, index_dir: str, dim: int = 128, exact_limit: int = 200000, n_probe: int = 8,
+                 refit_ratio: float = 1.5):
+        self.index_dir = Path(index_dir)
+        self.max_dim = dim
+        self.dim = dim
+        self.refit_ratio = refit_ratio
+        self.fitted_count = 0
+        self.exact_limit = exact_limit
+        self.n_probe = n_probe
+        self.model: Optional[Tuple[TfidfVectorizer, TruncatedSVD]] = None
+        self.ids = np.empty(0, dtype=np.int64)
+        self.vectors = np.empty((0, dim), dtype=np.float32)
+        self.ivf: Optional[Dict[str, np.ndarray]] = None
+        self._rows: Dict[int, int] = {}
+        self.load()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def max_id(self) -> int:
+        return int(self.ids.max()) if len(self.ids) else 0
+
+    def load(self) -> bool:
+        """打开已保存的索引（向量按需从磁盘映射，不整体读入内存）"""
+        meta_path = self.index_dir / self.META
+        if not meta_path.exists():
+            return False
+        try:
+            meta = json.loads(meta_path.read_text(encoding='utf-8'))
+            self.dim = meta["dim"]
+            self.fitted_count = meta.get("fitted", meta["count"])
+            self.model = joblib.load(self.index_dir / self.MODEL)
+            self.ids = np.load(self.index_dir / self.IDS)
+            self._map_vectors()
+            ivf_path = self.index_dir / self.IVF
+            self.ivf = None
+            if ivf_path.exists():
+                ivf = np.load(ivf_path)
+                self._set_ivf(ivf["centroids"], ivf["assignments"])
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Embedding index unreadable, rebuild required: {str(e)}")
+            self.model = None
+            self.ids = np.empty(0, dtype=np.int64)
+            self.vectors = np.empty((0, self.dim), dtype=np.float32)
+            self._rows = {}
+            return False
+        return True
+
+    def _map_vectors(self):
+        """把磁盘上的向量矩阵映射为只读数组"""
+        if len(self.ids):
+            self.vectors = np.memmap(self.index_dir / self.VECTORS, dtype=np.float32, mode='r',
+                                     shape=(len(self.ids), self.dim))
+        else:
+            self.vectors = np.empty((0, self.dim), dtype=np.float32)
+        self._rows = {int(paper_id): row for row, paper_id in enumerate(self.ids)}
+
+    def _release_vectors(self):
+        """关闭向量文件的内存映射（Windows 上映射中的文件不能截断或删除）"""
+        self.vectors = np.empty((0, self.dim), dtype=np.float32)
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """把文本转换为归一化的 float32 向量"""
+        vectorizer, svd = self.model
+        vectors = svd.transform(vectorizer.transform(texts)).astype(np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+    def build(self, rows: Iterable[Tuple[int, str]]):
+        """用 (论文ID, 文本) 全量重建索引
+
+        论文或特征词少于 2 个时无法做 SVD，此时不建索引（清空已有索引），等论文增加后再建。
+        """
+        rows = list(rows)
+        ids = np.array([paper_id for paper_id, _ in rows], dtype=np.int64)
+        texts = [text for _, text in rows]
+        vectorizer = TfidfVectorizer(max_features=50000, sublinear_tf=True, stop_words='english')
+        try:
+            tfidf = vectorizer.fit_transform(texts)
+        except ValueError:
+            tfidf = None  # 没有论文或全部是停用词
+        if tfidf is None or min(tfidf.shape) < 2:
+            self.clear()
+            logger.info(f"Embedding index skipped: {len(texts)} papers are too few to fit a model")
+            return
+        dim = min(self.max_dim, tfidf.shape[1] - 1, len(texts) - 1)
+        svd = TruncatedSVD(n_components=dim, random_state=42).fit(tfidf)
+        self.model = (vectorizer, svd)
+        self.dim = dim
+        self.fitted_count = len(texts)
+
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        joblib.dump(self.model, self.index_dir / self.MODEL)
+        self._release_vectors()
+        (self.index_dir / self.VECTORS).write_bytes(b'')
+        (self.index_dir / self.IVF).unlink(missing_ok=True)
+        self.ids = np.empty(0, dtype=np.int64)
+        self.ivf = None
+        self._append(ids, self.embed(texts))
+        logger.info(f"Embedding index built: {len(self)} papers, {dim} dimensions")
+
+    def add(self, rows: Iterable[Tuple[int, str]]) -> int:
+        """用已训练的模型追加新论文（不重新拟合），返回追加的篇数"""
+        rows = [(paper_id, text) for paper_id, text in rows if paper_id not in self._rows]
+        if not rows:
+            return 0
+        ids = np.array([paper_id for paper_id, _ in rows], dtype=np.int64)
+        self._append(ids, self.embed([text for _, text in rows]))
+        return len(rows)
+
+    def clear(self):
+        """删除索引文件并清空内存中的索引"""
+        self._release_vectors()
+        for name in (self.VECTORS, self.IDS, self.MODEL, self.IVF, self.META):
+            (self.index_dir / name).unlink(missing_ok=True)
+        self.model = None
+        self.fitted_count = 0
+        self.ids = np.empty(0, dtype=np.int64)
+        self.vectors = np.empty((0, self.dim), dtype=np.float32)
+        self.ivf = None
+        self._rows = {}
+
+    def needs_refit(self, rows: Sequence[Tuple[int, str]]) -> bool:
+        """新论文加入后论文数或词表相对拟合时的语料增长到 refit_ratio 倍时需要重新拟合"""
+        if self.model is None:
+            return True
+        if len(self) + len(rows) >= self.refit_ratio * self.fitted_count:
+            return True
+        vectorizer = self.model[0]
+        analyzer = vectorizer.build_analyzer()
+        unseen = {term for _, text in rows for term in analyzer(text)} - vectorizer.vocabulary_.keys()
+        return len(unseen) >= (self.refit_ratio - 1) * len(vectorizer.vocabulary_)
+
+    def sync(self, texts_after: Callable[[int], Iterable[Tuple[int, str]]]) -> int:
+        """增量同步，返回新索引的论文数
+
+        texts_after(after_id) 产出ID大于 after_id 的 (论文ID, 文本)。
+        需要重新拟合时（见 needs_refit）读取全部论文重建，否则只用现有模型追加新论文。
+        """
+        before = len(self)
+        rows = list(texts_after(self.max_id))
+        if not rows:
+            return 0
+        if self.needs_refit(rows):
+            self.build(texts_after(0))
+            return max(0, len(self) - before)
+        return self.add(rows)
+
+    def _append(self, ids: np.ndarray, vectors: np.ndarray):
+        """把向量追加到磁盘上的矩阵末尾并重新映射"""
+        with open(self.index_dir / self.VECTORS, 'ab') as f:
+            f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+        self.ids = np.concatenate([self.ids, ids])
+        np.save(self.index_dir / self.IDS, self.ids)
+        (self.index_dir / self.META).write_text(
+            json.dumps({"dim": self.dim, "count": len(self.ids), "fitted": self.fitted_count}), encoding='utf-8'
+        )
+        self._map_vectors()
+
+        if self.ivf is not None:
+            # 新向量归入最近的簇，不重新聚类
+            assignments = np.concatenate([self.ivf["assignments"], self._assign(vectors)])
+            self._save_ivf(self.ivf["centroids"], assignments)
+        elif len(self.ids) > self.exact_limit:
+            self._build_ivf()
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        return np.argmax(vectors @ self.ivf["centroids"].T, axis=1) if len(vectors) else np.empty(0, dtype=np.int64)
+
+    def _set_ivf(self, centroids: np.ndarray, assignments: np.ndarray):
+        """倒排列表：按簇排序的行号及各簇的起止位置"""
+        order = np.argsort(assignments, kind='stable')
+        offsets = np.searchsorted(assignments[order], np.arange(len(centroids) + 1))
+        self.ivf = {"centroids": centroids, "assignments": assignments, "order": order, "offsets": offsets}
+
+    def _save_ivf(self, centroids: np.ndarray, assignments: np.ndarray):
+        np.savez(self.index_dir / self.IVF, centroids=centroids, assignments=assignments)
+        self._set_ivf(centroids, assignments)
+
+    def _build_ivf(self):
+        """在向量样本上做 k-means，划分约 sqrt(n) 个倒排列表"""
+        n_lists = int(np.sqrt(len(self.ids)))
+        kmeans = MiniBatchKMeans(n_clusters=n_lists, batch_size=4096, n_init=1, random_state=42)
+        sample_size = min(len(self.ids), 50 * n_lists)
+        sample = np.sort(np.random.default_rng(42).choice(len(self.ids), sample_size, replace=False))
+        kmeans.fit(self.vectors[sample])
+        centroids = kmeans.cluster_centers_.astype(np.float32)
+        self.ivf = {"centroids": centroids}
+        assignments = np.concatenate([
+            self._assign(np.asarray(self.vectors[start:start + 65536]))
+            for start in range(0, len(self.ids), 65536)
+        ])
+        self._save_ivf(centroids, assignments)
+
+    def search(self, vector: np.ndarray, k: int = 10, exclude: Optional[int] = None) -> List[Tuple[int, float]]:
+        """返回与向量最相似的 k 篇论文 (论文ID, 余弦相似度)"""
+        if not len(self.ids):
+            return []
+        if self.ivf is not None:
+            centroid_scores = self.ivf["centroids"] @ vector
+            probes = np.argsort(centroid_scores)[::-1][:self.n_probe]
+            offsets = self.ivf["offsets"]
+            candidates = np.sort(np.concatenate([self.ivf["order"][offsets[p]:offsets[p + 1]] for p in probes]))
+            scores = self.vectors[candidates] @ vector
+        else:
+            candidates = None
+            scores = self.vectors @ vector
+
+        if exclude is not None and exclude in self._rows:
+            row = self._rows[exclude]
+            if candidates is None:
+                scores[row] = -np.inf
+            else:
+                scores[candidates == row] = -np.inf
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        rows = top if candidates is None else candidates[top]
+        return [(int(self.ids[r]), float(scores[t])) for r, t in zip(rows, top) if np.isfinite(scores[t])]
+
+    def related(self, paper_id: int, k: int = 10) -> List[Tuple[int, float]]:
+        """与指定论文最相似的 k 篇论文（不含自身）"""
+        row = self._rows.get(paper_id)
+        if row is None:
+            return []
+        return self.search(np.asarray(self.vectors[row]), k, exclude=paper_id)
+
+    def search_text(self, text: str, k: int = 10) -> List[Tuple[int, float]]:
+        """与任意文本（如尚未入库的检索结果）最相似的 k 篇论文"""
+        if self.model is None:
+            return []
+        return self.search(self.embed([text])[0], k)
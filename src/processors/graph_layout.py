@@ -0,0 +1,115 @@
+from typing import Dict, Iterable, List, Tuple
+from pathlib import Path
+import hashlib
+import json
+import numpy as np
+import networkx as nx
+from scipy import sparse
+from loguru import logger
+
+Position = Tuple[float, float]
+
+class LayoutService:
+    """网络图布局服务
+
+    节点坐标按节点ID持久化到 JSON 文件。再次布局时已有节点保持原位作为初值，
+    新节点放在已布局邻居的重心附近，只需少量迭代即可收敛，图片在多次运行间保持稳定。
+    冷启动使用稀疏谱布局；节点数不超过 refine_limit 时再做少量力导向迭代细化。
+    """
+
+    def __init__(self, store_path: str, refine_limit: int = 2000, seed: int = 42):
+        self.store_path = Path(store_path)
+        self.refine_limit = refine_limit
+        self.seed = seed
+
+    def load(self) -> Dict[str, Position]:
+        """读取已持久化的节点坐标"""
+        if not self.store_path.exists():
+            return {}
+        try:
+            data = json.loads(self.store_path.read_text(encoding='utf-8'))
+            return {node: (float(x), float(y)) for node, (x, y) in data.items()}
+        except (OSError, ValueError):
+            logger.warning(f"Layout store unreadable, recomputing layout: {self.store_path}")
+            return {}
+
+    def save(self, positions: Dict[str, Position]):
+        """保存节点坐标（与已有坐标合并，暂时不在图中的节点也保留）"""
+        stored = self.load()
+        stored.update(positions)
+        self.store_path.parent.mkdir(parents=True, exist_ok=True)
+        self.store_path.write_text(
+            json.dumps({node: [x, y] for node, (x, y) in stored.items()}, ensure_ascii=False),
+            encoding='utf-8'
+        )
+
+    def layout(self, edges: Iterable[Tuple[str, str]], nodes: Iterable[str] = ()) -> Dict[str, Position]:
+        """计算布局并持久化，返回本图所有节点的坐标"""
+        G = nx.Graph()
+        G.add_nodes_from(nodes)
+        G.add_edges_from(edges)
+        if G.number_of_nodes() == 0:
+            return {}
+
+        previous = self.load()
+        known = [n for n in G.nodes if n in previous]
+        new = [n for n in G.nodes if n not in previous]
+
+        if not known:
+            positions = self._cold_start(G)
+            iterations = 50
+        elif new:
+            positions = self._place_new_nodes(G, previous, new)
+            iterations = max(5, int(50 * len(new) / G.number_of_nodes()))
+        else:
+            positions = {n: previous[n] for n in G.nodes}
+            iterations = 0
+
+        if iterations and G.number_of_nodes() <= self.refine_limit:
+            # 已有节点固定不动，只调整新节点
+            positions = nx.spring_layout(
+                G, pos={n: np.asarray(p) for n, p in positions.items()},
+                fixed=known or None, iterations=iterations, seed=self.seed
+            )
+            positions = {n: (float(p[0]), float(p[1])) for n, p in positions.items()}
+
+        positions = {n: (round(x, 6), round(y, 6)) for n, (x, y) in positions.items()}
+        self.save(positions)
+        return positions
+
+    def _cold_start(self, G: nx.Graph) -> Dict[str, Position]:
+        """首次布局：谱布局（大图自动使用稀疏特征值求解）"""
+        if G.number_of_nodes() < 3:
+            return {n: self._hash_position(n) for n in G.nodes}
+        positions = nx.spectral_layout(G)
+        return {n: (float(p[0]), float(p[1])) for n, p in positions.items()}
+
+    def _place_new_nodes(self, G: nx.Graph, previous: Dict[str, Position],
+                         new: List[str], sweeps: int = 20) -> Dict[str, Position]:
+        """已有节点固定，新节点迭代取邻居坐标均值（稀疏矩阵运算，每轮 O(边数)）"""
+        index = {n: i for i, n in enumerate(G.nodes)}
+        adjacency = nx.to_scipy_sparse_array(G, nodelist=list(G.nodes), format='csr', weight=None)
+        degree = np.asarray(adjacency.sum(axis=1)).ravel()
+
+        coords = np.zeros((len(index), 2))
+        for n, i in index.items():
+            coords[i] = previous[n] if n in previous else self._hash_position(n)
+
+        jitter = np.array([self._hash_position(n, scale=0.05) for n in new])
+        new_rows = np.array([index[n] for n in new])
+        has_neighbours = degree[new_rows] > 0
+        inverse_degree = sparse.diags(np.divide(1.0, degree, out=np.zeros_like(degree, dtype=float), where=degree > 0))
+        for _ in range(sweeps):
+            averaged = inverse_degree @ (adjacency @ coords)
+            coords[new_rows[has_neighbours]] = averaged[new_rows[has_neighbours]]
+        coords[new_rows] += jitter
+
+        return {n: (float(coords[i, 0]), float(coords[i, 1])) for n, i in index.items()}
+
+    @staticmethod
+    def _hash_position(node: str, scale: float = 1.0) -> Position:
+        """由节点ID确定的伪随机坐标，保证多次运行结果一致"""
+        digest = hashlib.md5(str(node).encode('utf-8')).digest()
+        x = int.from_bytes(digest[:4], 'little') / 2 ** 32 * 2 - 1
+        y = int.from_bytes(digest[4:8], 'little') / 2 ** 32 * 2 - 1
+        return x * scale, y * scale
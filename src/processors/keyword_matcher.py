@@ -0,0 +1,68 @@
+from typing import Dict, Iterable, List, Optional
+from collections import Counter
+import re
+
+def _trie_pattern(node: Dict) -> str:
+    """把关键词前缀树转换为正则（公共前缀只匹配一次，可选后缀贪婪匹配，优先最长关键词）"""
+    alternatives = [re.escape(ch) + _trie_pattern(child) for ch, child in sorted(node.items()) if ch]
+    if not alternatives:
+        return ''
+    body = alternatives[0] if len(alternatives) == 1 else '(?:' + '|'.join(alternatives) + ')'
+    if '' in node:
+        body = f'(?:{body})?'
+    return body
+
+class KeywordMatcher:
+    """多关键词匹配器
+
+    构造时把所有类别的关键词编译成一个前缀树正则，对文本只扫描一遍即可得到
+    每个类别的命中次数（扫描在正则引擎内完成，只在命中时回到 Python）。匹配语义与逐个 `keyword in text` 相同（大小写不敏感的子串匹配），
+    重叠的关键词也会分别计数。
+    """
+
+    def __init__(self, keywords: Dict[str, Iterable[str]]):
+        self.categories = list(keywords)
+        self._keyword_categories: Dict[str, List[str]] = {}
+        for category, words in keywords.items():
+            for word in words:
+                word = word.lower()
+                if word:
+                    self._keyword_categories.setdefault(word, []).append(category)
+
+        # 同一位置起始的较短关键词一定是匹配到的最长关键词的前缀，预先记下以便一并计数
+        self._implied: Dict[str, List[str]] = {
+            word: [other for other in self._keyword_categories if other != word and word.startswith(other)]
+            for word in self._keyword_categories
+        }
+
+        trie: Dict = {}
+        for word in self._keyword_categories:
+            node = trie
+            for ch in word:
+                node = node.setdefault(ch, {})
+            node[''] = True
+        self._pattern = re.compile(_trie_pattern(trie)) if trie else None
+
+    def scores(self, text: str) -> Counter:
+        """返回各类别的关键词命中次数"""
+        scores = Counter()
+        if self._pattern is None or not text:
+            return scores
+        text = text.lower()
+        search = self._pattern.search
+        match = search(text)
+        while match:
+            word = match.group()
+            for hit in (word, *self._implied[word]):
+                scores.update(self._keyword_categories[hit])
+            # 从下一个字符继续查找，统计与本次命中重叠的关键词
+            match = search(text, match.start() + 1)
+        return scores
+
+    def best(self, text: str) -> Optional[str]:
+        """返回命中次数最多的类别，并列时取配置中靠前的类别，没有命中返回 None"""
+        scores = self.scores(text)
+        if not scores:
+            return None
+        # max 返回第一个最大值，即配置顺序靠前的类别
+        return max(self.categories, key=lambda category: scores[category])
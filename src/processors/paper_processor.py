@@ -1,15 +1,16 @@
-from typing import List, Dict
-from datetime import datetime
-import os
-from pathlib import Path
+from typing import List, Dict, Tuple
+from collections import Counter
 import pandas as pd
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.naive_bayes import MultinomialNB
 from nltk.tokenize import word_tokenize
 from nltk.corpus import stopwords
 import nltk
 from loguru import logger
 from ..crawlers.base_crawler import Paper
+from .temporal import to_datetime64, rollup_dates
+from .keyword_matcher import KeywordMatcher
+from .classifier import PaperClassifier, paper_text
+from .report_writer import DailyReportWriter, ReportRow, parse_formats
 
 class PaperProcessor:
     """论文处理器"""
@@ -28,20 +29,46 @@ class PaperProcessor:
         
         self.stop_words = set(stopwords.words('english') + stopwords.words('chinese'))
         self.vectorizer = TfidfVectorizer(stop_words=list(self.stop_words))
-        self.classifier = MultinomialNB()
+        
+        # 基于已分类论文训练的分类器（未训练时只使用关键词规则）
+        classification = config["classification"]
+        self.classifier = PaperClassifier(
+            classification.get("model_path", "./data/models/paper_classifier.joblib"),
+            min_confidence=classification.get("min_confidence", 0.5)
+        )
+        
+        # 关键词规则在构造时编译一次，分类结果按论文缓存
+        self.keyword_matcher = KeywordMatcher(config["search"]["keywords"])
+        self._category_cache: Dict[Tuple[str, str], str] = {}
     
     def classify_paper(self, paper: Paper) -> str:
-        """对论文进行分类"""
-        # 使用标题、摘要和关键词进行分类
-        text = f"{paper.title} {paper.abstract} {' '.join(paper.keywords)}"
-        
-        # 根据关键词规则进行分类
-        for category, keywords in self.config["search"]["keywords"].items():
-            for keyword in keywords:
-                if keyword.lower() in text.lower():
-                    return self._map_category(category)
+        """对论文进行分类（命中关键词最多的类别）"""
+        cache_key = (paper.title, paper.url)
+        category = self._category_cache.get(cache_key)
+        if category is None:
+            # 使用标题、摘要和关键词进行分类
+            text = f"{paper.title} {paper.abstract} {' '.join(paper.keywords)}"
+            matched = self.keyword_matcher.best(text)
+            category = self._map_category(matched) if matched else "其他"
+            self._category_cache[cache_key] = category
+        return category
+    
+    def classify_papers(self, papers: List[Paper]) -> List[str]:
+        """批量分类，已有类别的论文保持不变
         
-        return "其他"
+        未分类的论文先用训练好的模型一次性预测，置信度不足的再退回关键词规则。
+        """
+        pending = [paper for paper in papers if not paper.category]
+        predictions = self.classifier.predict([paper_text(p.title, p.abstract) for p in pending])
+        predicted = {id(paper): category for paper, category in zip(pending, predictions) if category}
+        return [
+            paper.category or predicted.get(id(paper)) or self.classify_paper(paper)
+            for paper in papers
+        ]
+    
+    def train_classifier(self, db_manager, incremental: bool = True) -> int:
+        """用数据库中已分类的论文训练分类器"""
+        return self.classifier.train(db_manager, incremental=incremental)
     
     def _map_category(self, category: str) -> str:
         """将搜索类别映射到存储类别"""
@@ -53,54 +80,35 @@ class PaperProcessor:
         return category_map.get(category, "其他")
     
     def generate_daily_report(self, papers: List[Paper], output_dir: str) -> str:
-        """生成每日文献报告"""
+        """生成每日文献报告，按 reports.format 同时写出多种格式，返回 Markdown 报告路径"""
         try:
-            # 创建输出目录
-            os.makedirs(output_dir, exist_ok=True)
+            # 按类别整理论文（类别按首次出现的顺序）
+            categories = self.classify_papers(papers)
+            category_counts = Counter(categories)
+            order = {category: i for i, category in enumerate(dict.fromkeys(categories))}
+            rows = sorted(
+                (ReportRow(p.title, ', '.join(p.authors), p.published_date, p.source,
+                           p.doi, p.url, p.abstract, category)
+                 for p, category in zip(papers, categories)),
+                key=lambda row: order[row.category]
+            )
+            category_counts = {category: category_counts[category] for category in order}
             
-            # 按类别整理论文
-            papers_by_category = {}
-            for paper in papers:
-                category = paper.category or self.classify_paper(paper)
-                if category not in papers_by_category:
-                    papers_by_category[category] = []
-                papers_by_category[category].append(paper)
-            
-            # 生成报告
-            today = datetime.now().strftime("%Y-%m-%d")
-            report_path = Path(output_dir) / f"daily_report_{today}.md"
-            
-            with open(report_path, "w", encoding="utf-8") as f:
-                f.write(f"# 机器视觉文献日报 ({today})\n\n")
-                
-                # 总览
-                total_papers = len(papers)
-                f.write(f"## 总览\n\n")
-                f.write(f"- 今日获取文献总数：{total_papers}篇\n")
-                f.write(f"- 覆盖分类数：{len(papers_by_category)}个\n\n")
-                
-                # 按类别详细列表
-                for category, category_papers in papers_by_category.items():
-                    f.write(f"## {category} ({len(category_papers)}篇)\n\n")
-                    
-                    for paper in category_papers:
-                        f.write(f"### {paper.title}\n\n")
-                        f.write(f"- 作者：{', '.join(paper.authors)}\n")
-                        f.write(f"- 发布日期：{paper.published_date.strftime('%Y-%m-%d')}\n")
-                        f.write(f"- 来源：{paper.source}\n")
-                        if paper.doi:
-                            f.write(f"- DOI：{paper.doi}\n")
-                        f.write(f"- 链接：{paper.url}\n")
-                        f.write("\n**摘要：**\n\n")
-                        f.write(f"{paper.abstract}\n\n")
-                        f.write("---\n\n")
-            
-            logger.info(f"Daily report generated: {report_path}")
-            return str(report_path)
+            writer = DailyReportWriter(output_dir, self.report_formats())
+            return writer.write(rows, category_counts)["markdown"]
             
         except Exception as e:
             logger.error(f"Error generating daily report: {str(e)}")
-            return ""
+            raise
+    
+    def generate_daily_report_from_database(self, db_manager, output_dir: str, day=None) -> Dict[str, str]:
+        """从数据库流式生成某天入库论文的日报，返回 格式 -> 文件路径"""
+        writer = DailyReportWriter(output_dir, self.report_formats())
+        return writer.write_from_database(db_manager, day)
+    
+    def report_formats(self) -> List[str]:
+        """配置中的报告格式"""
+        return parse_formats(self.config.get("reports", {}).get("format"))
     
     def analyze_trends(self, papers: List[Paper]) -> Dict:
         """分析研究趋势"""
@@ -117,17 +125,16 @@ class PaperProcessor:
             top_indices = tfidf_sums.argsort()[-10:][::-1]
             top_keywords = [feature_names[i] for i in top_indices]
             
-            # 按时间统计论文数量
-            dates = pd.Series([p.published_date for p in papers])
-            daily_counts = dates.value_counts().sort_index()
+            # 按天统计论文数量
+            daily_counts = rollup_dates(to_datetime64(p.published_date for p in papers))["day"]
             
             # 按类别统计
-            categories = [p.category or self.classify_paper(p) for p in papers]
+            categories = self.classify_papers(papers)
             category_counts = pd.Series(categories).value_counts()
             
             return {
                 "top_keywords": top_keywords,
-                "daily_counts": daily_counts.to_dict(),
+                "daily_counts": daily_counts,
                 "category_counts": category_counts.to_dict()
             }
             
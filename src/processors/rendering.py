@@ -0,0 +1,149 @@
+from typing import Callable, Dict, NamedTuple, Optional
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import hashlib
+import json
+import os
+from loguru import logger
+
+# 渲染函数只使用面向对象的 Figure + Agg 画布，不经过 pyplot 状态机，
+# 因此可以在任意进程（包括无显示环境）中并行执行
+
+class FigureJob(NamedTuple):
+    """图表渲染任务：渲染函数 + 可序列化的输入数据"""
+    render: Callable[[Dict, str], None]
+    data: Dict
+
+def _new_figure(figsize):
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    figure = Figure(figsize=figsize)
+    FigureCanvasAgg(figure)
+    return figure
+
+def render_wordcloud(data: Dict, path: str):
+    """按预先统计好的词频渲染词云图"""
+    from wordcloud import WordCloud
+
+    wordcloud = WordCloud(
+        width=1200, height=800,
+        background_color='white'
+    ).generate_from_frequencies(data["frequencies"])
+
+    figure = _new_figure((15, 10))
+    ax = figure.add_subplot()
+    ax.imshow(wordcloud, interpolation='bilinear')
+    ax.axis('off')
+    figure.savefig(path)
+
+def render_year_distribution(data: Dict, path: str):
+    """渲染年度发文量柱状图"""
+    years = list(data["yearly_counts"].keys())
+    counts = list(data["yearly_counts"].values())
+
+    figure = _new_figure((15, 6))
+    ax = figure.add_subplot()
+    ax.bar(years, counts)
+    ax.set_title('Publication Year Distribution')
+    ax.set_xlabel('Year')
+    ax.set_ylabel('Number of Papers')
+    figure.savefig(path)
+
+def render_citation_network(data: Dict, path: str):
+    """渲染引文网络图（使用预先计算好的节点坐标）"""
+    import networkx as nx
+
+    G = nx.DiGraph()
+    G.add_edges_from(data["edges"])
+    pos = {node: data["positions"][node] for node in G.nodes}
+
+    # 节点多时缩小节点，只给度数最高的节点加标签
+    node_count = max(G.number_of_nodes(), 1)
+    node_size = max(20, min(1000, 30000 // node_count))
+    label_limit = data.get("label_limit", 50)
+    top_nodes = sorted(G.degree, key=lambda item: item[1], reverse=True)[:label_limit]
+    labels = {node: str(node)[:30] for node, _ in top_nodes}
+
+    figure = _new_figure((12, 12))
+    ax = figure.add_subplot()
+    nx.draw_networkx_edges(G, pos, ax=ax, arrows=node_count <= 500, alpha=0.4)
+    nx.draw_networkx_nodes(G, pos, ax=ax, node_color='lightblue', node_size=node_size)
+    nx.draw_networkx_labels(G, pos, labels=labels, ax=ax, font_size=8)
+    ax.axis('off')
+    figure.savefig(path)
+
+def data_hash(job: FigureJob) -> str:
+    """按渲染函数和输入数据计算内容哈希"""
+    payload = json.dumps(job.data, sort_keys=True, ensure_ascii=False, default=str)
+    digest = hashlib.sha256(f"{job.render.__module__}.{job.render.__qualname__}".encode('utf-8'))
+    digest.update(payload.encode('utf-8'))
+    return digest.hexdigest()
+
+class FigureRenderer:
+    """并行图表渲染：每张图在独立进程中渲染，输入数据未变化的图直接跳过"""
+
+    MANIFEST = ".figures.json"
+
+    def __init__(self, output_dir: str, max_workers: Optional[int] = None):
+        self.output_dir = Path(output_dir)
+        self.max_workers = max_workers
+
+    def _load_manifest(self) -> Dict[str, str]:
+        manifest_path = self.output_dir / self.MANIFEST
+        if manifest_path.exists():
+            try:
+                return json.loads(manifest_path.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                logger.warning(f"Figure manifest unreadable, re-rendering all: {manifest_path}")
+        return {}
+
+    def _save_manifest(self, manifest: Dict[str, str]):
+        manifest_path = self.output_dir / self.MANIFEST
+        manifest_path.write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+
+    def render(self, jobs: Dict[str, FigureJob]) -> Dict[str, str]:
+        """渲染一组图表（文件名 -> 任务），返回文件名到路径的映射
+
+        总耗时取决于最慢的一张图，而不是所有图耗时之和。
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        manifest = self._load_manifest()
+        paths = {name: str(self.output_dir / name) for name in jobs}
+
+        dirty = {}
+        for name, job in jobs.items():
+            digest = data_hash(job)
+            if manifest.get(name) == digest and os.path.exists(paths[name]):
+                continue
+            dirty[name] = (job, digest)
+
+        if not dirty:
+            return paths
+
+        errors = []
+        if len(dirty) == 1:
+            # 只有一张图需要渲染时不值得启动进程池
+            (name, (job, digest)), = dirty.items()
+            job.render(job.data, paths[name])
+            manifest[name] = digest
+        else:
+            workers = min(len(dirty), self.max_workers or os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    name: pool.submit(job.render, job.data, paths[name])
+                    for name, (job, _) in dirty.items()
+                }
+                for name, future in futures.items():
+                    try:
+                        future.result()
+                        manifest[name] = dirty[name][1]
+                    except Exception as e:
+                        logger.error(f"Error rendering figure {name}: {str(e)}")
+                        manifest.pop(name, None)
+                        errors.append(e)
+
+        self._save_manifest(manifest)
+        if errors:
+            raise errors[0]
+        return paths
@@ -0,0 +1,298 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from collections import Counter
+from itertools import groupby
+from pathlib import Path
+import hashlib
+import json
+import os
+import networkx as nx
+import numpy as np
+from loguru import logger
+from ..models.database import Paper, Author, AuthorAlias, CanonicalAuthor, Reference, paper_authors
+from ..models.author_index import canonical_author_key
+from .temporal import to_day, to_datetime64, rollup_dates
+from .term_frequency import UNCATEGORIZED, paper_period
+
+SECTIONS = ("topics", "citations", "authors", "temporal")
+
+class ReportInputs:
+    """报告输入：逐篇累加，一次遍历得到基本统计、各章节的输入及其内容哈希
+
+    只保留汇总结果：发表日期按天计数，标题和引用直接并入引文网络；
+    keep_documents 为 False 时不保存文档文本，由调用方设置可重复遍历的 documents（如数据库流式查询）。
+    """
+
+    def __init__(self, keep_documents: bool = True):
+        self.paper_count = 0
+        self.first_date = None
+        self.last_date = None
+        self.keep_documents = keep_documents
+        self.documents: Iterable[str] = []
+        self.day_counts: Counter = Counter()
+        self.categories = set()
+        self.periods = set()
+        self.citations = nx.DiGraph()
+        self.collaboration = nx.Graph()
+        self.author_names: Dict[Union[int, str], str] = {}
+        self.word_frequencies: Optional[Dict[str, int]] = None
+        self._rollups = None
+        self._digests = {section: hashlib.sha256() for section in SECTIONS}
+
+    @property
+    def edges(self) -> List[Tuple[str, str]]:
+        return list(self.citations.edges())
+
+    def _update(self, section: str, *values):
+        self._digests[section].update(json.dumps(values, ensure_ascii=False, default=str).encode('utf-8'))
+
+    def digest(self, section: str, *params) -> str:
+        """章节输入的内容哈希（params 为影响章节结果的参数）"""
+        digest = self._digests[section].copy()
+        digest.update(json.dumps(params, default=str).encode('utf-8'))
+        return digest.hexdigest()
+
+    def add_paper(self, title: str, abstract: str, published_date, category: Optional[str] = None):
+        """累加一篇论文的基本信息"""
+        self.paper_count += 1
+        if published_date is not None:
+            if self.first_date is None or published_date < self.first_date:
+                self.first_date = published_date
+            if self.last_date is None or published_date > self.last_date:
+                self.last_date = published_date
+            self.day_counts[to_day(published_date)] += 1
+        self.citations.add_node(title)
+        if self.keep_documents:
+            self.documents.append(document_text(title, abstract))
+        self.categories.add(category or UNCATEGORIZED)
+        self.periods.add(paper_period(published_date))
+        self._rollups = None
+        self._update("topics", title, abstract)
+        self._update("citations", title)
+        self._update("temporal", published_date)
+
+    def add_reference(self, title: str, reference_title: str):
+        """累加一条引用关系"""
+        self.citations.add_edge(title, reference_title)
+        self._update("citations", title, reference_title)
+
+    def add_coauthors(self, authors: Iterable[Tuple[Union[int, str], str]]):
+        """累加一篇论文的作者（规范作者ID, 显示名）"""
+        keys = []
+        for key, name in authors:
+            self.author_names[key] = name
+            if key not in keys:
+                keys.append(key)
+                self._update("authors", key, name)
+        self._update("authors", None)
+        for i in range(len(keys)):
+            for j in range(i + 1, len(keys)):
+                if self.collaboration.has_edge(keys[i], keys[j]):
+                    self.collaboration[keys[i]][keys[j]]['weight'] += 1
+                else:
+                    self.collaboration.add_edge(keys[i], keys[j], weight=1)
+
+    def rollups(self) -> Dict[str, Dict[str, int]]:
+        """日/周/月/年发文量"""
+        if self._rollups is None:
+            days = list(self.day_counts)
+            self._rollups = rollup_dates(to_datetime64(days), np.array([self.day_counts[d] for d in days]))
+        return self._rollups
+
+def document_text(title: str, abstract: Optional[str]) -> str:
+    """主题建模用的文档文本"""
+    return f"{title} {abstract}"
+
+class DatabaseDocuments:
+    """数据库中全部论文的文档文本，每次遍历重新流式查询，不在内存中保留"""
+
+    def __init__(self, db_manager, batch_size: int = 1000):
+        self.db_manager = db_manager
+        self.batch_size = batch_size
+
+    def __iter__(self) -> Iterator[str]:
+        session = self.db_manager.Session()
+        try:
+            rows = session.query(Paper.title, Paper.abstract).order_by(Paper.id).yield_per(self.batch_size)
+            for title, abstract in rows:
+                yield document_text(title, abstract)
+        finally:
+            session.close()
+
+class ReportEngine:
+    """综合报告生成器
+
+    输入通过流式查询（或一次遍历论文列表）收集，基本统计在同一遍中算出；
+    各章节按输入内容哈希缓存在输出目录中，只重新生成输入有变化的章节。
+    """
+
+    CACHE = ".report_sections.json"
+    REPORT = "comprehensive_analysis.md"
+
+    def __init__(self, analyzer, batch_size: int = 1000, num_topics: int = 5):
+        self.analyzer = analyzer
+        self.db_manager = analyzer.db_manager
+        self.batch_size = batch_size
+        self.num_topics = num_topics
+
+    def collect_papers(self, papers: List[Paper]) -> ReportInputs:
+        """从内存中的论文列表收集报告输入"""
+        # 与 collect_database 的累加顺序一致，同样的论文得到同样的章节哈希
+        inputs = ReportInputs()
+        for paper in papers:
+            inputs.add_paper(paper.title, paper.abstract, paper.published_date, paper.category)
+        for paper in papers:
+            for ref in paper.references:
+                if ref.reference_title:
+                    inputs.add_reference(paper.title, ref.reference_title)
+        for paper in papers:
+            authors = sorted(paper.authors, key=lambda author: author.id or 0)
+            inputs.add_coauthors(canonical_author_key(author) for author in authors)
+        inputs.word_frequencies = self.analyzer.word_frequencies(papers)
+        return inputs
+
+    def collect_database(self) -> ReportInputs:
+        """用流式查询从数据库收集全部论文的报告输入，不加载ORM对象"""
+        inputs = ReportInputs(keep_documents=False)
+        inputs.documents = DatabaseDocuments(self.db_manager, self.batch_size)
+        session = self.db_manager.Session()
+        try:
+            papers = session.query(
+                Paper.title, Paper.abstract, Paper.published_date, Paper.category
+            ).order_by(Paper.id).yield_per(self.batch_size)
+            for row in papers:
+                inputs.add_paper(*row)
+
+            references = session.query(Paper.title, Reference.reference_title).join(
+                Reference, Reference.paper_id == Paper.id
+            ).filter(
+                Reference.reference_title.isnot(None),
+                Reference.reference_title != ''
+            ).order_by(Reference.id).yield_per(self.batch_size)
+            for title, reference_title in references:
+                inputs.add_reference(title, reference_title)
+
+            authors = session.query(
+                paper_authors.c.paper_id, Author.name, AuthorAlias.canonical_id, CanonicalAuthor.name
+            ).join(Author, Author.id == paper_authors.c.author_id).outerjoin(
+                AuthorAlias, AuthorAlias.author_id == Author.id
+            ).outerjoin(
+                CanonicalAuthor, CanonicalAuthor.id == AuthorAlias.canonical_id
+            ).order_by(paper_authors.c.paper_id, Author.id).yield_per(self.batch_size)
+            for _, rows in groupby(authors, key=lambda row: row[0]):
+                # 与 canonical_author_key 一致：没有规范作者映射时退回到原始名字
+                inputs.add_coauthors(
+                    (canonical_id, canonical_name) if canonical_name is not None else (name, name)
+                    for _, name, canonical_id, canonical_name in rows
+                )
+        finally:
+            session.close()
+
+        self.analyzer.term_frequencies.update()
+        inputs.word_frequencies = self.analyzer.term_frequencies.frequencies()
+        return inputs
+
+    def _load_cache(self, output_dir: str) -> Dict[str, Dict]:
+        cache_path = Path(output_dir) / self.CACHE
+        if cache_path.exists():
+            try:
+                return json.loads(cache_path.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                logger.warning(f"Report section cache unreadable, regenerating all: {cache_path}")
+        return {}
+
+    def _save_cache(self, output_dir: str, cache: Dict[str, Dict]):
+        cache_path = Path(output_dir) / self.CACHE
+        cache_path.write_text(json.dumps(cache, ensure_ascii=False), encoding='utf-8')
+
+    def generate(self, output_dir: str, inputs: Optional[ReportInputs] = None) -> str:
+        """生成综合分析报告，未指定输入时从数据库流式收集"""
+        if inputs is None:
+            inputs = self.collect_database()
+        os.makedirs(output_dir, exist_ok=True)
+
+        builders = {
+            "topics": (self._topics_section, (self.num_topics,)),
+            "citations": (self._citations_section, ()),
+            "authors": (self._authors_section, ()),
+            "temporal": (self._temporal_section, ()),
+        }
+        cache = self._load_cache(output_dir)
+        sections = {}
+        for name, (build, params) in builders.items():
+            digest = inputs.digest(name, *params)
+            cached = cache.get(name)
+            if cached and cached.get("hash") == digest:
+                sections[name] = cached["markdown"]
+                continue
+            logger.info(f"Regenerating report section: {name}")
+            sections[name] = build(inputs)
+            cache[name] = {"hash": digest, "markdown": sections[name]}
+        self._save_cache(output_dir, cache)
+
+        # 图表由 FigureRenderer 按输入数据哈希自行跳过未变化的图
+        self.analyzer.render_figures(
+            f"{output_dir}/figures",
+            frequencies=inputs.word_frequencies or {},
+            yearly_counts=inputs.rollups()["year"],
+            edges=inputs.edges
+        )
+
+        report_path = f"{output_dir}/{self.REPORT}"
+        with open(report_path, 'w', encoding='utf-8') as f:
+            f.write("# 机器视觉文献综合分析报告\n\n")
+            f.write(self._basic_section(inputs))
+            for name in SECTIONS:
+                f.write(sections[name])
+            f.write(self._figures_section())
+        return report_path
+
+    def _basic_section(self, inputs: ReportInputs) -> str:
+        if inputs.first_date is not None:
+            span = f"{inputs.first_date.year} - {inputs.last_date.year}"
+        else:
+            span = "未知"
+        return (
+            "## 1. 基本统计\n\n"
+            f"- 总论文数：{inputs.paper_count}\n"
+            f"- 时间跨度：{span}\n"
+            f"- 涉及作者数：{len(inputs.author_names)}\n\n"
+        )
+
+    def _topics_section(self, inputs: ReportInputs) -> str:
+        lines = ["## 2. 研究主题分析\n\n"]
+        if inputs.paper_count:
+            topics = self.analyzer.topic_modeling_documents(inputs.documents, self.num_topics)
+            for topic, words in topics["topics"].items():
+                lines.append(f"### {topic}\n")
+                lines.append(f"关键词：{', '.join(words)}\n\n")
+        return ''.join(lines)
+
+    def _citations_section(self, inputs: ReportInputs) -> str:
+        # 报告只用到 PageRank，不计算介数中心性等高开销指标
+        lines = ["## 3. 引文网络分析\n\n", "### 最具影响力的论文（基于PageRank）\n\n"]
+        for paper, score in self.analyzer.key_papers(inputs.citations):
+            lines.append(f"- {paper}: {score:.4f}\n")
+        return ''.join(lines)
+
+    def _authors_section(self, inputs: ReportInputs) -> str:
+        lines = ["\n## 4. 作者合作网络分析\n\n", "### 核心作者\n\n"]
+        for author, score in self.analyzer.core_authors(inputs.collaboration, inputs.author_names):
+            lines.append(f"- {author}: {score:.4f}\n")
+        return ''.join(lines)
+
+    def _temporal_section(self, inputs: ReportInputs) -> str:
+        lines = ["\n## 5. 发展趋势分析\n\n", "### 月度发文量趋势\n\n"]
+        for date, count in inputs.rollups()["month"].items():
+            lines.append(f"- {date}: {count}篇\n")
+        return ''.join(lines)
+
+    def _figures_section(self) -> str:
+        return (
+            "\n## 6. 可视化图表\n\n"
+            "### 词云图\n"
+            "![词云图](figures/wordcloud.png)\n\n"
+            "### 年度发文量分布\n"
+            "![年度分布](figures/year_distribution.png)\n\n"
+            "### 引文网络图\n"
+            "![引文网络](figures/citation_network.png)\n"
+        )
@@ -0,0 +1,270 @@
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Union
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from string import Template
+import html
+import json
+import os
+from loguru import logger
+from sqlalchemy import and_, func, or_
+from ..models.database import DatabaseManager, Paper, Author, paper_authors
+from .term_frequency import UNCATEGORIZED
+
+BUFFER_SIZE = 1 << 16
+
+class ReportRow(NamedTuple):
+    """日报中的一篇论文"""
+    title: str
+    authors: str
+    published_date: Optional[datetime]
+    source: str
+    doi: Optional[str]
+    url: Optional[str]
+    abstract: Optional[str]
+    category: str
+
+def _format_date(value) -> str:
+    return value.strftime('%Y-%m-%d') if value else ""
+
+class MarkdownSink:
+    """Markdown 日报"""
+
+    extension = "md"
+    paper_template = Template(
+        "### $title\n\n"
+        "- 作者：$authors\n"
+        "- 发布日期：$published\n"
+        "- 来源：$source\n"
+        "$doi"
+        "- 链接：$url\n"
+        "\n**摘要：**\n\n"
+        "$abstract\n\n"
+        "---\n\n"
+    )
+
+    def __init__(self, f):
+        self.f = f
+
+    def header(self, report_date: str, total: int, category_count: int):
+        self.f.write(
+            f"# 机器视觉文献日报 ({report_date})\n\n"
+            "## 总览\n\n"
+            f"- 今日获取文献总数：{total}篇\n"
+            f"- 覆盖分类数：{category_count}个\n\n"
+        )
+
+    def category(self, name: str, count: int):
+        self.f.write(f"## {name} ({count}篇)\n\n")
+
+    def paper(self, row: ReportRow):
+        self.f.write(self.paper_template.substitute(
+            title=row.title,
+            authors=row.authors,
+            published=_format_date(row.published_date),
+            source=row.source,
+            doi=f"- DOI：{row.doi}\n" if row.doi else "",
+            url=row.url or "",
+            abstract=row.abstract or "",
+        ))
+
+    def footer(self):
+        pass
+
+class HtmlSink:
+    """HTML 日报（所有字段转义）"""
+
+    extension = "html"
+    paper_template = Template(
+        "<article>\n"
+        "<h3>$title</h3>\n"
+        "<ul>\n"
+        "<li>作者：$authors</li>\n"
+        "<li>发布日期：$published</li>\n"
+        "<li>来源：$source</li>\n"
+        "$doi"
+        "<li>链接：<a href=\"$url\">$url</a></li>\n"
+        "</ul>\n"
+        "<p><strong>摘要：</strong></p>\n"
+        "<p>$abstract</p>\n"
+        "</article>\n"
+    )
+
+    def __init__(self, f):
+        self.f = f
+        self._in_section = False
+
+    def header(self, report_date: str, total: int, category_count: int):
+        title = html.escape(f"机器视觉文献日报 ({report_date})")
+        self.f.write(
+            "<!DOCTYPE html>\n<html lang=\"zh-CN\">\n<head>\n<meta charset=\"utf-8\">\n"
+            f"<title>{title}</title>\n</head>\n<body>\n"
+            f"<h1>{title}</h1>\n"
+            "<h2>总览</h2>\n<ul>\n"
+            f"<li>今日获取文献总数：{total}篇</li>\n"
+            f"<li>覆盖分类数：{category_count}个</li>\n"
+            "</ul>\n"
+        )
+
+    def category(self, name: str, count: int):
+        if self._in_section:
+            self.f.write("</section>\n")
+        self.f.write(f"<section>\n<h2>{html.escape(name)} ({count}篇)</h2>\n")
+        self._in_section = True
+
+    def paper(self, row: ReportRow):
+        self.f.write(self.paper_template.substitute(
+            title=html.escape(row.title),
+            authors=html.escape(row.authors),
+            published=_format_date(row.published_date),
+            source=html.escape(row.source or ""),
+            doi=f"<li>DOI：{html.escape(row.doi)}</li>\n" if row.doi else "",
+            url=html.escape(row.url or ""),
+            abstract=html.escape(row.abstract or ""),
+        ))
+
+    def footer(self):
+        if self._in_section:
+            self.f.write("</section>\n")
+        self.f.write("</body>\n</html>\n")
+
+class JsonSink:
+    """JSON 日报（逐篇写出，不在内存中构造整个文档）"""
+
+    extension = "json"
+
+    def __init__(self, f):
+        self.f = f
+        self._categories = 0
+        self._papers = 0
+
+    def header(self, report_date: str, total: int, category_count: int):
+        self.f.write(
+            f'{{"date": {json.dumps(report_date)}, "total": {total}, '
+            f'"category_count": {category_count}, "categories": ['
+        )
+
+    def category(self, name: str, count: int):
+        if self._categories:
+            self.f.write(']}, ')
+        self.f.write(f'{{"name": {json.dumps(name, ensure_ascii=False)}, "count": {count}, "papers": [')
+        self._categories += 1
+        self._papers = 0
+
+    def paper(self, row: ReportRow):
+        record = row._asdict()
+        record["published_date"] = _format_date(row.published_date)
+        del record["category"]
+        self.f.write((', ' if self._papers else '') + json.dumps(record, ensure_ascii=False))
+        self._papers += 1
+
+    def footer(self):
+        self.f.write(']}]}\n' if self._categories else ']}\n')
+
+SINKS = {"markdown": MarkdownSink, "html": HtmlSink, "json": JsonSink}
+
+def parse_formats(value: Union[str, Sequence[str], None]) -> List[str]:
+    """解析 reports.format 配置（"html" / "markdown,json" / 列表），始终包含 markdown"""
+    if isinstance(value, str):
+        value = value.split(',')
+    formats = ["markdown"]
+    for name in value or []:
+        name = name.strip().lower()
+        name = "markdown" if name == "md" else name
+        if name not in SINKS:
+            raise ValueError(f"不支持的报告格式: {name}")
+        if name not in formats:
+            formats.append(name)
+    return formats
+
+class DailyReportWriter:
+    """日报写出器
+
+    消费按类别排好序的论文流，同时写出所有格式；各类别篇数事先给出，
+    因此每篇论文写出后即可丢弃，内存占用与论文数无关。
+    """
+
+    def __init__(self, output_dir: str, formats: Sequence[str] = ("markdown",), batch_size: int = 1000):
+        self.output_dir = Path(output_dir)
+        self.formats = list(formats)
+        self.batch_size = batch_size
+
+    def write(self, rows: Iterable[ReportRow], category_counts: Dict[str, int],
+              report_date: Optional[str] = None) -> Dict[str, str]:
+        """写出日报，rows 必须与 category_counts 的类别顺序一致，返回 格式 -> 文件路径"""
+        report_date = report_date or datetime.now().strftime("%Y-%m-%d")
+        os.makedirs(self.output_dir, exist_ok=True)
+        paths = {
+            name: str(self.output_dir / f"daily_report_{report_date}.{SINKS[name].extension}")
+            for name in self.formats
+        }
+        files = [open(paths[name], "w", encoding="utf-8", buffering=BUFFER_SIZE) for name in self.formats]
+        try:
+            sinks = [SINKS[name](f) for name, f in zip(self.formats, files)]
+            total = sum(category_counts.values())
+            for sink in sinks:
+                sink.header(report_date, total, len(category_counts))
+
+            current = None
+            for row in rows:
+                if row.category != current:
+                    current = row.category
+                    for sink in sinks:
+                        sink.category(current, category_counts[current])
+                for sink in sinks:
+                    sink.paper(row)
+
+            for sink in sinks:
+                sink.footer()
+        finally:
+            for f in files:
+                f.close()
+
+        logger.info(f"Daily report generated: {', '.join(paths.values())}")
+        return paths
+
+    def write_from_database(self, db_manager: DatabaseManager, day: Optional[date] = None) -> Dict[str, str]:
+        """从数据库流式写出某天入库论文的日报（分组和计数在 SQL 中完成）"""
+        day = day or date.today()
+        start = datetime.combine(day, time.min)
+        end = start + timedelta(days=1)
+        category = func.coalesce(Paper.category, UNCATEGORIZED)
+
+        session = db_manager.Session()
+        try:
+            in_day = (Paper.created_at >= start, Paper.created_at < end)
+            category_counts = dict(
+                session.query(category, func.count(Paper.id))
+                .filter(*in_day).group_by(category).order_by(category).all()
+            )
+            batches = self._paper_batches(session, category, in_day)
+            return self.write(self._with_authors(session, batches), category_counts, day.strftime("%Y-%m-%d"))
+        finally:
+            session.close()
+
+    def _paper_batches(self, session, category, conditions) -> Iterator[List]:
+        """按 (类别, ID) 键集分页读取论文，每批查询读完后再交给调用方，不占用打开的游标"""
+        last = None
+        while True:
+            query = session.query(
+                Paper.id, Paper.title, Paper.published_date, Paper.source, Paper.doi,
+                Paper.url, Paper.abstract, category
+            ).filter(*conditions)
+            if last is not None:
+                query = query.filter(or_(category > last[1], and_(category == last[1], Paper.id > last[0])))
+            batch = query.order_by(category, Paper.id).limit(self.batch_size).all()
+            if not batch:
+                return
+            last = (batch[-1][0], batch[-1][-1])
+            yield batch
+
+    def _with_authors(self, session, batches: Iterable[List]) -> Iterator[ReportRow]:
+        """按批补充作者名（每批一次查询）"""
+        for batch in batches:
+            authors: Dict[int, List[str]] = {}
+            for paper_id, name in session.query(paper_authors.c.paper_id, Author.name).join(
+                Author, Author.id == paper_authors.c.author_id
+            ).filter(paper_authors.c.paper_id.in_([row[0] for row in batch])).order_by(Author.id):
+                authors.setdefault(paper_id, []).append(name)
+            for paper_id, title, published_date, source, doi, url, abstract, category in batch:
+                yield ReportRow(title, ', '.join(authors.get(paper_id, [])), published_date,
+                                source, doi, url, abstract, category)
@@ -0,0 +1,161 @@
+from typing import Dict, Iterable, List, Optional
+from collections import Counter, defaultdict
+from datetime import date, datetime
+import numpy as np
+from sqlalchemy import func
+from ..models.database import DatabaseManager, Paper, Keyword, paper_keywords
+
+FREQUENCIES = ("day", "week", "month", "year")
+
+def to_day(value) -> date:
+    """日期值（datetime/date/ISO 格式字符串）所在的日期"""
+    if isinstance(value, str):
+        # ISO 格式字符串（可带时间和时区，如 SQLite 中的 "2023-01-02 08:00:00"）
+        value = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    # datetime64 不带时区，带时区的日期（如 arXiv 返回的 UTC 时间）按其自身时区的日期计算
+    return value.date() if isinstance(value, datetime) else value
+
+def to_datetime64(dates: Iterable) -> np.ndarray:
+    """把日期序列（datetime/date/ISO 格式字符串，可带时间和时区）转换为按天精度的 datetime64 数组，忽略空值"""
+    return np.array([to_day(d) for d in dates if d is not None], dtype='datetime64[D]')
+
+def truncate_dates(days: np.ndarray, freq: str) -> np.ndarray:
+    """把按天的日期截断到指定粒度，周以周一为起点"""
+    if freq == "day":
+        return days
+    if freq == "week":
+        # 1970-01-01 是周四，(天数 + 3) % 7 即距周一的天数
+        offsets = (days.astype('int64') + 3) % 7
+        return days - offsets.astype('timedelta64[D]')
+    if freq == "month":
+        return days.astype('datetime64[M]')
+    if freq == "year":
+        return days.astype('datetime64[Y]')
+    raise ValueError(f"未知的时间粒度: {freq}")
+
+def format_period(key: np.datetime64) -> str:
+    """时间键转为显示用字符串（2023 / 2023-01 / 2023-01-02）"""
+    return str(key)
+
+def rollup_dates(days: np.ndarray, counts: Optional[np.ndarray] = None) -> Dict[str, Dict[str, int]]:
+    """一次遍历计算日/周/月/年发文量，结果按时间排序
+
+    counts 给出每个日期的论文数时（已按天汇总的输入）按其加权。
+    """
+    rollups = {}
+    for freq in FREQUENCIES:
+        keys, inverse = np.unique(truncate_dates(days, freq), return_inverse=True)
+        totals = np.bincount(inverse.ravel(), weights=counts, minlength=len(keys))
+        rollups[freq] = {format_period(k): int(c) for k, c in zip(keys, totals)}
+    return rollups
+
+class TemporalAnalyzer:
+    """时间序列分析：直接从数据库读取发表日期，缓存各粒度汇总并增量更新"""
+
+    def __init__(self, db_manager: DatabaseManager):
+        self.db_manager = db_manager
+        self.invalidate()
+
+    def invalidate(self):
+        """清空缓存（论文被修改或删除后调用），下次访问时全量重建"""
+        self._last_id = 0
+        self._counts: Dict[str, Counter] = {freq: Counter() for freq in FREQUENCIES}
+        self._keyword_months: Dict[str, Counter] = defaultdict(Counter)
+
+    def refresh(self) -> int:
+        """只读取上次之后新增的论文并合并进缓存，返回新增论文数"""
+        session = self.db_manager.Session()
+        try:
+            rows = session.query(Paper.id, func.date(Paper.published_date)).filter(
+                Paper.id > self._last_id,
+                Paper.published_date.isnot(None)
+            ).all()
+            if not rows:
+                return 0
+
+            ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+            days = np.array([row[1] for row in rows], dtype='datetime64[D]')
+            for freq in FREQUENCIES:
+                keys, counts = np.unique(truncate_dates(days, freq), return_counts=True)
+                self._counts[freq].update(dict(zip(keys, counts.tolist())))
+
+            keyword_rows = session.query(Keyword.word, func.date(Paper.published_date)).join(
+                paper_keywords, paper_keywords.c.keyword_id == Keyword.id
+            ).join(Paper, Paper.id == paper_keywords.c.paper_id).filter(
+                Paper.id > self._last_id,
+                Paper.published_date.isnot(None)
+            ).all()
+            if keyword_rows:
+                months = np.array([row[1] for row in keyword_rows], dtype='datetime64[D]').astype('datetime64[M]')
+                for (word, _), month in zip(keyword_rows, months):
+                    self._keyword_months[word][month] += 1
+
+            self._last_id = int(ids.max())
+            return len(rows)
+        finally:
+            session.close()
+
+    def rollups(self) -> Dict[str, Dict[str, int]]:
+        """返回日/周/月/年发文量（按时间排序）"""
+        self.refresh()
+        return {
+            freq: {format_period(k): c for k, c in sorted(counter.items())}
+            for freq, counter in self._counts.items()
+        }
+
+    def monthly_series(self) -> Dict[str, int]:
+        """返回补齐空缺月份的月度发文量"""
+        self.refresh()
+        months = self._month_range(self._counts["month"].keys())
+        counter = self._counts["month"]
+        return {format_period(m): counter.get(m, 0) for m in months}
+
+    @staticmethod
+    def _month_range(months: Iterable) -> np.ndarray:
+        months = np.array(list(months), dtype='datetime64[M]')
+        if months.size == 0:
+            return months
+        return np.arange(months.min(), months.max() + 1, dtype='datetime64[M]')
+
+    def keyword_trends(self, min_count: int = 3, burst_z: float = 2.0,
+                       top_n: Optional[int] = 20) -> List[Dict]:
+        """按关键词计算月度趋势斜率与突发月份
+
+        趋势为月度发文量线性拟合的斜率（除以均值归一化），
+        突发月份为 z-score 不低于 burst_z 且篇数不少于 min_count 的月份。
+        """
+        self.refresh()
+        words = [w for w, c in self._keyword_months.items() if sum(c.values()) >= min_count]
+        if not words:
+            return []
+
+        months = self._month_range(m for w in words for m in self._keyword_months[w])
+        month_index = {m: i for i, m in enumerate(months)}
+        matrix = np.zeros((len(words), len(months)), dtype=np.float64)
+        for row, word in enumerate(words):
+            for month, count in self._keyword_months[word].items():
+                matrix[row, month_index[month]] = count
+
+        # 所有关键词一次性做最小二乘拟合
+        t = np.arange(len(months), dtype=np.float64)
+        t_centered = t - t.mean()
+        denominator = (t_centered ** 2).sum()
+        means = matrix.mean(axis=1)
+        slopes = (matrix - means[:, None]) @ t_centered / denominator if denominator else np.zeros(len(words))
+        normalized_slopes = np.divide(slopes, means, out=np.zeros_like(slopes), where=means > 0)
+
+        stds = matrix.std(axis=1)
+        z_scores = np.divide(matrix - means[:, None], stds[:, None],
+                             out=np.zeros_like(matrix), where=stds[:, None] > 0)
+        bursts = (z_scores >= burst_z) & (matrix >= min_count)
+
+        results = []
+        for row, word in enumerate(words):
+            results.append({
+                "keyword": word,
+                "total": int(matrix[row].sum()),
+                "trend": float(normalized_slopes[row]),
+                "bursts": [format_period(months[i]) for i in np.flatnonzero(bursts[row])],
+            })
+        results.sort(key=lambda r: r["trend"], reverse=True)
+        return results[:top_n] if top_n else results
@@ -0,0 +1,184 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from collections import Counter, defaultdict
+import re
+from sqlalchemy import func, or_
+from wordcloud import STOPWORDS
+from ..models.database import DatabaseManager, Paper, Term, TermFrequency, ProcessingWatermark
+from ..crawlers.cancellation import CancellationToken
+
+TOKEN_PATTERN = re.compile(r"[a-z][a-z0-9\-]+|[一-鿿]{2,}")
+UNCATEGORIZED = "其他"
+UNKNOWN_PERIOD = "unknown"
+
+def tokenize(text: str, stop_words: Set[str]) -> List[str]:
+    """小写分词并去除停用词"""
+    return [t for t in TOKEN_PATTERN.findall((text or "").lower()) if t not in stop_words]
+
+def paper_period(published_date) -> str:
+    """论文所属月份（YYYY-MM）"""
+    return published_date.strftime('%Y-%m') if published_date else UNKNOWN_PERIOD
+
+class TermFrequencyStore:
+    """持久化的词频表：按类别和月份汇总标题+摘要的词频，只处理新增论文"""
+
+    WATERMARK = "term_frequency"
+
+    def __init__(self, db_manager: DatabaseManager, stop_words: Optional[Iterable[str]] = None,
+                 batch_size: int = 1000):
+        self.db_manager = db_manager
+        self.stop_words = set(stop_words) if stop_words is not None else set(STOPWORDS)
+        self.batch_size = batch_size
+
+    def count_papers(self, papers: Iterable) -> Tuple[Dict[Tuple[str, str, str], List[int]], Counter]:
+        """统计一批论文的词频，返回 ((词, 类别, 月份) -> [词频, 文档数]) 与每个词的文档频率"""
+        counts: Dict[Tuple[str, str, str], List[int]] = defaultdict(lambda: [0, 0])
+        doc_freq = Counter()
+        for paper in papers:
+            category = paper.category or UNCATEGORIZED
+            period = paper_period(paper.published_date)
+            tokens = Counter(tokenize(f"{paper.title} {paper.abstract or ''}", self.stop_words))
+            for word, n in tokens.items():
+                entry = counts[(word, category, period)]
+                entry[0] += n
+                entry[1] += 1
+            doc_freq.update(tokens.keys())
+        return counts, doc_freq
+
+    def update(self, token: Optional[CancellationToken] = None) -> int:
+        """把上次更新之后新增的论文合并进词频表，返回处理的论文数
+
+        每批处理完即提交并推进水位线；token 取消时在批次之间停下并抛出 OperationCancelled，
+        已提交的批次不会重复处理。
+        """
+        session = self.db_manager.Session()
+        try:
+            watermark = session.get(ProcessingWatermark, self.WATERMARK)
+            if watermark is None:
+                watermark = ProcessingWatermark(name=self.WATERMARK, last_paper_id=0)
+                session.add(watermark)
+
+            # 按ID分批读取（键集分页），避免一次性载入全部论文
+            processed = 0
+            last_id = watermark.last_paper_id
+            while token is None or not token.cancelled:
+                batch = session.query(
+                    Paper.id, Paper.title, Paper.abstract, Paper.category, Paper.published_date
+                ).filter(Paper.id > last_id).order_by(Paper.id).limit(self.batch_size).all()
+                if not batch:
+                    break
+                processed += self._merge(session, batch)
+                last_id = batch[-1].id
+                watermark.last_paper_id = last_id
+                session.commit()
+
+            watermark.last_paper_id = last_id
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+        if token is not None:
+            token.raise_if_cancelled()
+        return processed
+
+    def _merge(self, session, papers: List) -> int:
+        """把一批论文的词频合并进数据库"""
+        counts, doc_freq = self.count_papers(papers)
+        if not counts:
+            return len(papers)
+
+        words = list(doc_freq)
+        terms = {t.word: t for t in session.query(Term).filter(Term.word.in_(words))}
+        for word in words:
+            term = terms.get(word)
+            if term is None:
+                term = Term(word=word, doc_freq=0)
+                session.add(term)
+                terms[word] = term
+            term.doc_freq = (term.doc_freq or 0) + doc_freq[word]
+        session.flush()
+
+        keys = {(category, period) for _, category, period in counts}
+        term_ids = [terms[w].id for w in words]
+        existing = {}
+        for category, period in keys:
+            for row in session.query(TermFrequency).filter(
+                TermFrequency.category == category,
+                TermFrequency.period == period,
+                TermFrequency.term_id.in_(term_ids)
+            ):
+                existing[(row.term_id, category, period)] = row
+
+        for (word, category, period), (count, doc_count) in counts.items():
+            term_id = terms[word].id
+            row = existing.get((term_id, category, period))
+            if row is None:
+                session.add(TermFrequency(term_id=term_id, category=category, period=period,
+                                          count=count, doc_count=doc_count))
+            else:
+                row.count += count
+                row.doc_count += doc_count
+        return len(papers)
+
+    def frequencies(self, categories: Optional[Iterable[str]] = None,
+                    periods: Optional[Iterable[str]] = None, top_n: int = 200) -> Dict[str, int]:
+        """按类别/月份筛选并汇总词频，返回前 top_n 个词"""
+        session = self.db_manager.Session()
+        try:
+            total = func.sum(TermFrequency.count).label('total')
+            query = session.query(Term.word, total).join(TermFrequency.term)
+            if categories is not None:
+                query = query.filter(TermFrequency.category.in_(list(categories)))
+            if periods is not None:
+                query = query.filter(TermFrequency.period.in_(list(periods)))
+            rows = query.group_by(Term.word).order_by(total.desc()).limit(top_n).all()
+            return {word: int(count) for word, count in rows}
+        finally:
+            session.close()
+
+    def paper_frequencies(self, papers: List, top_n: int = 200) -> Dict[str, int]:
+        """只统计给定论文的词频
+
+        给定论文正好是词频表中若干 (类别, 月份) 的全部论文时直接汇总词频表；
+        只是其中一部分（或尚未入库）时在内存中只对这些论文分词统计，不混入其他论文的词。
+        """
+        if papers and self._covers_cells(papers):
+            categories = {p.category or UNCATEGORIZED for p in papers}
+            periods = {paper_period(p.published_date) for p in papers}
+            return self.frequencies(categories=categories, periods=periods, top_n=top_n)
+        counts, _ = self.count_papers(papers)
+        totals = Counter()
+        for (word, _, _), (count, _) in counts.items():
+            totals[word] += count
+        return dict(totals.most_common(top_n))
+
+    def _covers_cells(self, papers: List) -> bool:
+        """给定论文是否恰好是其 (类别, 月份) 单元中的全部已统计论文"""
+        ids = {getattr(p, 'id', None) for p in papers}
+        if None in ids or len(ids) != len(papers):
+            return False
+        self.update()
+        cells = {(p.category or UNCATEGORIZED, paper_period(p.published_date)) for p in papers}
+        categories = {category for category, _ in cells}
+        session = self.db_manager.Session()
+        try:
+            condition = Paper.category.in_(categories)
+            if UNCATEGORIZED in categories:
+                condition = or_(condition, Paper.category.is_(None), Paper.category == '')
+            rows = session.query(Paper.id, Paper.category, Paper.published_date).filter(condition).yield_per(1000)
+            cell_ids = {
+                paper_id for paper_id, category, published_date in rows
+                if (category or UNCATEGORIZED, paper_period(published_date)) in cells
+            }
+        finally:
+            session.close()
+        return cell_ids == ids
+
+    def categories(self) -> List[str]:
+        """词频表中出现过的类别"""
+        session = self.db_manager.Session()
+        try:
+            return [c for c, in session.query(TermFrequency.category).distinct().order_by(TermFrequency.category)]
+        finally:
+            session.close()
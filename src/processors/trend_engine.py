@@ -0,0 +1,108 @@
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from scipy import sparse
+from sqlalchemy import func
+from ..models.database import Paper, Term, TermFrequency
+from .term_frequency import TermFrequencyStore, UNKNOWN_PERIOD
+
+class TrendEngine:
+    """研究趋势引擎
+
+    词表和文档频率持久化在 terms / term_frequencies 表中（由 TermFrequencyStore 增量维护），
+    每次运行只需对新增论文分词；趋势由相邻两个时间窗口的 TF-IDF 之差得到，全部用稀疏矩阵计算。
+    """
+
+    def __init__(self, store: TermFrequencyStore):
+        self.store = store
+        self.db_manager = store.db_manager
+
+    def period_matrix(self, categories: Optional[Iterable[str]] = None):
+        """返回 (月份列表, 词ID列表, 月份×词 的稀疏词频矩阵)"""
+        session = self.db_manager.Session()
+        try:
+            query = session.query(
+                TermFrequency.period, TermFrequency.term_id, func.sum(TermFrequency.count)
+            ).filter(TermFrequency.period != UNKNOWN_PERIOD)
+            if categories is not None:
+                query = query.filter(TermFrequency.category.in_(list(categories)))
+            rows = query.group_by(TermFrequency.period, TermFrequency.term_id).all()
+        finally:
+            session.close()
+
+        periods = sorted({row[0] for row in rows})
+        term_ids = sorted({row[1] for row in rows})
+        period_index = {p: i for i, p in enumerate(periods)}
+        term_index = {t: i for i, t in enumerate(term_ids)}
+        matrix = sparse.csr_matrix(
+            (
+                np.fromiter((row[2] for row in rows), dtype=np.float64, count=len(rows)),
+                (
+                    np.fromiter((period_index[row[0]] for row in rows), dtype=np.int64, count=len(rows)),
+                    np.fromiter((term_index[row[1]] for row in rows), dtype=np.int64, count=len(rows)),
+                ),
+            ),
+            shape=(len(periods), len(term_ids)),
+        )
+        return periods, term_ids, matrix
+
+    def _term_stats(self, term_ids: List[int]):
+        """按持久化的文档频率计算平滑IDF，返回 (IDF数组, 词ID -> 词)"""
+        session = self.db_manager.Session()
+        try:
+            total_docs = session.query(func.count(Paper.id)).scalar() or 0
+            terms = {t: (word, df) for t, word, df in session.query(Term.id, Term.word, Term.doc_freq)}
+        finally:
+            session.close()
+        df = np.array([(terms[t][1] or 0) if t in terms else 0 for t in term_ids], dtype=np.float64)
+        words = {t: terms[t][0] for t in term_ids if t in terms}
+        return np.log((1 + total_docs) / (1 + df)) + 1, words
+
+    def trends(self, window: int = 3, top_n: int = 20, min_count: int = 5,
+               categories: Optional[Iterable[str]] = None, end_period: Optional[str] = None) -> Dict:
+        """比较最近 window 个月与之前 window 个月的 TF-IDF，返回上升词和下降词
+
+        end_period 为当前窗口的最后一个月（YYYY-MM），默认取数据中最新的月份。
+        """
+        self.store.update()
+        periods, term_ids, matrix = self.period_matrix(categories)
+        if not periods:
+            return {"current": [], "previous": [], "emerging": [], "declining": []}
+
+        # 按自然月划分窗口（没有论文的月份也占位）
+        months = np.array(periods, dtype='datetime64[M]')
+        end = np.datetime64(end_period, 'M') if end_period else months.max()
+        current_start = end - window + 1
+        previous_start = current_start - window
+        in_current = (months >= current_start) & (months <= end)
+        in_previous = (months >= previous_start) & (months < current_start)
+
+        # 0/1 行向量与稀疏矩阵相乘即为窗口内各词的词频
+        current_counts = np.asarray(in_current.astype(np.float64) @ matrix).ravel()
+        previous_counts = np.asarray(in_previous.astype(np.float64) @ matrix).ravel()
+        idf, words = self._term_stats(term_ids)
+
+        def tfidf(counts: np.ndarray) -> np.ndarray:
+            total = counts.sum()
+            return counts / total * idf if total else np.zeros_like(counts)
+
+        delta = tfidf(current_counts) - tfidf(previous_counts)
+        eligible = (current_counts + previous_counts) >= min_count
+
+        def ranked(order: np.ndarray) -> List[Dict]:
+            return [{
+                "term": words.get(term_ids[i], ""),
+                "delta": float(delta[i]),
+                "current_count": int(current_counts[i]),
+                "previous_count": int(previous_counts[i]),
+            } for i in order[:top_n]]
+
+        ascending = np.argsort(delta)
+        descending = ascending[::-1]
+        emerging = descending[eligible[descending] & (delta[descending] > 0)]
+        declining = ascending[eligible[ascending] & (delta[ascending] < 0)]
+        return {
+            "current": [str(m) for m in np.arange(current_start, end + 1)],
+            "previous": [str(m) for m in np.arange(previous_start, current_start)],
+            "emerging": ranked(emerging),
+            "declining": ranked(declining),
+        }
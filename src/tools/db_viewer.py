@@ -7,8 +7,9 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from src.models.database import DatabaseManager, Paper, Author, Keyword
+from src.tools.related_papers import RelatedPapersMixin
 
-class DatabaseViewer(QMainWindow):
+class DatabaseViewer(RelatedPapersMixin, QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("论文数据库查询工具")
@@ -50,6 +51,7 @@ class DatabaseViewer(QMainWindow):
             "标题", "作者", "摘要", "发布日期", "来源", "类别", "DOI", "引用数"
         ])
         layout.addWidget(self.table)
+        self.init_related_menu(self.table)
         
         # 设置表格列宽
         self.table.setColumnWidth(0, 300)  # 标题
@@ -111,7 +113,9 @@ class DatabaseViewer(QMainWindow):
         
         for row, paper in enumerate(papers):
             # 标题
-            self.table.setItem(row, 0, QTableWidgetItem(paper.title))
+            title_item = QTableWidgetItem(paper.title)
+            title_item.setData(Qt.ItemDataRole.UserRole, paper.id)
+            self.table.setItem(row, 0, title_item)
             
             # 作者
             authors = [author.name for author in paper.authors]
@@ -10,8 +10,9 @@ from pathlib import Path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from src.models.database import DatabaseManager, Paper, Author, Keyword
+from src.tools.related_papers import RelatedPapersMixin
 
-class LocalPapersViewer(QMainWindow):
+class LocalPapersViewer(RelatedPapersMixin, QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("本地论文管理器")
@@ -88,6 +89,7 @@ class LocalPapersViewer(QMainWindow):
         header.setSectionResizeMode(7, QHeaderView.ResizeMode.Stretch)
         
         layout.addWidget(self.table)
+        self.init_related_menu(self.table)
         
         # 加载论文数据
         self.load_papers()
@@ -142,7 +144,9 @@ class LocalPapersViewer(QMainWindow):
         for row, paper in enumerate(papers):
             try:
                 # 标题
-                self.table.setItem(row, 0, QTableWidgetItem(paper.title))
+                title_item = QTableWidgetItem(paper.title)
+                title_item.setData(Qt.ItemDataRole.UserRole, paper.id)
+                self.table.setItem(row, 0, title_item)
                 
                 # 作者
                 authors = [author.name for author in paper.authors]
@@ -0,0 +1,105 @@
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QListWidget, QListWidgetItem, QDialogButtonBox,
+                           QMenu, QMessageBox)
+from PyQt6.QtCore import Qt, QThread, QUrl, pyqtSignal
+from PyQt6.QtGui import QDesktopServices
+
+from src.processors.analysis import PaperAnalyzer
+
+class RelatedPapersWorker(QThread):
+    """相似论文检索工作线程（首次检索要加载分析器并对整个文献库建向量索引）"""
+    related_ready = pyqtSignal(list)
+    failed = pyqtSignal(str)
+
+    def __init__(self, db_manager, paper_id, analyzer=None, k=10):
+        super().__init__()
+        self.db_manager = db_manager
+        self.paper_id = paper_id
+        self.analyzer = analyzer
+        self.k = k
+
+    def run(self):
+        """检索结果为 (标题, 作者, 链接, 相似度) 列表"""
+        try:
+            if self.analyzer is None:
+                self.analyzer = PaperAnalyzer(self.db_manager)
+            related = self.analyzer.related_papers(self.paper_id, self.k)
+            self.related_ready.emit([
+                (paper.title, ', '.join(author.name for author in paper.authors), paper.url, score)
+                for paper, score in related
+            ])
+        except Exception as e:
+            self.failed.emit(f"相似论文检索出错: {str(e)}")
+
+class RelatedPapersDialog(QDialog):
+    """相似论文列表，双击打开论文链接"""
+
+    def __init__(self, related, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("相似论文")
+        self.setMinimumSize(600, 400)
+        layout = QVBoxLayout(self)
+
+        related_list = QListWidget()
+        for title, authors, url, score in related:
+            item = QListWidgetItem(f"{score:.2f} | {title}\n作者: {authors}")
+            item.setData(Qt.ItemDataRole.UserRole, url)
+            related_list.addItem(item)
+        related_list.itemDoubleClicked.connect(self.open_paper)
+        layout.addWidget(related_list)
+
+        button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+
+    def open_paper(self, item):
+        """打开论文链接"""
+        url = item.data(Qt.ItemDataRole.UserRole)
+        if url:
+            QDesktopServices.openUrl(QUrl(url))
+
+class RelatedPapersMixin:
+    """查看器表格的“查找相似论文”右键菜单
+
+    表格第 0 列的单元格以 Qt.ItemDataRole.UserRole 保存论文ID；检索在后台线程中进行。
+    """
+
+    def init_related_menu(self, table):
+        """为表格启用右键菜单"""
+        self.analyzer = None
+        self.related_worker = None
+        table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        table.customContextMenuRequested.connect(lambda pos: self.show_table_context_menu(table, pos))
+
+    def show_table_context_menu(self, table, pos):
+        """表格右键菜单"""
+        item = table.item(table.rowAt(pos.y()), 0)
+        if item is None or item.data(Qt.ItemDataRole.UserRole) is None:
+            return
+        menu = QMenu(self)
+        related_action = menu.addAction("查找相似论文")
+        if menu.exec(table.viewport().mapToGlobal(pos)) == related_action:
+            self.show_related_papers(item.data(Qt.ItemDataRole.UserRole))
+
+    def show_related_papers(self, paper_id):
+        """在后台线程中查找与指定论文相似的论文"""
+        if self.related_worker is not None and self.related_worker.isRunning():
+            QMessageBox.information(self, "相似论文", "正在查找相似论文，请稍候")
+            return
+        self.related_worker = RelatedPapersWorker(self.db_manager, paper_id, self.analyzer)
+        self.related_worker.related_ready.connect(self.show_related_dialog)
+        self.related_worker.failed.connect(lambda message: QMessageBox.warning(self, "错误", message))
+        self.related_worker.start()
+
+    def show_related_dialog(self, related):
+        """显示相似论文列表（分析器留给下次检索复用）"""
+        self.analyzer = self.related_worker.analyzer
+        if not related:
+            QMessageBox.information(self, "相似论文", "文献库中没有找到相似的论文")
+            return
+        RelatedPapersDialog(related, self).exec()
+
+    def closeEvent(self, event):
+        """关闭窗口前等待检索线程结束"""
+        if self.related_worker is not None:
+            self.related_worker.wait()
+        super().closeEvent(event)
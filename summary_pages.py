@@ -0,0 +1,213 @@
+import html
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from string import Template
+from typing import Dict, List, Set, Tuple
+from urllib.parse import quote
+
+STYLESHEET_NAME = "summary.css"
+INDEX_NAME = "index.html"
+# 从已有摘要页的头部读出标题和来源，用于重建索引
+_PAGE_HEAD = re.compile(
+    r'<title>(?P<title>.*?)</title>\s*(?:<meta name="paper-source" content="(?P<source>[^"]*)">\s*)?'
+    rf'<link rel="stylesheet" href="{re.escape(STYLESHEET_NAME)}">',
+    re.S
+)
+
+# 所有摘要页共用的样式表，每个下载文件夹只写一份
+STYLESHEET = """body { font-family: "Microsoft YaHei", Arial, sans-serif; margin: 40px; background-color: #f5f5f5; }
+.container { background-color: white; padding: 30px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
+.paper-info { background: #f8f9fa; padding: 20px; border-radius: 5px; margin-bottom: 20px; }
+.chinese-summary { background-color: #fff8e1; padding: 20px; border-radius: 8px; margin: 20px 0; border-left: 4px solid #ffc107; }
+.summary-content { line-height: 1.8; }
+.abstract-text { background: #fff; padding: 15px; border-radius: 5px; margin-top: 10px; border: 1px solid #e0e0e0; }
+.audio-player { margin-top: 20px; padding: 15px; background: #e3f2fd; border-radius: 8px; text-align: center; }
+audio { width: 100%; margin-top: 10px; }
+.link { margin: 20px 0; text-align: center; }
+.link a { color: #0066cc; text-decoration: none; background-color: #e3f2fd; padding: 10px 20px; border-radius: 5px; display: inline-block; transition: all 0.3s; }
+.link a:hover { background-color: #bbdefb; transform: translateY(-2px); }
+h1 { color: #333; border-bottom: 2px solid #0066cc; padding-bottom: 10px; }
+h2 { color: #5d4037; margin-top: 0; }
+h3 { color: #1976d2; margin-top: 0; }
+.meta { color: #666; margin: 5px 0; }
+.footer { text-align: center; color: #888; font-size: 12px; margin-top: 30px; }
+.index li { margin: 6px 0; }
+"""
+
+PAGE_TEMPLATE = Template("""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>$title</title>
+    <meta name="paper-source" content="$source_name">
+    <link rel="stylesheet" href="$stylesheet">
+</head>
+<body>
+    <div class="container">
+        <h1>📄 论文信息</h1>
+        <div class="chinese-summary">
+            <h2>📑 论文中文摘要</h2>
+            <div class="summary-content">
+                <p><strong>📌 论文标题：</strong>$title</p>
+                <p><strong>👥 作者信息：</strong>$authors</p>
+                <p><strong>📅 发表时间：</strong>$published</p>
+                <p><strong>📚 发表来源：</strong>$source</p>
+                $citations
+                <p><strong>📝 内容概要：</strong></p>
+                <div class="abstract-text">$abstract</div>
+                <div class="audio-player">
+                    <h3>🎧 语音朗读</h3>
+                    <audio controls>
+                        <source src="$audio" type="$audio_type">
+                        您的浏览器不支持音频播放。
+                    </audio>
+                    <p class="audio-note">注：如果音频无法播放，请直接打开同目录下的 $audio_name 文件收听。</p>
+                </div>
+            </div>
+        </div>
+        <div class="link">
+            <h3>🔗 访问原文:</h3>
+            <a href="$url" target="_blank">点击访问原文 →</a>
+        </div>
+        <div class="footer">
+            <p>📄 由机器视觉文献获取系统生成</p>
+            <p>🕒 生成时间: $generated</p>
+        </div>
+    </div>
+</body>
+</html>
+""")
+
+INDEX_TEMPLATE = Template("""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>论文摘要索引</title>
+    <link rel="stylesheet" href="$stylesheet">
+</head>
+<body>
+    <div class="container index">
+        <h1>📚 论文摘要索引（$total 篇）</h1>
+$sections
+        <div class="footer"><p>🕒 生成时间: $generated</p></div>
+    </div>
+</body>
+</html>
+""")
+
+class SummaryPageWriter:
+    """论文摘要页生成器
+
+    页面由预编译模板填充（所有字段转义），样式放在每个下载文件夹的 summary.css 中，
+    页面先缓存在内存里按批写出；finish() 写出剩余页面并在下载根目录生成索引页。
+    索引包含下载目录中的所有摘要页（包括之前运行生成的），不只是本次运行加入的。
+    """
+
+    def __init__(self, root: str, batch_size: int = 100):
+        self.root = Path(root)
+        self.batch_size = batch_size
+        self._pending: List[Tuple[Path, str]] = []
+        self._styled: Set[Path] = set()
+        self._entries: Dict[Path, Tuple[str, str]] = {}
+
+    def render(self, paper: Dict, audio_filename: str, audio_type: str, stylesheet: str = STYLESHEET_NAME) -> str:
+        """生成单篇论文的摘要页"""
+        source = paper.get('source', '未知来源')
+        if paper.get('venue'):
+            source = f"{source}, {paper['venue']}"
+        citations = paper.get('citations')
+        return PAGE_TEMPLATE.substitute(
+            title=html.escape(paper['title']),
+            authors=html.escape(paper.get('authors') or '未知作者'),
+            published=html.escape(str(paper.get('published', '未知日期'))),
+            source=html.escape(source),
+            source_name=html.escape(paper.get('source', '未知来源'), quote=True),
+            citations=f"<p><strong>📊 引用次数：</strong>{int(citations)}次</p>" if citations is not None else "",
+            abstract=html.escape(paper.get('abstract') or '暂无摘要信息。'),
+            audio=quote(audio_filename),
+            audio_type=audio_type,
+            audio_name=html.escape(audio_filename),
+            url=html.escape(paper.get('web_url') or paper.get('url') or paper.get('pdf_url') or '', quote=True),
+            stylesheet=stylesheet,
+            generated=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        )
+
+    def add(self, path: Path, paper: Dict, audio_filename: str, audio_type: str) -> str:
+        """加入一篇摘要页（满一批时写出），返回页面路径"""
+        path = Path(path)
+        self._entries[path] = (paper['title'], paper.get('source', '未知来源'))
+        if not path.exists():
+            self._pending.append((path, self.render(paper, audio_filename, audio_type)))
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+        return str(path)
+
+    def _ensure_stylesheet(self, folder: Path):
+        if folder not in self._styled:
+            stylesheet = folder / STYLESHEET_NAME
+            if not stylesheet.exists():
+                folder.mkdir(parents=True, exist_ok=True)
+                stylesheet.write_text(STYLESHEET, encoding='utf-8')
+            self._styled.add(folder)
+
+    def flush(self):
+        """写出缓存的页面"""
+        for path, content in self._pending:
+            self._ensure_stylesheet(path.parent)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content)
+        self._pending = []
+
+    def scan_pages(self) -> Dict[Path, Tuple[str, str]]:
+        """扫描下载目录中已有的摘要页，返回 页面路径 -> (标题, 来源)
+
+        来源取页面中记录的数据源，没有记录的旧页面取所在文件夹名。
+        """
+        pages = {}
+        index_path = self.root / INDEX_NAME
+        for path in self.root.rglob("*.html"):
+            if path == index_path:
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                    head = f.read(4096)
+            except OSError:
+                continue
+            match = _PAGE_HEAD.search(head)
+            if match is None:
+                continue  # 不是摘要页
+            source = match.group('source')
+            source = html.unescape(source) if source is not None else path.parent.name
+            pages[path] = (html.unescape(match.group('title')), source)
+        return pages
+
+    def write_index(self) -> str:
+        """在下载根目录生成链接所有摘要页的索引（本次加入的和目录中已有的），按来源分组"""
+        self._ensure_stylesheet(self.root)
+        entries = self.scan_pages()
+        entries.update(self._entries)
+        groups: Dict[str, List[str]] = {}
+        for path, (title, source) in sorted(entries.items(), key=lambda e: (e[1][1], e[1][0])):
+            href = quote(os.path.relpath(path, self.root).replace(os.sep, '/'))
+            groups.setdefault(source, []).append(f'<li><a href="{href}">{html.escape(title)}</a></li>')
+        sections = "\n".join(
+            f"        <h2>{html.escape(source)}（{len(items)} 篇）</h2>\n        <ul>\n            "
+            + "\n            ".join(items) + "\n        </ul>"
+            for source, items in groups.items()
+        )
+        index_path = self.root / INDEX_NAME
+        with open(index_path, 'w', encoding='utf-8') as f:
+            f.write(INDEX_TEMPLATE.substitute(
+                stylesheet=STYLESHEET_NAME,
+                total=len(entries),
+                sections=sections,
+                generated=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            ))
+        return str(index_path)
+
+    def finish(self) -> str:
+        """写出剩余页面和索引页，返回索引页路径"""
+        self.flush()
+        return self.write_index()
@@ -0,0 +1,54 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from src.crawlers.arxiv_paginator import ArxivPaginator, submitted_date_filter
+
+class FakeClient:
+    """按提交时间倒序逐条产出结果的同步客户端，记录实际请求的页数"""
+
+    page_size = 10
+
+    def __init__(self, count):
+        self.start = datetime(2024, 3, 1, tzinfo=timezone.utc)
+        self.count = count
+        self.requests = 0
+
+    def results(self, search):
+        for i in range(self.count):
+            if i % self.page_size == 0:
+                self.requests += 1
+            yield SimpleNamespace(title=f"paper {i}", published=self.start - timedelta(days=i))
+
+def test_paginator_filters_window_and_stops_early():
+    """测试只产出时间窗口内的结果，遇到早于 from_date 的结果后不再继续翻页"""
+    client = FakeClient(1000)
+    paginator = ArxivPaginator(client)
+    to_date = datetime(2024, 2, 25, tzinfo=timezone.utc)
+    from_date = datetime(2024, 2, 10, tzinfo=timezone.utc)
+
+    async def collect():
+        return [r async for r in paginator.results(None, from_date, to_date)]
+
+    results = asyncio.run(collect())
+    assert [r.title for r in results] == [f"paper {i}" for i in range(5, 21)]
+    # 第 3 页发现过期结果，最多再预取 1 页
+    assert paginator.pages_fetched == 3
+    assert client.requests <= 4
+
+def test_paginator_short_last_page_and_date_filter():
+    """测试最后一页不满时结束，查询中的日期范围按 UTC 格式化"""
+    client = FakeClient(25)
+    paginator = ArxivPaginator(client)
+
+    async def collect():
+        return [r async for r in paginator.results(None)]
+
+    assert len(asyncio.run(collect())) == 25
+    assert paginator.pages_fetched == 3
+    window = submitted_date_filter(datetime(2024, 1, 1, tzinfo=timezone.utc),
+                                   datetime(2024, 1, 31, 12, 30, tzinfo=timezone.utc))
+    assert window == "submittedDate:[202401010000 TO 202401311230]"
@@ -0,0 +1,69 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime
+from src.models.database import DatabaseManager, Author, CanonicalAuthor
+from src.models.author_index import (
+    split_author_names, normalize_author_name, author_blocking_key, names_compatible
+)
+
+def make_paper(title, authors, category='cs.CV'):
+    """构造测试论文数据"""
+    return {
+        'title': title,
+        'authors': authors,
+        'abstract': f'Abstract of {title}',
+        'published_date': datetime(2023, 1, 1),
+        'source': 'arxiv',
+        'category': category,
+    }
+
+def test_name_normalization():
+    """测试作者名拆分与规范化"""
+    assert split_author_names("John Smith, Mary Johnson, 未知作者") == ["John Smith", "Mary Johnson"]
+    assert split_author_names(["A. B. Chen", " "]) == ["A. B. Chen"]
+    assert normalize_author_name("José  Álvarez") == "jose alvarez"
+    assert normalize_author_name("Smith, John") == "john smith"
+    assert author_blocking_key("john smith") == author_blocking_key("j smith") == "smith_j"
+    assert names_compatible("j smith", "john smith")
+    assert names_compatible("john a smith", "john smith")
+    assert not names_compatible("john smith", "jane smith")
+
+def test_add_paper_reuses_normalized_authors():
+    """测试写入论文时同名变体复用同一作者记录"""
+    db_manager = DatabaseManager('sqlite://')
+    db_manager.add_paper(make_paper('Paper A', ['John Smith', 'Mary Johnson']))
+    db_manager.add_paper(make_paper('Paper B', 'john  smith, David Brown'))
+
+    session = db_manager.Session()
+    try:
+        assert session.query(Author).count() == 3
+    finally:
+        session.close()
+
+    papers = db_manager.get_papers_by_author('JOHN SMITH')
+    assert sorted(p.title for p in papers) == ['Paper A', 'Paper B']
+
+def test_disambiguation_merges_variants_with_shared_coauthors():
+    """测试批量消歧按合作者和类别重合合并名字变体"""
+    db_manager = DatabaseManager('sqlite://')
+    db_manager.add_paper(make_paper('Paper A', ['John Smith', 'Mary Johnson', 'David Brown']))
+    db_manager.add_paper(make_paper('Paper B', ['J. Smith', 'Mary Johnson', 'David Brown']))
+    db_manager.add_paper(make_paper('Paper C', ['Jane Smith', 'Mary Johnson', 'David Brown']))
+
+    merged = db_manager.disambiguate_authors()
+    assert merged == 1
+
+    canonical = db_manager.get_canonical_author('J. Smith')
+    assert canonical is not None
+    assert canonical.name == 'John Smith'
+    assert db_manager.get_canonical_author('John Smith').id == canonical.id
+    # 名字不相容的 Jane Smith 不会被合并
+    assert db_manager.get_canonical_author('Jane Smith').id != canonical.id
+
+    session = db_manager.Session()
+    try:
+        assert session.query(CanonicalAuthor).count() == 4
+    finally:
+        session.close()
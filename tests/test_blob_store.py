@@ -0,0 +1,79 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hashlib
+from blob_store import BlobStore
+from models import Blob, BlobLink, init_db
+
+def make_store(tmp_path):
+    return BlobStore(tmp_path / ".blobs", init_db(f"sqlite:///{tmp_path / 'blobs.db'}"))
+
+def incoming(store, url, content):
+    path = store.incoming_path(url)
+    path.write_bytes(content)
+    return path
+
+def test_same_content_stored_once(tmp_path):
+    """测试相同内容只保存一份，多个可读路径链接到同一对象"""
+    store = make_store(tmp_path)
+    content = b"%PDF-same"
+    first = store.put(incoming(store, "http://a/1.pdf", content), tmp_path / "arxiv" / "A.pdf", "http://a/1.pdf")
+    second = store.put(incoming(store, "http://b/2.pdf", content), tmp_path / "ieee" / "A copy.pdf", "http://b/2.pdf")
+    sha256 = hashlib.sha256(content).hexdigest()
+    objects = [p for p in (tmp_path / ".blobs" / "objects").rglob("*") if p.is_file()]
+    assert objects == [store.object_path(sha256)]
+    assert os.path.samefile(first, store.object_path(sha256)) and os.path.samefile(second, first)
+    assert not list((tmp_path / ".blobs" / "incoming").iterdir())
+    assert store.session.query(Blob).count() == 1
+    assert store.session.query(BlobLink).count() == 2
+
+    # 同一路径再次保存相同内容，不追加后缀也不新增映射
+    again = store.put(incoming(store, "http://a/1.pdf", content), tmp_path / "arxiv" / "A.pdf")
+    assert again == first
+    assert store.session.query(BlobLink).count() == 2
+    store.close()
+
+def test_title_collision_gets_hash_suffix(tmp_path):
+    """测试标题重名的不同内容在文件名后追加哈希前 8 位"""
+    store = make_store(tmp_path)
+    path = tmp_path / "arxiv" / "Paper.pdf"
+    first = store.put(incoming(store, "http://a/1.pdf", b"%PDF-one"), path, "http://a/1.pdf")
+    second = store.put(incoming(store, "http://a/2.pdf", b"%PDF-two"), path, "http://a/2.pdf")
+    suffix = hashlib.sha256(b"%PDF-two").hexdigest()[:8]
+    assert first == str(path)
+    assert second == str(tmp_path / "arxiv" / f"Paper_{suffix}.pdf")
+    assert open(first, "rb").read() == b"%PDF-one" and open(second, "rb").read() == b"%PDF-two"
+    store.close()
+
+def test_unmapped_existing_file(tmp_path):
+    """测试建立映射前已存在的文件：内容相同换成链接，内容不同视为重名"""
+    store = make_store(tmp_path)
+    same = tmp_path / "arxiv" / "Same.pdf"
+    same.parent.mkdir(parents=True)
+    same.write_bytes(b"%PDF-same")
+    assert store.put(incoming(store, "http://a/1.pdf", b"%PDF-same"), same) == str(same)
+    assert os.path.samefile(same, store.object_path(hashlib.sha256(b"%PDF-same").hexdigest()))
+
+    other = tmp_path / "arxiv" / "Other.pdf"
+    other.write_bytes(b"%PDF-user file")
+    stored = store.put(incoming(store, "http://a/2.pdf", b"%PDF-new"), other)
+    assert stored != str(other) and open(other, "rb").read() == b"%PDF-user file"
+    store.close()
+
+def test_path_for_url_relinks_deleted_files(tmp_path):
+    """测试可读路径被删除后按URL重新链接，内容也被删除时返回 None"""
+    store = make_store(tmp_path)
+    url = "http://a/1.pdf"
+    path = store.put(incoming(store, url, b"%PDF-content"), tmp_path / "arxiv" / "A.pdf", url)
+    assert store.path_for_url(url) == path
+    assert store.path_for_url("http://unknown") is None
+
+    os.remove(path)
+    assert store.path_for_url(url) == path
+    assert open(path, "rb").read() == b"%PDF-content"
+
+    os.remove(path)
+    os.remove(store.object_path(hashlib.sha256(b"%PDF-content").hexdigest()))
+    assert store.path_for_url(url) is None
+    store.close()
@@ -0,0 +1,43 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from src.models.database import DatabaseManager
+from src.crawlers.cancellation import CancellationToken, OperationCancelled
+from src.processors.term_frequency import TermFrequencyStore
+
+def test_token_callbacks_and_sleep():
+    """测试取消回调只执行一次，已取消时注册的回调立即执行"""
+    token = CancellationToken()
+    calls = []
+    unregister = token.register(lambda: calls.append("a"))
+    token.register(lambda: calls.append("b"))
+    unregister()
+    token.cancel()
+    token.cancel()
+    assert calls == ["b"]
+    token.register(lambda: calls.append("c"))
+    assert calls == ["b", "c"]
+    with pytest.raises(OperationCancelled):
+        token.sleep(10)
+
+def test_term_frequency_update_resumes_after_cancel():
+    """测试词频更新在批次之间停下，已提交的批次不会重复处理"""
+    db_manager = DatabaseManager('sqlite://')
+    for i in range(5):
+        db_manager.add_paper({'title': f'vision paper {i}', 'authors': ['John Smith'], 'abstract': 'camera'})
+    store = TermFrequencyStore(db_manager, batch_size=2)
+
+    token = CancellationToken()
+    merge = store._merge
+    def merge_then_cancel(session, batch):
+        token.cancel()
+        return merge(session, batch)
+    store._merge = merge_then_cancel
+    with pytest.raises(OperationCancelled):
+        store.update(token)
+
+    store._merge = merge
+    assert store.update() == 3
+    assert store.update() == 0
@@ -0,0 +1,55 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from src.models.database import DatabaseManager
+from src.crawlers.cancellation import CancellationToken, OperationCancelled
+from src.processors.classifier import PaperClassifier
+
+def add_papers(db_manager, category, words, count):
+    for i in range(count):
+        db_manager.add_paper({'title': f'{words} study {category} {i}', 'abstract': words,
+                              'category': category, 'authors': ['John Smith']})
+
+def test_train_incremental_and_predict(tmp_path):
+    """测试全量训练、增量训练只处理新论文，出现新类别时从头重训"""
+    db_manager = DatabaseManager('sqlite://')
+    add_papers(db_manager, 'detection', 'object detection bounding box', 3)
+    add_papers(db_manager, 'segmentation', 'semantic segmentation pixel mask', 3)
+    classifier = PaperClassifier(str(tmp_path / 'model.joblib'), batch_size=2)
+    assert classifier.train(db_manager) == 6
+    assert classifier.predict(['bounding box detection', 'pixel mask segmentation']) == ['detection', 'segmentation']
+
+    add_papers(db_manager, 'detection', 'object detection anchors', 1)
+    assert classifier.train(db_manager) == 1
+    add_papers(db_manager, 'tracking', 'multi object tracking trajectories', 2)
+    assert classifier.train(db_manager) == 9
+    assert set(classifier.model.classes_) == {'detection', 'segmentation', 'tracking'}
+
+    reloaded = PaperClassifier(str(tmp_path / 'model.joblib'))
+    assert reloaded.predict(['pixel mask segmentation']) == ['segmentation']
+
+def test_cancel_before_first_batch_keeps_previous_model(tmp_path):
+    """测试重训在第一批之前被取消时保留旧模型，水位线不回退"""
+    db_manager = DatabaseManager('sqlite://')
+    add_papers(db_manager, 'detection', 'object detection bounding box', 2)
+    add_papers(db_manager, 'segmentation', 'semantic segmentation pixel mask', 2)
+    classifier = PaperClassifier(str(tmp_path / 'model.joblib'))
+    classifier.train(db_manager)
+    previous = classifier.model
+
+    add_papers(db_manager, 'tracking', 'multi object tracking trajectories', 2)
+    token = CancellationToken()
+    token.cancel()
+    with pytest.raises(OperationCancelled):
+        classifier.train(db_manager, token=token)
+    assert classifier.model is previous
+    assert classifier.predict(['pixel mask segmentation']) == ['segmentation']
+
+    # 没有旧模型时取消，分类器仍为未训练状态
+    untrained = PaperClassifier(str(tmp_path / 'other.joblib'))
+    with pytest.raises(OperationCancelled):
+        untrained.train(db_manager, token=token)
+    assert not untrained.is_trained
+    assert untrained.predict(['pixel mask']) == [None]
@@ -0,0 +1,33 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.processors.clustering import cluster_texts, suggest_cluster_count
+
+def test_cluster_texts_groups_topics():
+    """测试按主题分组，成员覆盖全部结果，簇标签取自主题词"""
+    texts = ([f"semantic segmentation pixel mask {i}" for i in range(6)] +
+             [f"stereo depth disparity estimation {i}" for i in range(4)])
+    clusters = cluster_texts(texts, n_clusters=2)
+    assert [len(c.members) for c in clusters] == [6, 4]
+    assert sorted(i for c in clusters for i in c.members) == list(range(10))
+    assert set(clusters[0].members) == set(range(6))
+    assert set(clusters[1].members) == set(range(6, 10))
+    assert "segmentation" in clusters[0].label and "depth" in clusters[1].label
+    assert len(clusters[0].representatives) == 3
+    assert set(clusters[0].representatives) <= set(clusters[0].members)
+
+def test_cluster_texts_degenerate_inputs():
+    """测试结果过少或全是停用词时返回单个簇"""
+    assert cluster_texts([]) == [("全部结果", [], [])]
+    assert cluster_texts(["only one"]) == [("全部结果", [0], [0])]
+    single = cluster_texts(["the", "and", "of", "a"])
+    assert len(single) == 1 and single[0].members == [0, 1, 2, 3] and single[0].representatives == [0, 1, 2]
+    # 簇数不超过结果数
+    assert sum(len(c.members) for c in cluster_texts(["camera lens", "lidar scan"], n_clusters=5)) == 2
+
+def test_suggest_cluster_count():
+    """测试簇数估计的上下限"""
+    assert suggest_cluster_count(2) == 2
+    assert suggest_cluster_count(200) == 10
+    assert suggest_cluster_count(10 ** 6) == 30
@@ -0,0 +1,110 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+from datetime import datetime
+from src.models.database import DatabaseManager
+from src.crawlers.base_crawler import BaseCrawler, Paper
+from src.crawlers.runtime import CrawlerRuntime
+from src.crawlers.file_writer import AsyncFileWriter
+
+class SlowCrawler(BaseCrawler):
+    """模拟下载耗时的爬虫，记录同时进行的下载数"""
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.active = 0
+        self.peak = 0
+
+    async def search(self, keyword, from_date, to_date):
+        return []
+
+    async def download_paper(self, paper, save_path):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return True
+
+    async def get_paper_details(self, paper):
+        return paper
+
+def make_paper(i):
+    return Paper(title=f"paper {i}", authors=["John Smith"], abstract="camera", url=f"http://x/{i}",
+                 pdf_url=f"http://x/{i}.pdf", published_date=datetime(2024, 1, 1), source="arxiv",
+                 keywords=["vision"])
+
+def test_runtime_limits_concurrency_and_stores_results(tmp_path):
+    """测试并发数受 max_concurrent 限制，结果按顺序返回并写入数据库（重复标题不重复入库）"""
+    config = {"download": {"max_concurrent": 3}}
+    db_manager = DatabaseManager(f"sqlite:///{tmp_path / 'papers.db'}")
+    crawler = SlowCrawler(config)
+    papers = [make_paper(i) for i in range(10)] + [make_paper(0)]
+    progress = []
+
+    async def run():
+        async with CrawlerRuntime(config, db_manager) as runtime:
+            runtime.attach("arxiv", crawler)
+            assert crawler.session is runtime.session("arxiv")
+            results = await runtime.process_all(crawler, papers, lambda p: str(tmp_path),
+                                                lambda done, total: progress.append(done))
+        assert crawler.session.closed
+        return runtime, results
+
+    runtime, results = asyncio.run(run())
+    assert [p.title for p in results] == [p.title for p in papers]
+    assert crawler.peak == 3
+    assert progress == list(range(1, 12))
+    assert runtime.stored == 10
+    assert db_manager.get_paper_by_title("paper 7") is not None
+
+class FlakyCrawler(SlowCrawler):
+    """部分论文下载失败的爬虫"""
+
+    async def download_paper(self, paper, save_path):
+        return not paper.title.endswith("3")
+
+def test_runtime_reports_download_and_store_failures(tmp_path):
+    """测试下载失败和入库失败的论文都记入 failed，下载失败的不入库，数据不完整的记入 rejected"""
+    config = {"download": {"max_concurrent": 3}}
+    db_manager = DatabaseManager(f"sqlite:///{tmp_path / 'papers.db'}")
+    add_paper = db_manager.add_paper
+
+    def failing_add(paper_data):
+        if paper_data["title"] == "paper 5":
+            raise RuntimeError("disk full")
+        return add_paper(paper_data)
+
+    db_manager.add_paper = failing_add
+    papers = [make_paper(i) for i in range(6)]
+    papers.append(Paper(**{**make_paper(6).__dict__, "authors": []}))
+
+    async def run():
+        async with CrawlerRuntime(config, db_manager) as runtime:
+            results = await runtime.process_all(FlakyCrawler(config), papers, lambda p: str(tmp_path))
+        return runtime, results
+
+    runtime, results = asyncio.run(run())
+    assert results[3] is None
+    assert sorted(p.title for p in runtime.failed) == ["paper 3", "paper 5"]
+    assert [p.title for p in runtime.rejected] == ["paper 6"]
+    assert runtime.stored == 4
+    assert db_manager.get_paper_by_title("paper 3") is None
+
+def test_async_file_writer_batches_and_appends(tmp_path):
+    """测试写入线程按批写出全部数据，追加模式从文件末尾续写"""
+    path = tmp_path / "paper.pdf.part"
+    chunks = [bytes([i % 256]) * (1000 + i) for i in range(300)]
+
+    async def run():
+        async with AsyncFileWriter(path, buffer_size=16384) as writer:
+            for chunk in chunks[:200]:
+                await writer.write(chunk)
+        async with AsyncFileWriter(path, append=True, buffer_size=16384) as writer:
+            assert writer.offset == sum(len(c) for c in chunks[:200])
+            for chunk in chunks[200:]:
+                await writer.write(chunk)
+
+    asyncio.run(run())
+    assert path.read_bytes() == b"".join(chunks)
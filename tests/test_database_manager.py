@@ -0,0 +1,27 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database_manager import DatabaseManager
+from src.models.database import DatabaseManager as CrawlerDatabaseManager
+
+def test_paper_summaries_on_gui_schema(tmp_path):
+    """测试界面表结构（papers.authors 列）按ID读取标题、作者和链接"""
+    db_manager = DatabaseManager(f"sqlite:///{tmp_path / 'gui.db'}")
+    paper = db_manager.add_paper({"title": "Stereo Matching", "authors": "A. Li, B. Wang", "url": "http://a/1"})
+    assert db_manager.paper_summaries([paper.id, 999]) == {paper.id: ("Stereo Matching", "A. Li, B. Wang", "http://a/1")}
+    assert db_manager.paper_summaries([]) == {}
+
+def test_paper_summaries_on_crawler_schema(tmp_path):
+    """测试 src 表结构（papers.db 使用的表结构）从 paper_authors 关联表汇总作者"""
+    url = f"sqlite:///{tmp_path / 'papers.db'}"
+    crawler_db = CrawlerDatabaseManager(url)
+    crawler_db.add_paper({"title": "Depth Estimation", "authors": ["A. Li", "B. Wang"], "url": "http://a/1"})
+    crawler_db.add_paper({"title": "No Authors", "authors": [], "url": "http://a/2"})
+
+    db_manager = DatabaseManager(url)
+    summaries = db_manager.paper_summaries([1, 2])
+    assert summaries[2] == ("No Authors", "", "http://a/2")
+    title, authors, link = summaries[1]
+    assert (title, link) == ("Depth Estimation", "http://a/1")
+    assert sorted(authors.split(", ")) == ["A. Li", "B. Wang"]
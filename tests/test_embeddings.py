@@ -0,0 +1,99 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from src.processors.embeddings import EmbeddingIndex
+
+TOPICS = {
+    "detection": "object detection bounding box anchor",
+    "segmentation": "semantic segmentation pixel mask",
+    "depth": "stereo depth estimation disparity",
+}
+
+def corpus(count):
+    """按主题轮流生成的 (论文ID, 文本)"""
+    names = list(TOPICS)
+    return [(i + 1, f"{TOPICS[names[i % 3]]} paper{i}") for i in range(count)]
+
+def source(rows):
+    return lambda after_id: [(pid, text) for pid, text in rows if pid > after_id]
+
+def test_build_and_related(tmp_path):
+    """测试建索引后相似论文为同主题论文，索引可从磁盘重新打开"""
+    index = EmbeddingIndex(str(tmp_path), dim=8)
+    index.build(corpus(12))
+    assert len(index) == 12 and index.fitted_count == 12
+    related = index.related(1, k=3)
+    assert [pid for pid, _ in related] and all((pid - 1) % 3 == 0 for pid, _ in related)
+    assert all(score > 0.5 for _, score in related)
+    assert 1 not in {pid for pid, _ in related}
+    assert index.related(999) == []
+    assert index.search_text("pixel mask segmentation", k=1)[0][0] % 3 == 2
+
+    reopened = EmbeddingIndex(str(tmp_path), dim=8)
+    assert len(reopened) == 12 and reopened.dim == index.dim
+    assert reopened.related(1, k=3) == related
+
+def test_sync_refits_when_corpus_grows(tmp_path):
+    """测试论文数增长到 refit_ratio 倍时重新拟合，新论文不会被嵌入为零向量"""
+    rows = corpus(30)
+    index = EmbeddingIndex(str(tmp_path), dim=8, refit_ratio=1.5)
+    assert index.sync(source(rows[:3])) == 3
+    assert index.dim == 2
+
+    assert index.sync(source(rows)) == 27
+    assert index.fitted_count == 30 and index.dim == 8
+    assert np.all(np.linalg.norm(np.asarray(index.vectors), axis=1) > 0.99)
+    assert all((pid - 30) % 3 == 0 for pid, _ in index.related(30, k=3))
+    assert index.sync(source(rows)) == 0
+
+    # 增长不足 refit_ratio 且没有新词时只追加
+    more = rows + [(31, TOPICS["depth"] + " paper0")]
+    assert index.sync(source(more)) == 1
+    assert index.fitted_count == 30 and len(index) == 31
+
+def test_sync_refits_on_new_vocabulary(tmp_path):
+    """测试新论文带来大量新词时重新拟合"""
+    rows = corpus(30)
+    index = EmbeddingIndex(str(tmp_path), dim=8, refit_ratio=1.5)
+    index.sync(source(rows))
+    vocabulary = len(index.model[0].vocabulary_)
+    novel = " ".join(f"term{i}x" for i in range(vocabulary))
+    assert index.sync(source(rows + [(31, novel)])) == 1
+    assert index.fitted_count == 31
+
+def test_too_few_papers(tmp_path):
+    """测试论文或特征词少于 2 个时不建索引也不抛异常"""
+    index = EmbeddingIndex(str(tmp_path), dim=8)
+    assert index.sync(source([(1, "camera calibration")])) == 0
+    assert index.model is None and len(index) == 0
+    assert index.related(1) == [] and index.search_text("camera") == []
+    assert index.sync(source([(1, "the"), (2, "and")])) == 0
+    assert index.sync(source([(1, "camera calibration"), (2, "lidar odometry")])) == 2
+    assert index.model is not None
+
+def test_rebuild_and_clear_release_mapped_vectors(tmp_path, monkeypatch):
+    """测试重建和清空索引前先关闭向量文件的映射（Windows 上映射中的文件不能截断或删除）"""
+    index = EmbeddingIndex(str(tmp_path), dim=8)
+    index.build(corpus(12))
+    assert isinstance(index.vectors, np.memmap)
+    vectors_path = tmp_path / EmbeddingIndex.VECTORS
+    write_bytes, unlink = type(vectors_path).write_bytes, type(vectors_path).unlink
+
+    def checked_write_bytes(path, data):
+        if path == vectors_path:
+            assert not isinstance(index.vectors, np.memmap)
+        return write_bytes(path, data)
+
+    def checked_unlink(path, missing_ok=False):
+        if path == vectors_path:
+            assert not isinstance(index.vectors, np.memmap)
+        return unlink(path, missing_ok=missing_ok)
+
+    monkeypatch.setattr(type(vectors_path), "write_bytes", checked_write_bytes)
+    monkeypatch.setattr(type(vectors_path), "unlink", checked_unlink)
+    index.build(corpus(15))
+    assert len(index) == 15 and isinstance(index.vectors, np.memmap)
+    index.clear()
+    assert not vectors_path.exists() and len(index) == 0
@@ -0,0 +1,41 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+from src.processors.graph_layout import LayoutService
+
+EDGES = [("a", "b"), ("b", "c"), ("c", "d"), ("d", "a"), ("a", "c")]
+
+def test_layout_reused_for_unchanged_graph(tmp_path):
+    """测试布局持久化到 JSON，图未变化时直接复用已保存的坐标"""
+    store = tmp_path / "layout.json"
+    first = LayoutService(str(store)).layout(EDGES)
+    assert set(first) == {"a", "b", "c", "d"}
+    saved = json.loads(store.read_text(encoding="utf-8"))
+    assert {node: tuple(xy) for node, xy in saved.items()} == first
+
+    # 新的服务实例从文件读取，坐标完全一致
+    assert LayoutService(str(store)).layout(EDGES) == first
+
+def test_layout_recomputed_after_change(tmp_path):
+    """测试图变化后只布局新节点，已有节点保持原位，暂时不在图中的节点坐标仍保留"""
+    store = tmp_path / "layout.json"
+    service = LayoutService(str(store))
+    first = service.layout(EDGES)
+
+    second = service.layout(EDGES + [("d", "e"), ("e", "f")])
+    assert set(second) == {"a", "b", "c", "d", "e", "f"}
+    assert all(second[node] == first[node] for node in first)
+    assert second["e"] != second["f"]
+
+    third = service.layout([("a", "b")])
+    assert third == {"a": first["a"], "b": first["b"]}
+    assert set(service.load()) == {"a", "b", "c", "d", "e", "f"}
+
+def test_empty_and_unreadable_store(tmp_path):
+    """测试空图返回空布局，损坏的布局文件被忽略并重新计算"""
+    store = tmp_path / "layout.json"
+    assert LayoutService(str(store)).layout([]) == {}
+    store.write_text("not json", encoding="utf-8")
+    assert set(LayoutService(str(store)).layout(EDGES)) == {"a", "b", "c", "d"}
@@ -0,0 +1,146 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from src.models.database import DatabaseManager
+from src.crawlers.base_crawler import BaseCrawler, Paper
+from src.harvester import Harvester, HarvestScheduler, load_jobs
+from src.cli import build_parser, select_jobs
+
+class StaticCrawler(BaseCrawler):
+    """返回预设论文的爬虫"""
+
+    papers = []
+    searches = 0
+    broken = set()  # 下载失败的论文标题
+
+    async def search(self, keyword, from_date, to_date):
+        StaticCrawler.searches += 1
+        return [p for p in self.papers if from_date <= p.published_date <= to_date]
+
+    async def download_paper(self, paper, save_path):
+        return paper.title not in StaticCrawler.broken
+
+    async def get_paper_details(self, paper):
+        return paper
+
+def make_paper(n, hours_ago):
+    return Paper(title=f"paper {n}", authors=["John Smith"], abstract="camera", url=f"http://arxiv.org/abs/{n}v1",
+                 pdf_url=f"http://arxiv.org/pdf/{n}", source="arxiv", keywords=[],
+                 published_date=datetime.now(timezone.utc) - timedelta(hours=hours_ago))
+
+def test_scheduled_jobs_harvest_only_new_papers(tmp_path):
+    """测试采集任务写入数据库，再次运行时只获取新论文"""
+    config = {
+        "download": {"path": str(tmp_path / "papers"), "max_concurrent": 2},
+        "keywords": {"计算机视觉基础": ["computer vision", "image processing"]},
+        "harvest": {"jobs": [{"name": "daily", "domains": ["计算机视觉基础"], "days": 3}]},
+    }
+    db_manager = DatabaseManager(f"sqlite:///{tmp_path / 'papers.db'}")
+    harvester = Harvester(config, db_manager, create_crawlers=lambda c: {"arxiv": StaticCrawler(c)})
+    scheduler = HarvestScheduler(harvester, load_jobs(config))
+    StaticCrawler.papers = [make_paper(1, 30), make_paper(2, 10), make_paper(3, 200)]
+
+    first = asyncio.run(scheduler.run_once())["daily"]
+    assert (first.found, first.stored, first.queries) == (2, 2, 1)
+
+    StaticCrawler.papers.append(make_paper(4, 1))
+    second = asyncio.run(scheduler.run_once())["daily"]
+    assert (second.found, second.stored) == (1, 1)
+    assert db_manager.get_paper_by_title("paper 4") is not None
+    assert db_manager.get_paper_by_title("paper 3") is None
+
+def test_failed_downloads_are_retried(tmp_path):
+    """测试下载失败的论文不入库，水位线不越过它，下次采集重新获取"""
+    config = {"download": {"path": str(tmp_path / "papers")}, "keywords": {}}
+    db_manager = DatabaseManager(f"sqlite:///{tmp_path / 'papers.db'}")
+    harvester = Harvester(config, db_manager, create_crawlers=lambda c: {"arxiv": StaticCrawler(c)})
+    StaticCrawler.papers = [make_paper(1, 30), make_paper(2, 20), make_paper(3, 10)]
+    StaticCrawler.broken = {"paper 2"}
+
+    first = asyncio.run(harvester.harvest(["camera"], ["arxiv"], days=3))
+    assert (first.found, first.stored) == (3, 2)
+    assert db_manager.get_paper_by_title("paper 2") is None
+
+    StaticCrawler.broken = set()
+    second = asyncio.run(harvester.harvest(["camera"], ["arxiv"], days=3))
+    assert second.found == 2  # 失败的论文 2 及其之后的论文 3
+    assert second.stored == 1
+    assert db_manager.get_paper_by_title("paper 2") is not None
+
+def test_permanent_failures_stop_holding_watermark(tmp_path):
+    """测试失败次数达到 max_attempts 后水位线越过该论文，数据不完整的论文不记为失败"""
+    config = {"download": {"path": str(tmp_path / "papers")}, "keywords": {}, "harvest": {"max_attempts": 2}}
+    db_manager = DatabaseManager(f"sqlite:///{tmp_path / 'papers.db'}")
+    harvester = Harvester(config, db_manager, create_crawlers=lambda c: {"arxiv": StaticCrawler(c)})
+    incomplete = Paper(**{**make_paper(4, 25).__dict__, "abstract": ""})
+    StaticCrawler.papers = [make_paper(1, 30), make_paper(2, 20), make_paper(3, 10), incomplete]
+    StaticCrawler.broken = {"paper 2"}
+    messages = []
+
+    first = asyncio.run(harvester.harvest(["camera"], ["arxiv"], days=3))
+    assert (first.found, first.stored) == (4, 2)
+    second = asyncio.run(harvester.harvest(["camera"], ["arxiv"], days=3, on_status=messages.append))
+    assert second.found == 2  # 失败的论文 2 及其之后的论文 3；数据不完整的论文 4 未挡住水位线
+    assert any("不再重试" in m and "paper 2" in m for m in messages)
+
+    StaticCrawler.papers.append(make_paper(5, 1))
+    third = asyncio.run(harvester.harvest(["camera"], ["arxiv"], days=3))
+    assert (third.found, third.stored) == (1, 1)
+
+def test_truncated_query_holds_watermark(tmp_path):
+    """测试结果被截断且无法取完时不推进水位线"""
+
+    class CappedCrawler(StaticCrawler):
+        def result_limit(self, keyword):
+            return 1
+
+    config = {"download": {"path": str(tmp_path / "papers")}, "keywords": {}}
+    db_manager = DatabaseManager(f"sqlite:///{tmp_path / 'papers.db'}")
+    harvester = Harvester(config, db_manager, create_crawlers=lambda c: {"arxiv": CappedCrawler(c)})
+    same_time = make_paper(1, 5)
+    twin = Paper(**{**same_time.__dict__, "title": "paper 1b", "url": "http://arxiv.org/abs/1bv1"})
+    StaticCrawler.papers = [same_time, twin]
+    StaticCrawler.broken = set()
+    messages = []
+    asyncio.run(harvester.harvest(["camera"], ["arxiv"], days=3, on_status=messages.append))
+    assert harvester.watermarks.get("arxiv", '"camera"') is None
+    assert any("水位线保持不变" in m for m in messages)
+
+def test_cli_arguments():
+    """测试命令行参数解析和任务选择"""
+    args = build_parser().parse_args(["run", "--job", "daily"])
+    assert args.command == "run" and args.job == ["daily"]
+    jobs = load_jobs({"harvest": {"jobs": [{"name": "daily", "domains": ["x"]}, {"name": "weekly", "domains": ["y"]}]}})
+    assert [job.name for job in select_jobs(jobs, ["weekly"])] == ["weekly"]
+
+def test_concurrent_jobs_share_one_writer(tmp_path):
+    """测试并发的采集任务共用一把写锁，入库不会同时进行"""
+    config = {
+        "download": {"path": str(tmp_path / "papers"), "max_concurrent": 4},
+        "keywords": {},
+        "harvest": {"jobs": [{"name": f"job{i}", "domains": [f"topic {i}"], "days": 3} for i in range(3)]},
+    }
+    db_manager = DatabaseManager(f"sqlite:///{tmp_path / 'papers.db'}")
+    add_paper = db_manager.add_paper
+    active, peak = [0], [0]
+
+    def tracked_add(paper_data):
+        active[0] += 1
+        peak[0] = max(peak[0], active[0])
+        try:
+            time.sleep(0.005)
+            return add_paper(paper_data)
+        finally:
+            active[0] -= 1
+
+    db_manager.add_paper = tracked_add
+    harvester = Harvester(config, db_manager, create_crawlers=lambda c: {"arxiv": StaticCrawler(c)})
+    StaticCrawler.papers = [make_paper(n, n) for n in range(1, 13)]
+    StaticCrawler.broken = set()
+    results = asyncio.run(HarvestScheduler(harvester, load_jobs(config), max_concurrent_jobs=3).run_once())
+    assert sum(result.stored for result in results.values()) == 12
+    assert peak[0] == 1
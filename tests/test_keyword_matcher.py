@@ -0,0 +1,33 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.processors.keyword_matcher import KeywordMatcher
+
+KEYWORDS = {
+    "computer_vision": ["computer vision", "object detection", "vision system"],
+    "deep_learning": ["deep learning computer vision", "CNN"],
+    "medical_imaging": ["medical imaging", "medical imag"],
+}
+
+def test_scores_match_substring_semantics():
+    """测试一次扫描统计所有类别（含重叠和前缀关键词）"""
+    matcher = KeywordMatcher(KEYWORDS)
+    scores = matcher.scores("Deep Learning Computer Vision System for medical imaging")
+    assert scores["deep_learning"] == 1
+    # computer vision 与 vision system 都落在更长的关键词内部
+    assert scores["computer_vision"] == 2
+    # medical imaging 同时命中其前缀 medical imag
+    assert scores["medical_imaging"] == 2
+
+    for text in ["a CNN for object detection", "MEDICAL IMAGERY", "nothing relevant"]:
+        expected = {c for c, words in KEYWORDS.items() if any(w.lower() in text.lower() for w in words)}
+        assert set(matcher.scores(text)) == expected
+
+def test_best_category():
+    """测试取命中最多的类别，并列时按配置顺序"""
+    matcher = KeywordMatcher(KEYWORDS)
+    assert matcher.best("CNN and computer vision") == "computer_vision"
+    assert matcher.best("CNN based medical imaging, medical imaging again") == "medical_imaging"
+    assert matcher.best("unrelated text") is None
+    assert KeywordMatcher({}).best("computer vision") is None
@@ -0,0 +1,59 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+from datetime import datetime
+from src.crawlers.base_crawler import BaseCrawler, Paper
+from src.crawlers.query_planner import QueryPlanner, expand_keywords, paper_key, query_terms, search_planned
+
+def make_paper(url, title="paper"):
+    return Paper(title=title, authors=["John Smith"], abstract="camera", url=url, pdf_url=None,
+                 published_date=datetime(2024, 1, 1), source="arxiv", keywords=[])
+
+class RecordingCrawler(BaseCrawler):
+    """按查询返回预设结果的爬虫"""
+
+    def __init__(self, results):
+        super().__init__({})
+        self.results = results
+        self.queries = []
+
+    async def search(self, keyword, from_date, to_date):
+        self.queries.append(keyword)
+        return self.results[keyword]
+
+    async def download_paper(self, paper, save_path):
+        return True
+
+    async def get_paper_details(self, paper):
+        return paper
+
+def test_plan_merges_and_drops_covered_terms():
+    """测试领域关键词展开、被覆盖短语去除以及按条数上限分组"""
+    config = {"keywords": {"深度学习视觉": ["deep learning computer vision", "convolutional neural network",
+                                          "CNN vision", "neural network image", "deep learning object detection"]}}
+    terms = expand_keywords(config, ["深度学习视觉", "Object Detection", "computer vision", "cnn VISION"])
+    queries = QueryPlanner(max_terms=2).plan(terms)
+    assert queries == ['"convolutional neural network" OR "CNN vision"',
+                       '"neural network image" OR "Object Detection"',
+                       '"computer vision"']
+    assert len(QueryPlanner(max_terms=10, max_length=40).plan(terms)) == 3
+
+def test_search_planned_dedupes_versions():
+    """测试并发查询的结果按去版本号的链接去重"""
+    crawler = RecordingCrawler({
+        "a": [make_paper("http://arxiv.org/abs/2401.00001v1"), make_paper("http://arxiv.org/abs/2401.00002v1")],
+        "b": [make_paper("http://arxiv.org/abs/2401.00001v2"), make_paper("http://arxiv.org/abs/2401.00003v1")],
+    })
+    papers = asyncio.run(search_planned(crawler, ["a", "b"], datetime(2024, 1, 1), datetime(2024, 2, 1)))
+    assert sorted(crawler.queries) == ["a", "b"]
+    assert [p.url[-7:] for p in papers] == ["00001v1", "00002v1", "00003v1"]
+    assert paper_key(make_paper("")) == "title:paper"
+
+def test_query_terms_counts_merged_phrases():
+    """测试合并查询的关键词数（用于按关键词数放大结果上限）"""
+    queries = QueryPlanner(max_terms=5).plan(["object detection", "image segmentation", "optical flow"])
+    assert [query_terms(q) for q in queries] == [3]
+    assert query_terms("camera calibration") == 1
+    assert RecordingCrawler({}).result_limit(queries[0]) is None
@@ -0,0 +1,47 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+from pathlib import Path
+from src.processors.rendering import FigureJob, FigureRenderer, render_year_distribution
+
+def write_data(data, path):
+    """代替真实图表：把输入写入输出文件，并在日志中记录渲染了哪张图（进程池中也能记录）"""
+    Path(path).write_text(json.dumps(data["values"]), encoding="utf-8")
+    with open(data["log"], "a", encoding="utf-8") as f:
+        f.write(Path(path).name + "\n")
+
+def rendered(log):
+    return open(log, encoding="utf-8").read().split() if os.path.exists(log) else []
+
+def test_unchanged_figures_are_cache_hits(tmp_path):
+    """测试多张图在进程池中渲染，再次渲染时输入未变化的图直接跳过，输入变化或文件丢失的图重新渲染"""
+    log = str(tmp_path / "render.log")
+    output = tmp_path / "figures"
+    jobs = {
+        "a.json": FigureJob(write_data, {"values": [1, 2], "log": log}),
+        "b.json": FigureJob(write_data, {"values": [3], "log": log}),
+    }
+    paths = FigureRenderer(str(output), max_workers=2).render(jobs)
+    assert paths == {name: str(output / name) for name in jobs}
+    assert sorted(rendered(log)) == ["a.json", "b.json"]
+    assert json.loads((output / "a.json").read_text(encoding="utf-8")) == [1, 2]
+
+    FigureRenderer(str(output)).render(jobs)
+    assert len(rendered(log)) == 2
+
+    jobs["b.json"] = FigureJob(write_data, {"values": [3, 4], "log": log})
+    FigureRenderer(str(output)).render(jobs)
+    assert rendered(log)[2:] == ["b.json"]
+    assert json.loads((output / "b.json").read_text(encoding="utf-8")) == [3, 4]
+
+    os.remove(output / "a.json")
+    FigureRenderer(str(output)).render(jobs)
+    assert rendered(log)[3:] == ["a.json"]
+
+def test_render_real_figure(tmp_path):
+    """测试真实的渲染函数不依赖 pyplot 即可输出图片"""
+    job = FigureJob(render_year_distribution, {"yearly_counts": {"2023": 2, "2024": 5}})
+    path = FigureRenderer(str(tmp_path)).render({"years.png": job})["years.png"]
+    assert open(path, "rb").read(8) == b"\x89PNG\r\n\x1a\n"
@@ -0,0 +1,58 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime
+from types import SimpleNamespace
+import networkx as nx
+from src.models.database import DatabaseManager
+from src.processors.analysis import PaperAnalyzer, eigenvector_centrality
+from src.processors.report_engine import ReportEngine, ReportInputs
+from src.processors.term_frequency import TermFrequencyStore
+
+def test_eigenvector_centrality_on_disconnected_graph():
+    """测试不连通的合作网络按分量计算中心性，大分量的核心作者排在前面"""
+    G = nx.Graph([("a", "b"), ("a", "c"), ("a", "d"), ("c", "d"), ("x", "y")])
+    centrality = eigenvector_centrality(G)
+    assert set(centrality) == set(G)
+    ranked = sorted(centrality, key=centrality.get, reverse=True)
+    assert ranked[0] == "a"
+    assert centrality["a"] > centrality["x"] == centrality["y"]
+    assert eigenvector_centrality(nx.Graph()) == {}
+
+def test_report_inputs_keep_only_aggregates():
+    """测试报告输入按天计数和引文网络累加，月度汇总与逐篇统计一致"""
+    inputs = ReportInputs(keep_documents=False)
+    inputs.add_paper("A", "x", datetime(2023, 1, 2, 8), "cs.CV")
+    inputs.add_paper("B", "y", datetime(2023, 1, 2, 20), "cs.CV")
+    inputs.add_paper("C", "z", datetime(2023, 2, 1), None)
+    inputs.add_paper("D", "w", None, None)
+    inputs.add_reference("A", "C")
+    assert inputs.documents == []
+    assert inputs.rollups()["month"] == {"2023-01": 2, "2023-02": 1}
+    assert inputs.rollups()["day"]["2023-01-02"] == 2
+    assert inputs.edges == [("A", "C")]
+    assert inputs.citations.number_of_nodes() == 4
+
+def test_database_inputs_with_disconnected_authors():
+    """测试从数据库流式收集的输入：文档按需重新查询，作者网络不连通时核心作者章节正常生成"""
+    db_manager = DatabaseManager('sqlite://')
+    groups = [["Ann Lee", "Bob Chen", "Carl Wu"], ["Dan Ito", "Eve Park"], ["Fay Kim", "Gus Roe"]]
+    for i, authors in enumerate(groups + [["Ann Lee", "Hal Ng"]]):
+        db_manager.add_paper({
+            'title': f'vision paper {i}', 'abstract': f'camera study {i}',
+            'authors': authors, 'published_date': datetime(2023, 1 + i, 1), 'category': 'cs.CV',
+        })
+    # 报告引擎只用到分析器的词频表和核心作者排序（完整的 PaperAnalyzer 需要 NLTK 数据）
+    analyzer = SimpleNamespace(db_manager=db_manager, core_authors=PaperAnalyzer.core_authors,
+                               term_frequencies=TermFrequencyStore(db_manager, stop_words=[]))
+    engine = ReportEngine(analyzer, batch_size=2)
+    inputs = engine.collect_database()
+
+    assert inputs.paper_count == 4
+    assert list(inputs.documents) == [f"vision paper {i} camera study {i}" for i in range(4)]
+    assert list(inputs.documents)[0] == "vision paper 0 camera study 0"
+    assert inputs.rollups()["month"] == {"2023-01": 1, "2023-02": 1, "2023-03": 1, "2023-04": 1}
+    section = engine._authors_section(inputs)
+    assert section.split("### 核心作者")[1].strip().splitlines()[0].startswith("- Ann Lee")
+    assert inputs.word_frequencies["camera"] == 4
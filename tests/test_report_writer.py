@@ -0,0 +1,65 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+from datetime import date, datetime
+from src.models.database import DatabaseManager
+from src.processors.report_writer import DailyReportWriter, parse_formats
+
+def add_papers(db_manager):
+    db_manager.add_paper({'title': 'Depth <estimation> & stereo', 'abstract': 'uses "disparity"', 'category': 'cs.CV',
+                          'published_date': datetime(2024, 3, 1), 'authors': ['John Smith', 'Jane Doe'],
+                          'doi': '10.1/abc', 'url': 'http://example.com/a?x=1&y=2', 'source': 'arxiv'})
+    db_manager.add_paper({'title': 'Robot grasping', 'abstract': None, 'category': 'cs.RO',
+                          'published_date': None, 'authors': ['Jane Doe'], 'source': 'arxiv'})
+    db_manager.add_paper({'title': 'Optical flow', 'abstract': 'motion', 'category': 'cs.CV',
+                          'published_date': datetime(2024, 3, 2), 'authors': ['Li Wei'], 'source': 'arxiv'})
+    db_manager.add_paper({'title': 'Untitled', 'abstract': 'notes', 'category': None,
+                          'authors': ['John Smith'], 'source': 'arxiv'})
+
+def test_parse_formats():
+    """测试报告格式解析始终包含 markdown"""
+    assert parse_formats("html, md") == ["markdown", "html"]
+    assert parse_formats(["json", "json"]) == ["markdown", "json"]
+    assert parse_formats(None) == ["markdown"]
+
+def test_write_from_database_all_formats(tmp_path):
+    """测试从数据库分批写出三种格式：JSON 可解析，Markdown/HTML 内容正确"""
+    db_manager = DatabaseManager('sqlite://')
+    add_papers(db_manager)
+    writer = DailyReportWriter(str(tmp_path), ["markdown", "html", "json"], batch_size=1)
+    paths = writer.write_from_database(db_manager, date.today())
+    day = date.today().strftime("%Y-%m-%d")
+
+    report = json.loads(open(paths["json"], encoding="utf-8").read())
+    assert report["date"] == day
+    assert report["total"] == 4
+    assert report["category_count"] == 3
+    assert [(c["name"], c["count"]) for c in report["categories"]] == [("cs.CV", 2), ("cs.RO", 1), ("其他", 1)]
+    first, second = report["categories"][0]["papers"]
+    assert first["title"] == 'Depth <estimation> & stereo'
+    assert first["authors"] == 'John Smith, Jane Doe'
+    assert first["published_date"] == '2024-03-01'
+    assert second["title"] == 'Optical flow'
+    assert report["categories"][1]["papers"][0]["authors"] == 'Jane Doe'
+
+    markdown = open(paths["markdown"], encoding="utf-8").read()
+    assert markdown.startswith(f"# 机器视觉文献日报 ({day})\n\n## 总览\n\n- 今日获取文献总数：4篇\n- 覆盖分类数：3个\n")
+    assert "## cs.CV (2篇)\n\n### Depth <estimation> & stereo\n\n- 作者：John Smith, Jane Doe\n" in markdown
+    assert "- DOI：10.1/abc\n" in markdown
+    assert markdown.index("## cs.RO (1篇)") < markdown.index("### Robot grasping") < markdown.index("## 其他 (1篇)")
+
+    page = open(paths["html"], encoding="utf-8").read()
+    assert page.count("<section>") == page.count("</section>") == 3
+    assert "<h3>Depth &lt;estimation&gt; &amp; stereo</h3>" in page
+    assert '<a href="http://example.com/a?x=1&amp;y=2">' in page
+    assert "<p>uses &quot;disparity&quot;</p>" in page
+    assert page.endswith("</body>\n</html>\n")
+
+def test_write_empty_report(tmp_path):
+    """测试没有论文时写出合法的空报告"""
+    writer = DailyReportWriter(str(tmp_path), ["markdown", "json"])
+    paths = writer.write_from_database(DatabaseManager('sqlite://'), date.today())
+    report = json.loads(open(paths["json"], encoding="utf-8").read())
+    assert report["total"] == 0 and report["categories"] == []
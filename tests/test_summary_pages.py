@@ -0,0 +1,59 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from summary_pages import INDEX_NAME, STYLESHEET_NAME, SummaryPageWriter
+
+def paper(title, source="arxiv", **extra):
+    return {"title": title, "source": source, "authors": "John Smith", "abstract": "摘要",
+            "url": "http://example.com/?a=1&b=2", **extra}
+
+def test_render_escapes_fields():
+    """测试页面字段全部转义，音频文件名按 URL 编码"""
+    page = SummaryPageWriter("unused").render(paper("<b>Depth</b> & Stereo", citations=3), "朗读 1.mp3", "audio/mpeg")
+    assert "<title>&lt;b&gt;Depth&lt;/b&gt; &amp; Stereo</title>" in page
+    assert 'href="http://example.com/?a=1&amp;b=2"' in page
+    assert 'src="%E6%9C%97%E8%AF%BB%201.mp3" type="audio/mpeg"' in page
+    assert "3次" in page
+
+def test_pages_written_in_batches_with_shared_stylesheet(tmp_path):
+    """测试页面按批写出，每个文件夹只写一份样式表"""
+    writer = SummaryPageWriter(str(tmp_path), batch_size=2)
+    writer.add(tmp_path / "arxiv" / "a.html", paper("A"), "a.mp3", "audio/mpeg")
+    assert not (tmp_path / "arxiv" / "a.html").exists()
+    writer.add(tmp_path / "arxiv" / "b.html", paper("B"), "b.mp3", "audio/mpeg")
+    assert (tmp_path / "arxiv" / "a.html").exists() and (tmp_path / "arxiv" / STYLESHEET_NAME).exists()
+    writer.add(tmp_path / "ieee" / "c.html", paper("C", "ieee"), "c.mp3", "audio/mpeg")
+    index_path = writer.finish()
+    assert (tmp_path / "ieee" / "c.html").exists()
+    index = open(index_path, encoding="utf-8").read()
+    assert "（3 篇）" in index
+    assert index.index("arxiv（2 篇）") < index.index("ieee（1 篇）")
+    assert '<a href="arxiv/a.html">A</a>' in index
+
+def test_index_keeps_pages_from_earlier_runs(tmp_path):
+    """测试每次运行重建的索引包含之前运行生成的摘要页，已删除的页面不再出现"""
+    first = SummaryPageWriter(str(tmp_path))
+    first.add(tmp_path / "arxiv" / "old.html", paper("Old & <Paper>"), "old.mp3", "audio/mpeg")
+    first.add(tmp_path / "arxiv" / "gone.html", paper("Gone"), "gone.mp3", "audio/mpeg")
+    first.finish()
+    os.remove(tmp_path / "arxiv" / "gone.html")
+    (tmp_path / "arxiv" / "notes.html").write_text("<html>not a summary</html>", encoding="utf-8")
+
+    second = SummaryPageWriter(str(tmp_path))
+    second.add(tmp_path / "ieee" / "new.html", paper("New", "ieee"), "new.mp3", "audio/mpeg")
+    index = open(second.finish(), encoding="utf-8").read()
+    assert "（2 篇）" in index
+    assert '<a href="arxiv/old.html">Old &amp; &lt;Paper&gt;</a>' in index
+    assert "ieee/new.html" in index
+    assert "gone.html" not in index and "notes.html" not in index
+    assert INDEX_NAME not in index
+
+def test_scan_pages_without_source_uses_folder(tmp_path):
+    """测试没有记录来源的旧页面按所在文件夹归组"""
+    writer = SummaryPageWriter(str(tmp_path))
+    page = writer.render(paper("Legacy"), "x.mp3", "audio/mpeg")
+    page = page.replace('    <meta name="paper-source" content="arxiv">\n', '')
+    (tmp_path / "springer").mkdir()
+    (tmp_path / "springer" / "legacy.html").write_text(page, encoding="utf-8")
+    assert writer.scan_pages() == {tmp_path / "springer" / "legacy.html": ("Legacy", "springer")}
@@ -0,0 +1,58 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from src.crawlers.arxiv_paginator import ArxivPaginator
+from src.crawlers.telemetry import CrawlSnapshot, CrawlTelemetry
+
+class FakeClient:
+    """每页 10 条的同步客户端"""
+
+    page_size = 10
+
+    def results(self, search):
+        for i in range(25):
+            yield SimpleNamespace(title=f"paper {i}", published=datetime(2024, 3, 1, tzinfo=timezone.utc))
+
+def test_snapshot_progress_and_eta():
+    """测试进度按产出篇数计算，完成前最多 99%，剩余时间按产出速度估计"""
+    snapshot = CrawlSnapshot(pages=2, bytes_received=2048, items=25, fetch_seconds=2.0,
+                             parse_seconds=0.5, elapsed=5.0, expected_items=100)
+    assert snapshot.progress == 25
+    assert snapshot.items_per_second == 5.0
+    assert snapshot.bytes_per_second == 1024.0
+    assert snapshot.eta == 15.0
+    assert "预计剩余 15s" in snapshot.describe()
+    assert CrawlSnapshot(0, 0, 150, 0, 0, 1.0, expected_items=100).progress == 99
+    assert CrawlSnapshot(0, 0, 0, 0, 0, 1.0).progress == 0
+    assert CrawlSnapshot(0, 0, 0, 0, 0, 1.0).eta is None
+    done = CrawlSnapshot(0, 0, 10, 0, 0, 1.0, expected_items=100, finished=True)
+    assert done.progress == 100 and done.eta == 0.0
+
+def test_telemetry_counts_and_throttles():
+    """测试统计累加，通知按间隔节流，结束时必定通知"""
+    snapshots = []
+    telemetry = CrawlTelemetry(expected_items=10, listener=snapshots.append, min_interval=3600)
+    telemetry.page(100, 0.5)
+    telemetry.page(300, 0.5)
+    with telemetry.parsing():
+        telemetry.emitted(4)
+    assert len(snapshots) == 1
+    final = telemetry.finish()
+    assert len(snapshots) == 2 and snapshots[-1] is final
+    assert (final.pages, final.bytes_received, final.items, final.fetch_seconds) == (2, 400, 4, 1.0)
+    assert final.parse_seconds >= 0 and final.finished and final.progress == 100
+
+def test_paginator_reports_pages():
+    """测试异步分页器把每次取页记入遥测"""
+    telemetry = CrawlTelemetry()
+    paginator = ArxivPaginator(FakeClient())
+
+    async def collect():
+        return [r async for r in paginator.results(None, telemetry=telemetry)]
+
+    assert len(asyncio.run(collect())) == 25
+    assert telemetry.snapshot().pages == paginator.pages_fetched == 3
@@ -0,0 +1,51 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime
+from src.models.database import DatabaseManager
+from src.processors.temporal import TemporalAnalyzer, to_datetime64, rollup_dates
+
+def add_papers(db_manager, dates, keywords):
+    """按给定日期批量写入测试论文"""
+    for i, date in enumerate(dates):
+        db_manager.add_paper({
+            'title': f'Paper {date:%Y%m%d} {i}',
+            'authors': ['John Smith'],
+            'published_date': date,
+            'keywords': keywords,
+        })
+
+def test_rollup_groups_by_day_not_timestamp():
+    """测试同一天不同时刻的论文按天汇总"""
+    dates = [datetime(2023, 1, 2, 8), datetime(2023, 1, 2, 20), datetime(2023, 1, 8), None]
+    rollups = rollup_dates(to_datetime64(dates))
+    assert rollups["day"] == {"2023-01-02": 2, "2023-01-08": 1}
+    # 2023-01-02 是周一，2023-01-08 是周日，属于同一周
+    assert rollups["week"] == {"2023-01-02": 3}
+    assert rollups["month"] == {"2023-01": 3}
+    assert rollups["year"] == {"2023": 3}
+
+def test_to_datetime64_accepts_strings_with_time():
+    """测试带时间和时区的字符串按其自身日期转换"""
+    days = to_datetime64(["2023-01-02", "2023-01-02 23:30:00", "2023-01-02T23:30:00+08:00", "2023-01-03T01:00:00Z"])
+    assert [str(d) for d in days] == ["2023-01-02", "2023-01-02", "2023-01-02", "2023-01-03"]
+
+def test_incremental_refresh_and_keyword_bursts():
+    """测试缓存增量更新与关键词突发检测"""
+    db_manager = DatabaseManager('sqlite://')
+    analyzer = TemporalAnalyzer(db_manager)
+
+    add_papers(db_manager, [datetime(2023, m, 1) for m in range(1, 7)], ['vision'])
+    assert analyzer.refresh() == 6
+    assert analyzer.rollups()["month"]["2023-03"] == 1
+
+    add_papers(db_manager, [datetime(2023, 7, d) for d in range(1, 9)], ['vision', 'yolo'])
+    assert analyzer.refresh() == 8
+    assert analyzer.refresh() == 0
+    assert analyzer.rollups()["month"]["2023-07"] == 8
+    assert sum(analyzer.monthly_series().values()) == 14
+
+    trends = {t["keyword"]: t for t in analyzer.keyword_trends(min_count=3)}
+    assert trends["vision"]["bursts"] == ["2023-07"]
+    assert trends["vision"]["trend"] > 0
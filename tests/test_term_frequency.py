@@ -0,0 +1,60 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime
+from src.models.database import DatabaseManager, Paper
+from src.processors.term_frequency import TermFrequencyStore
+
+def add_papers(db_manager):
+    """两个类别、两个月份的测试论文"""
+    db_manager.add_paper({'title': 'camera calibration', 'abstract': 'camera lens', 'category': 'cs.CV',
+                          'published_date': datetime(2024, 1, 5), 'authors': ['John Smith']})
+    db_manager.add_paper({'title': 'lidar odometry', 'abstract': 'lidar points', 'category': 'cs.CV',
+                          'published_date': datetime(2024, 1, 20), 'authors': ['John Smith']})
+    db_manager.add_paper({'title': 'camera pose', 'abstract': None, 'category': 'cs.RO',
+                          'published_date': datetime(2024, 2, 1), 'authors': ['John Smith']})
+    db_manager.add_paper({'title': 'untitled thoughts', 'abstract': 'musing', 'category': None,
+                          'published_date': None, 'authors': ['John Smith']})
+
+def load(db_manager, *titles):
+    session = db_manager.Session()
+    try:
+        return session.query(Paper).filter(Paper.title.in_(titles)).order_by(Paper.id).all()
+    finally:
+        session.close()
+
+def test_update_is_incremental_and_filters():
+    """测试增量更新只处理新论文，按类别和月份筛选汇总"""
+    db_manager = DatabaseManager('sqlite://')
+    store = TermFrequencyStore(db_manager, stop_words=[], batch_size=2)
+    add_papers(db_manager)
+    assert store.update() == 4
+    assert store.update() == 0
+    assert store.frequencies()["camera"] == 3
+    assert store.frequencies(categories=["cs.CV"]) == {"camera": 2, "lidar": 2, "calibration": 1,
+                                                       "lens": 1, "odometry": 1, "points": 1}
+    assert store.frequencies(periods=["2024-02"]) == {"camera": 1, "pose": 1}
+    assert store.categories() == ["cs.CV", "cs.RO", "其他"]
+
+    db_manager.add_paper({'title': 'camera fusion', 'category': 'cs.RO',
+                          'published_date': datetime(2024, 2, 9), 'authors': ['John Smith']})
+    assert store.update() == 1
+    assert store.frequencies(categories=["cs.RO"])["camera"] == 2
+
+def test_paper_frequencies_only_counts_given_papers():
+    """测试只传入部分论文时不混入同一类别月份中其他论文的词"""
+    db_manager = DatabaseManager('sqlite://')
+    store = TermFrequencyStore(db_manager, stop_words=[])
+    add_papers(db_manager)
+
+    subset = load(db_manager, 'camera calibration')
+    assert not store._covers_cells(subset)
+    assert store.paper_frequencies(subset) == {"camera": 2, "calibration": 1, "lens": 1}
+
+    # 覆盖完整单元时直接读取词频表，结果与内存统计一致
+    whole = load(db_manager, 'camera calibration', 'lidar odometry', 'untitled thoughts')
+    assert store._covers_cells(whole)
+    assert store.paper_frequencies(whole) == {"camera": 2, "lidar": 2, "calibration": 1, "lens": 1,
+                                              "odometry": 1, "points": 1, "untitled": 1, "thoughts": 1,
+                                              "musing": 1}
@@ -0,0 +1,62 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime
+from src.models.database import DatabaseManager
+from src.processors.term_frequency import TermFrequencyStore
+from src.processors.trend_engine import TrendEngine
+
+def add_paper(db_manager, title, month, category='cs.CV'):
+    db_manager.add_paper({'title': title, 'category': category, 'published_date': datetime(2024, month, 10),
+                          'authors': ['John Smith']})
+
+def make_engine():
+    """前两个月以 camera 为主，后两个月以 transformer 为主"""
+    db_manager = DatabaseManager('sqlite://')
+    for month in (1, 2):
+        for i in range(3):
+            add_paper(db_manager, f'camera calibration {month} {i}', month)
+    for month in (3, 4):
+        for i in range(3):
+            add_paper(db_manager, f'transformer calibration {month} {i}', month)
+    add_paper(db_manager, 'lidar mapping', 4, category='cs.RO')
+    return TrendEngine(TermFrequencyStore(db_manager, stop_words=[]))
+
+def test_period_matrix_rolls_up_months():
+    """测试按月汇总的词频矩阵"""
+    engine = make_engine()
+    engine.store.update()
+    periods, term_ids, matrix = engine.period_matrix(categories=['cs.CV'])
+    assert periods == ['2024-01', '2024-02', '2024-03', '2024-04']
+    words = engine._term_stats(term_ids)[1]
+    column = {words[t]: i for i, t in enumerate(term_ids)}
+    dense = matrix.toarray()
+    assert 'lidar' not in column
+    assert dense[:, column['camera']].tolist() == [3, 3, 0, 0]
+    assert dense[:, column['transformer']].tolist() == [0, 0, 3, 3]
+    assert dense[:, column['calibration']].tolist() == [3, 3, 3, 3]
+
+def test_trends_growth_between_windows():
+    """测试相邻窗口的上升词和下降词"""
+    engine = make_engine()
+    result = engine.trends(window=2, min_count=2, categories=['cs.CV'])
+    assert result["current"] == ['2024-03', '2024-04']
+    assert result["previous"] == ['2024-01', '2024-02']
+    assert [t["term"] for t in result["emerging"]][0] == 'transformer'
+    assert result["emerging"][0]["current_count"] == 6 and result["emerging"][0]["previous_count"] == 0
+    assert [t["term"] for t in result["declining"]] == ['camera']
+    # 两个窗口词频占比相同的词不算趋势
+    assert 'calibration' not in {t["term"] for t in result["emerging"] + result["declining"]}
+
+    # min_count 过滤低频词，end_period 指定窗口位置
+    assert {t["term"] for t in engine.trends(window=2, min_count=2)["emerging"]} >= {'transformer'}
+    assert 'lidar' not in {t["term"] for t in engine.trends(window=2, min_count=2)["emerging"]}
+    shifted = engine.trends(window=1, min_count=1, end_period='2024-02', categories=['cs.CV'])
+    assert shifted["current"] == ['2024-02'] and shifted["previous"] == ['2024-01']
+    assert shifted["emerging"] == [] and shifted["declining"] == []
+
+def test_trends_empty_database():
+    """测试没有论文时返回空结果"""
+    engine = TrendEngine(TermFrequencyStore(DatabaseManager('sqlite://'), stop_words=[]))
+    assert engine.trends() == {"current": [], "previous": [], "emerging": [], "declining": []}
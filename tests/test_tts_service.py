@@ -0,0 +1,124 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import tts_service
+from tts_service import TTSService, narration_key
+
+def fake_render(calls):
+    """代替工作进程中的引擎：把文本写入输出文件，并记录合成次数"""
+    def render(text, output_path, audio_format):
+        calls.append(text)
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return True
+    return render
+
+def make_service(tmp_path, monkeypatch, calls, **kwargs):
+    monkeypatch.setattr(tts_service, "_render", fake_render(calls))
+    kwargs.setdefault("audio_format", "wav")
+    service = TTSService(str(tmp_path / "cache"), **kwargs)
+    service.executor.shutdown()
+    service.executor = ThreadPoolExecutor(max_workers=2)
+    return service
+
+def test_submit_renders_once_and_links_outputs(tmp_path, monkeypatch):
+    """测试相同文本只合成一次，输出文件链接到缓存，已存在的输出不再合成"""
+    calls = []
+    service = make_service(tmp_path, monkeypatch, calls)
+    first = service.submit("摘要一", str(tmp_path / "out" / "a.mp3")).result()
+    second = service.submit("摘要一", str(tmp_path / "out" / "b")).result()
+    assert first == str(tmp_path / "out" / "a.wav") and second == str(tmp_path / "out" / "b.wav")
+    assert calls == ["摘要一"]
+    assert open(second, encoding="utf-8").read() == "摘要一"
+    assert os.stat(first).st_nlink == 3  # 缓存文件和两个输出共用同一份数据
+
+    assert service.text_to_speech("摘要二", first)  # 输出已存在
+    assert calls == ["摘要一"]
+    service.shutdown()
+
+def test_failed_render_and_shutdown(tmp_path, monkeypatch):
+    """测试合成失败时结果为 None，关闭后提交的任务直接失败"""
+    service = make_service(tmp_path, monkeypatch, [])
+    monkeypatch.setattr(tts_service, "_render", lambda text, path, fmt: False)
+    assert service.submit("失败", str(tmp_path / "x")).result() is None
+    assert not list((tmp_path / "cache").iterdir())
+    service.shutdown()
+    assert service.submit("关闭后", str(tmp_path / "y")).result() is None
+
+def test_concurrent_submits_share_pending_render(tmp_path, monkeypatch):
+    """测试同一文本正在合成时再次提交复用同一个任务"""
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+    render = fake_render(calls)
+
+    def slow_render(text, output_path, audio_format):
+        started.set()
+        release.wait(5)
+        return render(text, output_path, audio_format)
+
+    service = make_service(tmp_path, monkeypatch, calls)
+    monkeypatch.setattr(tts_service, "_render", slow_render)
+    first = service.submit("同一段", str(tmp_path / "a"))
+    started.wait(5)
+    second = service.submit("同一段", str(tmp_path / "b"))
+    release.set()
+    assert first.result(5) and second.result(5)
+    assert calls == ["同一段"]
+    service.shutdown()
+
+def test_narration_key():
+    """测试缓存键由文本和每一项语音设置共同决定"""
+    key = narration_key("摘要", 150, 0.9, "chinese", "mp3")
+    assert key == narration_key("摘要", 150, 0.9, "chinese", "mp3")
+    assert len(key) == 40
+    variants = [
+        narration_key("摘要。", 150, 0.9, "chinese", "mp3"),
+        narration_key("摘要", 160, 0.9, "chinese", "mp3"),
+        narration_key("摘要", 150, 0.8, "chinese", "mp3"),
+        narration_key("摘要", 150, 0.9, "english", "mp3"),
+        narration_key("摘要", 150, 0.9, "chinese", "wav"),
+    ]
+    assert len(set(variants + [key])) == 6
+
+def test_default_format_is_mp3(tmp_path, monkeypatch):
+    """测试默认输出各浏览器都能播放的 mp3，没有 ffmpeg 时退回 wav"""
+    monkeypatch.setattr(tts_service.shutil, "which", lambda name: "/usr/bin/ffmpeg")
+    service = make_service(tmp_path, monkeypatch, [], audio_format="mp3")
+    assert inspect.signature(TTSService).parameters["audio_format"].default == "mp3"
+    assert service.mime_type == "audio/mpeg"
+    assert service.audio_path(str(tmp_path / "a.ogg")) == str(tmp_path / "a.mp3")
+    service.shutdown()
+    monkeypatch.setattr(tts_service.shutil, "which", lambda name: None)
+    fallback = make_service(tmp_path, monkeypatch, [], audio_format="mp3")
+    assert fallback.audio_format == "wav"
+    fallback.shutdown()
+
+def test_eviction_counts_only_exclusive_files(tmp_path, monkeypatch):
+    """测试只淘汰缓存独占的文件：硬链接到输出目录的文件删除后不释放空间，不计入也不淘汰"""
+    calls = []
+    service = make_service(tmp_path, monkeypatch, calls, max_cache_bytes=25)
+    linked = service.submit("A" * 10, str(tmp_path / "out" / "linked")).result()
+    cache = tmp_path / "cache"
+    for i, text in enumerate(["B" * 10, "C" * 10]):
+        path = service._render_cached(text).result()
+        os.utime(path, (1000 + i, 1000 + i))
+    assert service._cache_bytes <= 25
+
+    # 第三个独占文件超出上限：最旧的独占文件被淘汰，硬链接的文件保留
+    service._render_cached("D" * 10).result()
+    remaining = {open(cache / name).read() for name in os.listdir(cache)}
+    assert remaining == {"A" * 10, "C" * 10, "D" * 10}
+    assert service._cache_bytes == 20
+    assert open(linked).read() == "A" * 10
+
+    # 输出文件被删除后缓存文件重新变为独占，下次扫描时计入
+    os.remove(linked)
+    reopened = TTSService(str(cache), audio_format="wav")
+    assert reopened._cache_bytes == 30
+    reopened.shutdown()
+    service.shutdown()
@@ -0,0 +1,110 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+from datetime import datetime, timezone
+from src.models.database import DatabaseManager
+from src.crawlers.base_crawler import BaseCrawler, Paper
+from src.crawlers.query_planner import search_queries, search_window
+from src.crawlers.watermarks import WatermarkStore
+
+def make_paper(n, day):
+    return Paper(title=f"paper {n}", authors=["John Smith"], abstract="camera", url=f"http://arxiv.org/abs/{n}v1",
+                 pdf_url=None, published_date=datetime(2024, 1, day, tzinfo=timezone.utc), source="arxiv", keywords=[])
+
+class WindowCrawler(BaseCrawler):
+    """按时间窗口过滤预设论文的爬虫，记录请求的起始时间"""
+
+    def __init__(self, papers):
+        super().__init__({})
+        self.papers = papers
+        self.starts = []
+
+    async def search(self, keyword, from_date, to_date):
+        self.starts.append(from_date)
+        return [p for p in self.papers if from_date <= p.published_date <= to_date]
+
+    async def download_paper(self, paper, save_path):
+        return True
+
+    async def get_paper_details(self, paper):
+        return paper
+
+def test_watermark_skips_seen_papers_and_holds_at_failures():
+    """测试第二次采集只请求水位线之后的论文，处理失败的论文之后水位线不推进"""
+    store = WatermarkStore(DatabaseManager('sqlite://'))
+    window = (datetime(2024, 1, 1, tzinfo=timezone.utc), datetime(2024, 1, 31, tzinfo=timezone.utc))
+    crawler = WindowCrawler([make_paper(1, 3), make_paper(2, 5), make_paper(3, 5)])
+
+    found = asyncio.run(search_queries(crawler, ["q"], *window))
+    mark = store.advance("arxiv", "q", found["q"].papers)
+    assert mark.published == datetime(2024, 1, 5, tzinfo=timezone.utc)
+    assert store.get("arxiv", "q") == mark
+
+    # 新增同一时刻的论文 4 和更晚的论文 5、6，其中 5 处理失败
+    crawler.papers += [make_paper(4, 5), make_paper(5, 7), make_paper(6, 9)]
+    found = asyncio.run(search_queries(crawler, ["q"], *window, {"q": store.get("arxiv", "q")}))
+    assert crawler.starts[-1] == mark.published
+    papers = found["q"].papers
+    assert [p.title for p in papers] == ["paper 4", "paper 5", "paper 6"]
+    mark = store.advance("arxiv", "q", papers, failed=[papers[1]])
+    assert mark.published == datetime(2024, 1, 5, tzinfo=timezone.utc)
+    assert len(mark.keys) == 3
+
+    store.reset("arxiv")
+    assert store.get("arxiv", "q") is None
+
+class LimitedCrawler(WindowCrawler):
+    """按发表时间倒序、每次最多返回 limit 篇的爬虫"""
+
+    def __init__(self, papers, limit):
+        super().__init__(papers)
+        self.limit = limit
+
+    def result_limit(self, keyword):
+        return self.limit
+
+    async def search(self, keyword, from_date, to_date):
+        papers = await super().search(keyword, from_date, to_date)
+        return sorted(papers, key=lambda p: p.published_date, reverse=True)[:self.limit]
+
+def test_search_window_pages_past_result_limit():
+    """测试结果被截断时从最早的论文处继续向前搜索，取完整个时间窗口"""
+    window = (datetime(2024, 1, 1, tzinfo=timezone.utc), datetime(2024, 1, 31, tzinfo=timezone.utc))
+    crawler = LimitedCrawler([make_paper(n, n) for n in range(1, 11)], limit=3)
+    result = asyncio.run(search_window(crawler, "q", *window))
+    assert result.complete
+    assert [p.title for p in result.papers] == [f"paper {n}" for n in range(10, 0, -1)]
+    assert len(crawler.starts) == 5
+
+    # 同一时刻的论文超过上限，无法继续向前
+    crawler = LimitedCrawler([make_paper(n, 5) for n in range(1, 5)], limit=3)
+    result = asyncio.run(search_window(crawler, "q", *window))
+    assert not result.complete and len(result.papers) == 3
+
+class MinuteCrawler(LimitedCrawler):
+    """按分钟过滤时间窗口的服务器：窗口终点所在分钟内更晚的论文也会返回并占用条数上限"""
+
+    async def search_batch(self, keyword, from_date, to_date):
+        self.starts.append(from_date)
+        end = to_date.replace(second=59)
+        raw = sorted((p for p in self.papers if from_date <= p.published_date <= end),
+                     key=lambda p: p.published_date, reverse=True)[:self.limit]
+        return [p for p in raw if p.published_date <= to_date], len(raw)
+
+def test_search_window_counts_entries_returned_by_server():
+    """测试按服务器返回的条数判断截断：过滤掉同一分钟的条目后不足上限也不算取完"""
+    minute = datetime(2024, 1, 10, 8, 30, tzinfo=timezone.utc)
+    papers = [make_paper(n, 10) for n in range(1, 6)]
+    for paper, second in zip(papers, (10, 20, 30, 40)):
+        paper.published_date = minute.replace(second=second)
+    papers[4].published_date = minute.replace(minute=29)
+    window = (datetime(2024, 1, 1, tzinfo=timezone.utc), datetime(2024, 1, 31, tzinfo=timezone.utc))
+
+    result = asyncio.run(search_window(MinuteCrawler(papers, limit=3), "q", *window))
+    assert not result.complete
+    assert [p.title for p in result.papers] == ["paper 4", "paper 3", "paper 2"]
+
+    result = asyncio.run(search_window(MinuteCrawler(papers, limit=6), "q", *window))
+    assert result.complete and len(result.papers) == 5
@@ -0,0 +1,222 @@
+import hashlib
+import logging
+import multiprocessing
+import os
+import shutil
+import subprocess
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict
+
+# 压缩格式使用本地 ffmpeg 编码（语音用低码率即可），wav 不编码
+ENCODER_ARGS = {
+    "wav": None,
+    "mp3": ["-c:a", "libmp3lame", "-b:a", "48k"],
+    "ogg": ["-c:a", "libopus", "-b:a", "24k"],
+}
+MIME_TYPES = {"wav": "audio/wav", "mp3": "audio/mpeg", "ogg": "audio/ogg"}
+
+# 每个工作进程各自持有的TTS引擎
+_engine = None
+
+def create_engine(rate: int = 150, volume: float = 0.9, voice: str = "chinese"):
+    """创建TTS引擎并优先选择名称包含 voice 的语音（不再逐个打印已安装的语音）"""
+    import pyttsx3  # 只有工作进程需要引擎
+    engine = pyttsx3.init()
+    engine.setProperty('rate', rate)  # 语速
+    engine.setProperty('volume', volume)  # 音量
+    for installed in engine.getProperty('voices'):
+        if voice.lower() in installed.name.lower():
+            engine.setProperty('voice', installed.id)
+            break
+    else:
+        logging.info(f"未找到 {voice} 语音，使用默认语音")
+    return engine
+
+def _init_worker(rate: int, volume: float, voice: str):
+    """工作进程初始化：创建本进程的引擎"""
+    global _engine
+    try:
+        _engine = create_engine(rate, volume, voice)
+    except Exception as e:
+        logging.error(f"TTS引擎初始化失败: {str(e)}")
+        _engine = None
+
+def _render(text: str, output_path: str, audio_format: str) -> bool:
+    """在工作进程中合成语音；压缩格式先合成临时wav再编码"""
+    if _engine is None:
+        return False
+    wav_path = output_path if audio_format == "wav" else f"{output_path}.render.wav"
+    try:
+        _engine.save_to_file(text, wav_path)
+        _engine.runAndWait()
+        if not os.path.exists(wav_path):
+            return False
+        if audio_format != "wav":
+            subprocess.run(
+                ["ffmpeg", "-y", "-loglevel", "error", "-i", wav_path, *ENCODER_ARGS[audio_format], output_path],
+                check=True, stdin=subprocess.DEVNULL
+            )
+        return os.path.exists(output_path)
+    except Exception as e:
+        logging.error(f"TTS转换失败: {str(e)}")
+        return False
+    finally:
+        if wav_path != output_path and os.path.exists(wav_path):
+            os.remove(wav_path)
+
+def narration_key(text: str, rate: int, volume: float, voice: str, audio_format: str) -> str:
+    """缓存键：文本与语音设置共同决定合成结果"""
+    settings = f"{rate}|{volume}|{voice}|{audio_format}|"
+    return hashlib.sha1((settings + text).encode('utf-8')).hexdigest()
+
+class TTSService:
+    """语音合成服务
+
+    任务经 ProcessPoolExecutor 的队列分发给多个工作进程，每个进程有自己的 pyttsx3 引擎，
+    合成不再阻塞调用方。结果按 (文本, 语音设置) 的哈希缓存在 cache_dir 中，输出文件优先硬链接到缓存，
+    不额外占用磁盘。只有缓存独占的文件（没有硬链接到输出目录）计入 max_cache_bytes，超出时按最近使用
+    时间淘汰；删除仍有输出链接的缓存文件释放不了空间，不会被淘汰。
+    默认 mp3（各浏览器都能播放，Safari 不支持 ogg/opus）；mp3/ogg 需要本地 ffmpeg，找不到时退回 wav。
+    """
+
+    def __init__(self, cache_dir: str = "./data/tts_cache", workers: int = 2,
+                 rate: int = 150, volume: float = 0.9, voice: str = "chinese",
+                 audio_format: str = "mp3", max_cache_bytes: int = 512 * 1024 * 1024):
+        if audio_format not in ENCODER_ARGS:
+            raise ValueError(f"不支持的音频格式: {audio_format}")
+        if audio_format != "wav" and shutil.which("ffmpeg") is None:
+            logging.warning("未找到 ffmpeg，语音以 wav 格式保存")
+            audio_format = "wav"
+        self.audio_format = audio_format
+        self.settings = (rate, volume, voice)
+        self.max_cache_bytes = max_cache_bytes
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._cache_bytes = sum(size for _, size, _ in self._exclusive_files())
+        # 界面进程中有Qt线程，fork 不安全，统一使用 spawn
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=self.settings
+        )
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def mime_type(self) -> str:
+        return MIME_TYPES[self.audio_format]
+
+    def audio_path(self, path: str) -> str:
+        """把输出路径的音频扩展名换成当前音频格式（没有音频扩展名时追加）"""
+        root, ext = os.path.splitext(path)
+        if ext.lstrip('.').lower() in ENCODER_ARGS:
+            path = root
+        return f"{path}.{self.audio_format}"
+
+    def _render_cached(self, text: str) -> Future:
+        """合成到缓存文件（同一文本正在合成时不重复提交），结果为缓存路径或 None"""
+        key = narration_key(text, *self.settings, self.audio_format)
+        cached = self.cache_dir / f"{key}.{self.audio_format}"
+        with self._lock:
+            render = self._pending.get(key)
+            if render is not None:
+                return render
+            render = Future()
+            if cached.exists():
+                os.utime(cached)  # 更新最近使用时间
+                render.set_result(cached)
+                return render
+            try:
+                task = self.executor.submit(_render, text, str(cached), self.audio_format)
+            except RuntimeError as e:
+                # 进程池已关闭或工作进程异常退出
+                logging.error(f"TTS任务提交失败: {str(e)}")
+                render.set_result(None)
+                return render
+            self._pending[key] = render
+        task.add_done_callback(lambda t: self._finish(key, cached, t, render))
+        return render
+
+    def _finish(self, key: str, cached: Path, task: Future, render: Future):
+        ok = not task.cancelled() and task.exception() is None and task.result()
+        with self._lock:
+            self._pending.pop(key, None)
+            if ok:
+                self._cache_bytes += cached.stat().st_size
+                self._evict(keep=cached)
+        render.set_result(cached if ok else None)
+
+    def _exclusive_files(self):
+        """缓存独占的文件 (路径, 大小, 最近使用时间)；硬链接数大于 1 的文件数据仍被输出目录引用"""
+        files = []
+        for f in self.cache_dir.iterdir():
+            try:
+                stat = f.stat()
+            except OSError:
+                continue  # 已被删除
+            if f.is_file() and stat.st_nlink == 1:
+                files.append((f, stat.st_size, stat.st_mtime))
+        return files
+
+    def _evict(self, keep: Path):
+        """缓存独占的大小超出上限时删除最久未使用的独占文件（调用方持有锁）
+
+        _cache_bytes 在每次合成后累加，之后建立的输出链接会让文件不再独占，因此它只是上界；
+        超出上限时才扫描目录重新计算。
+        """
+        if self._cache_bytes <= self.max_cache_bytes:
+            return
+        files = sorted(self._exclusive_files(), key=lambda item: item[2])
+        self._cache_bytes = sum(size for _, size, _ in files)
+        for f, size, _ in files:
+            if self._cache_bytes <= self.max_cache_bytes:
+                break
+            if f == keep:
+                continue
+            try:
+                f.unlink()
+                self._cache_bytes -= size
+            except OSError:
+                pass  # 已被删除
+
+    def submit(self, text: str, output_path: str) -> Future:
+        """提交合成任务，立即返回；Future 的结果为输出路径（扩展名按音频格式），失败时为 None
+
+        输出文件已存在时直接返回，不再重新合成。
+        """
+        output_path = self.audio_path(output_path)
+        result = Future()
+        if os.path.exists(output_path):
+            result.set_result(output_path)
+            return result
+
+        def deliver(render: Future):
+            cached = render.result()
+            try:
+                if cached is None:
+                    result.set_result(None)
+                    return
+                Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+                try:
+                    os.link(cached, output_path)
+                except OSError:
+                    # 跨磁盘或文件系统不支持硬链接
+                    shutil.copyfile(cached, output_path)
+                result.set_result(output_path)
+            except OSError as e:
+                logging.error(f"语音文件保存失败: {str(e)}")
+                result.set_result(None)
+
+        self._render_cached(text).add_done_callback(deliver)
+        return result
+
+    def text_to_speech(self, text: str, output_path: str) -> bool:
+        """同步合成（兼容原 TTSManager 接口）"""
+        return self.submit(text, output_path).result() is not None
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = False):
+        """关闭工作进程；cancel_pending 为 True 时放弃排队中的任务"""
+        self.executor.shutdown(wait=wait, cancel_futures=cancel_pending)